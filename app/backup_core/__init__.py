@@ -1,59 +1,91 @@
-from .config import (
-    AppConfig,
-    ProjectConfig,
-    BackupProfileConfig,
-    ExcludeConfig,
-    OutputConfig,
-    OutputFormat,
-    SeparatorStyle,
-    ProjectType,
-    FILE_EXTENSION_PRESETS,
-    COMMON_EXCLUDE_FOLDERS,
-    COMMON_EXCLUDE_FILES,
-    load_app_config,
-)
-from .engine import BackupEngine, BackupResult
-from .errors import BackupError, BackupConfigError, BackupIOError, BackupCancelled
-from .project_detector import analyze_project, ProjectAnalysis
-from .universal_backup import (
-    UniversalBackupConfig,
-    UniversalBackupStats,
-    run_universal_backup,
-    quick_backup_typescript,
-    quick_backup_python,
-    quick_backup_all_code,
-)
-
-__all__ = [
+"""
+Backup core package.
+
+Public names are re-exported lazily (PEP 562) so that importing a single
+enum or config helper does not pull in the engine, the step modules and
+the network time client.
+"""
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Dict
+
+if TYPE_CHECKING:  # pragma: no cover - static analysis only
+    from .config import (
+        AppConfig,
+        ProjectConfig,
+        BackupProfileConfig,
+        ExcludeConfig,
+        OutputConfig,
+        OutputFormat,
+        SeparatorStyle,
+        ProjectType,
+        StepFlag,
+        FILE_EXTENSION_PRESETS,
+        COMMON_EXCLUDE_FOLDERS,
+        COMMON_EXCLUDE_FILES,
+        load_app_config,
+    )
+    from .engine import BackupEngine, BackupResult, StepStats
+    from .errors import BackupError, BackupConfigError, BackupIOError, BackupCancelled
+    from .project_detector import analyze_project, clear_detector_caches, ProjectAnalysis
+    from .universal_backup import (
+        UniversalBackupConfig,
+        UniversalBackupStats,
+        run_universal_backup,
+        quick_backup_typescript,
+        quick_backup_python,
+        quick_backup_all_code,
+    )
+
+_LAZY: Dict[str, str] = {
     # Config
-    "AppConfig",
-    "ProjectConfig",
-    "BackupProfileConfig",
-    "ExcludeConfig",
-    "OutputConfig",
-    "OutputFormat",
-    "SeparatorStyle",
-    "ProjectType",
-    "FILE_EXTENSION_PRESETS",
-    "COMMON_EXCLUDE_FOLDERS",
-    "COMMON_EXCLUDE_FILES",
-    "load_app_config",
+    "AppConfig": "config",
+    "ProjectConfig": "config",
+    "BackupProfileConfig": "config",
+    "ExcludeConfig": "config",
+    "OutputConfig": "config",
+    "OutputFormat": "config",
+    "SeparatorStyle": "config",
+    "ProjectType": "config",
+    "StepFlag": "config",
+    "FILE_EXTENSION_PRESETS": "config",
+    "COMMON_EXCLUDE_FOLDERS": "config",
+    "COMMON_EXCLUDE_FILES": "config",
+    "load_app_config": "config",
     # Engine
-    "BackupEngine",
-    "BackupResult",
+    "BackupEngine": "engine",
+    "BackupResult": "engine",
+    "StepStats": "engine",
     # Errors
-    "BackupError",
-    "BackupConfigError",
-    "BackupIOError",
-    "BackupCancelled",
+    "BackupError": "errors",
+    "BackupConfigError": "errors",
+    "BackupIOError": "errors",
+    "BackupCancelled": "errors",
     # Project detection
-    "analyze_project",
-    "ProjectAnalysis",
+    "analyze_project": "project_detector",
+    "clear_detector_caches": "project_detector",
+    "ProjectAnalysis": "project_detector",
     # Universal backup
-    "UniversalBackupConfig",
-    "UniversalBackupStats",
-    "run_universal_backup",
-    "quick_backup_typescript",
-    "quick_backup_python",
-    "quick_backup_all_code",
-]
+    "UniversalBackupConfig": "universal_backup",
+    "UniversalBackupStats": "universal_backup",
+    "run_universal_backup": "universal_backup",
+    "quick_backup_typescript": "universal_backup",
+    "quick_backup_python": "universal_backup",
+    "quick_backup_all_code": "universal_backup",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name: str):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value  # cache so later lookups bypass __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,15 +1,49 @@
 from __future__ import annotations
 
-import json
 import os
+import sys
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import Enum, IntFlag
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Literal, Optional, Set
-from zoneinfo import ZoneInfo
+from string import Formatter
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from .errors import BackupConfigError
 
+if TYPE_CHECKING:  # pragma: no cover - static analysis only
+    from zoneinfo import ZoneInfo
+
+try:  # orjson is optional; it parses large configs noticeably faster.
+    import orjson
+
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover - depends on environment
+    import json
+
+    _json_loads = json.loads
+
+try:  # ijson is optional; only used to stream very large configs.
+    import ijson
+except ImportError:  # pragma: no cover - depends on environment
+    ijson = None
+
+# Configs above this size are streamed section by section when ijson is installed.
+_STREAM_THRESHOLD_BYTES = 256 * 1024
+
 
 # ------------------------------------------------------------------ #
 # Enums for output formats and separator styles
@@ -20,12 +54,15 @@ class OutputFormat(str, Enum):
     HTML = "html"
 
 
+_FORMAT_EXT: Dict[OutputFormat, str] = {
+    OutputFormat.TXT: ".txt",
+    OutputFormat.MD: ".md",
+    OutputFormat.HTML: ".html",
+}
+
+
 def extension_for_format(fmt: OutputFormat) -> str:
-    return {
-        OutputFormat.TXT: ".txt",
-        OutputFormat.MD: ".md",
-        OutputFormat.HTML: ".html",
-    }.get(fmt, ".txt")
+    return _FORMAT_EXT.get(fmt, ".txt")
 
 
 class SeparatorStyle(str, Enum):
@@ -38,6 +75,11 @@ class SeparatorStyle(str, Enum):
     CUSTOM = "custom"        # User defined
 
 
+class ArchiveFormat(str, Enum):
+    ZIP_DEFLATE = "zip_deflate"  # .zip via zipfile (stdlib)
+    TAR_ZSTD = "tar_zstd"        # .tar.zst via the optional zstandard package
+
+
 class ProjectType(str, Enum):
     FRONTEND = "frontend"
     BACKEND = "backend"
@@ -49,54 +91,129 @@ class ProjectType(str, Enum):
 # ------------------------------------------------------------------ #
 # Preset file extension groups
 # ------------------------------------------------------------------ #
-FILE_EXTENSION_PRESETS: Dict[str, List[str]] = {
-    "typescript": [".ts", ".tsx"],
-    "javascript": [".js", ".jsx"],
-    "web_all": [".ts", ".tsx", ".js", ".jsx", ".vue", ".svelte"],
-    "styles": [".css", ".scss", ".sass", ".less", ".styl"],
-    "config": [".json", ".yaml", ".yml", ".toml", ".ini", ".env"],
-    "python": [".py", ".pyi", ".pyx"],
-    "documentation": [".md", ".mdx", ".rst", ".txt"],
-    "html": [".html", ".htm", ".ejs", ".hbs"],
-    "all_code": [".ts", ".tsx", ".js", ".jsx", ".py", ".vue", ".svelte", ".go", ".rs", ".java", ".kt"],
+def _extension_set(exts: Iterable[str]) -> FrozenSet[str]:
+    # Interned so the same suffix string is shared across every preset and profile.
+    return frozenset(sys.intern(ext) for ext in exts)
+
+
+FILE_EXTENSION_PRESETS: Dict[str, FrozenSet[str]] = {
+    name: _extension_set(exts)
+    for name, exts in {
+        "typescript": [".ts", ".tsx"],
+        "javascript": [".js", ".jsx"],
+        "web_all": [".ts", ".tsx", ".js", ".jsx", ".vue", ".svelte"],
+        "styles": [".css", ".scss", ".sass", ".less", ".styl"],
+        "config": [".json", ".yaml", ".yml", ".toml", ".ini", ".env"],
+        "python": [".py", ".pyi", ".pyx"],
+        "documentation": [".md", ".mdx", ".rst", ".txt"],
+        "html": [".html", ".htm", ".ejs", ".hbs"],
+        "all_code": [".ts", ".tsx", ".js", ".jsx", ".py", ".vue", ".svelte", ".go", ".rs", ".java", ".kt"],
+    }.items()
 }
 
+DEFAULT_TS_EXTENSIONS: FrozenSet[str] = FILE_EXTENSION_PRESETS["typescript"]
+DEFAULT_FULL_EXTENSIONS: FrozenSet[str] = _extension_set(
+    [".ts", ".tsx", ".js", ".jsx", ".json", ".md", ".yml", ".yaml", ".env", ".sh"]
+)
+
 
 # ------------------------------------------------------------------ #
 # Common folders to exclude
 # ------------------------------------------------------------------ #
-COMMON_EXCLUDE_FOLDERS: Set[str] = {
+COMMON_EXCLUDE_FOLDERS: FrozenSet[str] = frozenset({
     "node_modules", ".next", ".turbo", "dist", "build", ".git",
     ".cache", "coverage", ".output", ".nx", ".vercel", ".expo",
     ".vscode", "tmp", "__pycache__", "venv", ".idea", "vendor",
     "Pods", ".mypy_cache", ".pytest_cache", "htmlcov", ".tox",
     "egg-info", ".eggs", "target", "out", ".gradle", ".mvn",
-}
+})
 
-COMMON_EXCLUDE_FILES: Set[str] = {
+COMMON_EXCLUDE_FILES: FrozenSet[str] = frozenset({
     "package-lock.json", "pnpm-lock.yaml", "yarn.lock", "LICENSE",
     "CHANGELOG", ".DS_Store", ".gitignore", ".npmrc", "Thumbs.db",
-}
+})
 
 
 # ------------------------------------------------------------------ #
 # Separator format helpers
 # ------------------------------------------------------------------ #
+_SEPARATOR_PARTS: Dict[SeparatorStyle, Tuple[str, str]] = {
+    SeparatorStyle.EQUALS: ("\n===== ", " =====\n"),
+    SeparatorStyle.HASH: ("\n##### ", " #####\n"),
+    SeparatorStyle.MARKDOWN: ("\n## ", "\n"),
+    SeparatorStyle.DASHED: ("\n----- ", " -----\n"),
+    SeparatorStyle.COMMENT: ("\n// === ", " ===\n"),
+    SeparatorStyle.XML_STYLE: ("\n<!-- ", " -->\n"),
+}
+
+_SEPARATOR_FORMATS: Dict[SeparatorStyle, str] = {
+    style: f"{prefix}{{path}}{suffix}" for style, (prefix, suffix) in _SEPARATOR_PARTS.items()
+}
+
+
 def get_separator_format(style: SeparatorStyle, custom_format: Optional[str] = None) -> str:
     """
     Returns a format string with {path} placeholder.
     """
-    formats = {
-        SeparatorStyle.EQUALS: "\n===== {path} =====\n",
-        SeparatorStyle.HASH: "\n##### {path} #####\n",
-        SeparatorStyle.MARKDOWN: "\n## {path}\n",
-        SeparatorStyle.DASHED: "\n----- {path} -----\n",
-        SeparatorStyle.COMMENT: "\n// === {path} ===\n",
-        SeparatorStyle.XML_STYLE: "\n<!-- {path} -->\n",
-    }
-    if style == SeparatorStyle.CUSTOM and custom_format:
+    if style is SeparatorStyle.CUSTOM and custom_format:
         return custom_format
-    return formats.get(style, formats[SeparatorStyle.EQUALS])
+    return _SEPARATOR_FORMATS.get(style, _SEPARATOR_FORMATS[SeparatorStyle.EQUALS])
+
+
+def format_separator(style: SeparatorStyle, path: object, custom_format: Optional[str] = None) -> str:
+    """
+    Render the separator line for a single file.
+
+    Built-in styles are stored as (prefix, suffix) pairs and concatenated,
+    so the per-file hot loop never re-parses a format string.
+    """
+    if style is SeparatorStyle.CUSTOM and custom_format:
+        return custom_format.format(path=path)
+    prefix, suffix = _SEPARATOR_PARTS.get(style, _SEPARATOR_PARTS[SeparatorStyle.EQUALS])
+    return prefix + str(path) + suffix
+
+
+def separator_renderer(style: SeparatorStyle, custom_format: Optional[str] = None) -> Callable[[object], str]:
+    """
+    Resolve style once and return path -> separator line, for loops that
+    render a header per file with the same settings.
+    """
+    if style is SeparatorStyle.CUSTOM and custom_format:
+        return _compile_separator_template(custom_format)
+    prefix, suffix = _SEPARATOR_PARTS.get(style, _SEPARATOR_PARTS[SeparatorStyle.EQUALS])
+    return lambda path: prefix + str(path) + suffix
+
+
+def _compile_separator_template(template: str) -> Callable[[object], str]:
+    """
+    Parse a custom separator once into path -> line.
+
+    Templates built only from literals and bare {path} fields become a join
+    of the literals on the path; anything else (format specs, conversions,
+    attribute access, malformed fields) defers to str.format with a Path,
+    so "{path.name}"-style templates keep working for string paths.
+    """
+    def fallback(path: object) -> str:
+        return template.format(path=Path(path))
+
+    try:
+        parsed = list(Formatter().parse(template))
+    except ValueError:
+        return fallback
+    # L0 + p + L1 + ... + p + Ln == p.join([L0, ..., Ln])
+    literals: List[str] = [""]
+    for literal, field_name, spec, conversion in parsed:
+        literals[-1] += literal
+        if field_name is None:
+            continue
+        if spec or conversion or field_name != "path":
+            return fallback
+        literals.append("")
+
+    def render(path: object) -> str:
+        return str(path).join(literals)
+
+    return render
 
 
 BackupStepName = Literal[
@@ -124,11 +241,78 @@ DEFAULT_INCLUDE_STEPS: List[BackupStepName] = [
     "keyword_search",
 ]
 
-ALLOWED_STEPS: Set[BackupStepName] = set(DEFAULT_INCLUDE_STEPS)
-ALLOWED_STEPS.add("project_root_files")
+ALLOWED_STEPS: FrozenSet[BackupStepName] = frozenset((*DEFAULT_INCLUDE_STEPS, "project_root_files"))
+
+
+class StepFlag(IntFlag):
+    """Bitmask form of BackupStepName; member names are the upper-cased step names."""
+    TREES = 1
+    CODE_TXT = 2
+    TS_TSX_MD_BUNDLES = 4
+    FULL_TS_TSX_BUNDLE = 8
+    CONFIGS = 16
+    TSCONFIG_BUNDLE = 32
+    API_GROUP_BUNDLES = 64
+    PATHS = 128
+    PROJECT_ROOT_FILES = 256
+    KEYWORD_SEARCH = 512
+
+
+def step_flags(names: Iterable[str]) -> StepFlag:
+    """Fold step names into a StepFlag mask; names must be in ALLOWED_STEPS."""
+    flags = StepFlag(0)
+    for name in names:
+        flags |= StepFlag[name.upper()]
+    return flags
+
+
+DEFAULT_STEP_FLAGS: StepFlag = step_flags(DEFAULT_INCLUDE_STEPS)
+
+# Deflate "real-time" tier; see BackupProfileConfig.compression_level.
+DEFAULT_COMPRESSION_LEVEL = 1
+# Sentinel level: let the archive writer tune the level from I/O back-pressure.
+ADAPTIVE_COMPRESSION = "adaptive"
+
+CompressionLevel = Union[int, Literal["adaptive"]]
+
 
+# slots=True drops the per-instance __dict__; it is only available on 3.10+.
+_DATACLASS_SLOTS: Dict[str, bool] = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+DEFAULT_NAME_TEMPLATE = "{project}_{base}_{stamp}"
+_NAME_TEMPLATE_FIELDS: FrozenSet[str] = frozenset({"project", "base", "stamp"})
+
+
+def _compile_name_template(template: str) -> Callable[[Dict[str, str]], str]:
+    """
+    Parse a filename template once into a callable taking the field mapping.
+
+    Templates built only from literals and bare {project}/{base}/{stamp}
+    fields become a plain join; anything else (format specs, conversions,
+    unknown or malformed fields) defers to str.format_map.
+    """
+    try:
+        parsed = list(Formatter().parse(template))
+    except ValueError:
+        return template.format_map
+    parts: List[Tuple[bool, str]] = []
+    for literal, field_name, spec, conversion in parsed:
+        if literal:
+            parts.append((True, literal))
+        if field_name is None:
+            continue
+        if spec or conversion or field_name not in _NAME_TEMPLATE_FIELDS:
+            return template.format_map
+        parts.append((False, field_name))
+
+    def render(values: Dict[str, str]) -> str:
+        return "".join(text if is_literal else values[text] for is_literal, text in parts)
+
+    return render
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class ProjectConfig:
     id: str
     label: str
@@ -139,16 +323,17 @@ class ProjectConfig:
     detected_type: ProjectType = ProjectType.UNKNOWN
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class ExcludeConfig:
     """Configuration for excluding files and folders from backup."""
-    exclude_folders: Set[str] = field(default_factory=lambda: set(COMMON_EXCLUDE_FOLDERS))
-    exclude_files: Set[str] = field(default_factory=lambda: set(COMMON_EXCLUDE_FILES))
+    # Defaults share the immutable module-level sets instead of copying per profile.
+    exclude_folders: FrozenSet[str] = COMMON_EXCLUDE_FOLDERS
+    exclude_files: FrozenSet[str] = COMMON_EXCLUDE_FILES
     exclude_patterns: List[str] = field(default_factory=lambda: [".spec.", ".test.", ".e2e-spec."])
     exclude_hidden: bool = True  # Exclude files/folders starting with .
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class OutputConfig:
     """Configuration for backup output format."""
     format: OutputFormat = OutputFormat.TXT
@@ -158,10 +343,21 @@ class OutputConfig:
     include_file_stats: bool = True  # Size, line count in header
     wrap_in_code_block: bool = False  # For markdown output
     dynamic_names: bool = True  # Include project + timestamp in filenames
-    name_template: str = "{project}_{base}_{stamp}"  # Template for dynamic names
+    name_template: str = DEFAULT_NAME_TEMPLATE  # Template for dynamic names
+    archive_format: ArchiveFormat = ArchiveFormat.ZIP_DEFLATE  # Format of the final archive
+    _name_formatter: Optional[Callable[[Dict[str, str]], str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
+    def __post_init__(self) -> None:
+        self._name_formatter = _compile_name_template(self.name_template or DEFAULT_NAME_TEMPLATE)
 
-@dataclass
+    def format_name(self, project: str, base: str, stamp: str) -> str:
+        """Render name_template; raises like str.format on a malformed template."""
+        return self._name_formatter({"project": project, "base": base, "stamp": stamp})
+
+
+@dataclass(**_DATACLASS_SLOTS)
 class BackupProfileConfig:
     id: str
     label: str
@@ -169,24 +365,14 @@ class BackupProfileConfig:
     skip_zip: bool = False
     max_file_kb: int = 256
     no_root_files: bool = False
-    include_steps: List[BackupStepName] = field(
-        default_factory=lambda: list(DEFAULT_INCLUDE_STEPS)
-    )
-    allowed_ts_extensions: List[str] = field(default_factory=lambda: [".ts", ".tsx"])
-    allowed_full_extensions: List[str] = field(
-        default_factory=lambda: [
-            ".ts",
-            ".tsx",
-            ".js",
-            ".jsx",
-            ".json",
-            ".md",
-            ".yml",
-            ".yaml",
-            ".env",
-            ".sh",
-        ]
-    )
+    # Read bundled files on a small thread pool so slow (network/FUSE) reads overlap.
+    parallel_io: bool = True
+    # Deflate level for the ZIP phase. The bundles are plain text, where level 1
+    # compresses almost as well as 6 at roughly half the CPU time; raise it for archival.
+    compression_level: CompressionLevel = DEFAULT_COMPRESSION_LEVEL
+    include_steps: StepFlag = DEFAULT_STEP_FLAGS
+    allowed_ts_extensions: FrozenSet[str] = DEFAULT_TS_EXTENSIONS
+    allowed_full_extensions: FrozenSet[str] = DEFAULT_FULL_EXTENSIONS
     # New advanced options
     exclude_config: ExcludeConfig = field(default_factory=ExcludeConfig)
     output_config: OutputConfig = field(default_factory=OutputConfig)
@@ -194,7 +380,7 @@ class BackupProfileConfig:
     extension_presets: List[str] = field(default_factory=list)  # Use predefined extension groups
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class AppConfig:
     projects: Dict[str, ProjectConfig]
     profiles: Dict[str, BackupProfileConfig]
@@ -210,7 +396,7 @@ class AppConfig:
         return self.search_sets[search_id]
 
 
-@dataclass
+@dataclass(**_DATACLASS_SLOTS)
 class SearchSetConfig:
     id: str
     label: str
@@ -220,26 +406,117 @@ class SearchSetConfig:
 
 def _load_json(path: Path) -> dict:
     try:
-        with path.open("r", encoding="utf-8") as f:
-            return json.load(f)
+        return _json_loads(path.read_bytes())
     except FileNotFoundError as exc:  # noqa: PERF203
         raise BackupConfigError(f"Config file not found: {path}") from exc
-    except json.JSONDecodeError as exc:
+    except ValueError as exc:  # json.JSONDecodeError, orjson.JSONDecodeError, bad UTF-8
         raise BackupConfigError(f"Config file is not valid JSON: {path}") from exc
 
 
+_CONFIG_SECTIONS = ("projects", "profiles", "search_sets")
+
+_ItemHandler = Callable[[object], None]
+
+
+def _stream_items(path: Path, handlers: Mapping[str, _ItemHandler]) -> Set[str]:
+    """
+    Parse path once with ijson, passing each item of a top-level section array
+    to its handler as soon as the item is complete; return the keys present.
+
+    Only the item being built is held in memory, never a whole section.
+    """
+    present: Set[str] = set()
+    section: Optional[str] = None  # section array currently being read
+    builder = None  # ijson.ObjectBuilder for the item in progress
+    depth = 0
+    try:
+        with path.open("rb") as f:
+            # use_float: numbers come back as float, like json.loads, not Decimal.
+            for prefix, event, value in ijson.parse(f, use_float=True):
+                if builder is not None:
+                    builder.event(event, value)
+                    if event in ("start_map", "start_array"):
+                        depth += 1
+                    elif event in ("end_map", "end_array"):
+                        depth -= 1
+                    if depth == 0:
+                        handlers[section](builder.value)
+                        builder = None
+                elif section is not None:
+                    if event == "end_array" and prefix == section:
+                        section = None
+                        continue
+                    builder = ijson.ObjectBuilder()
+                    builder.event(event, value)
+                    if event in ("start_map", "start_array"):
+                        depth = 1
+                    else:
+                        handlers[section](builder.value)
+                        builder = None
+                elif prefix == "" and event == "map_key":
+                    if value in handlers:
+                        present.add(value)
+                elif prefix == "" and event not in ("start_map", "end_map"):
+                    raise BackupConfigError(f"Config file must contain a JSON object: {path}")
+                elif prefix in present and prefix in handlers:
+                    if event != "start_array":
+                        raise BackupConfigError(f"Config key '{prefix}' must be a list.")
+                    section = prefix
+    except ijson.JSONError as exc:
+        raise BackupConfigError(f"Config file is not valid JSON: {path}") from exc
+    return present
+
+
+def _load_config_items(path: Path, handlers: Mapping[str, _ItemHandler]) -> None:
+    """
+    Feed every item of the config's projects/profiles/search_sets arrays to
+    the handler for its section.
+
+    Large configs are streamed in one pass with ijson, item by item; small
+    ones take the single-parse fast path. Both report the same errors.
+    """
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError as exc:
+        raise BackupConfigError(f"Config file not found: {path}") from exc
+
+    if ijson is not None and size > _STREAM_THRESHOLD_BYTES:
+        present = _stream_items(path, handlers)
+        if "projects" not in present or "profiles" not in present:
+            raise BackupConfigError("Config must include 'projects' and 'profiles' keys.")
+        return
+
+    raw = _load_json(path)
+    if not isinstance(raw, dict):
+        raise BackupConfigError(f"Config file must contain a JSON object: {path}")
+    if "projects" not in raw or "profiles" not in raw:
+        raise BackupConfigError("Config must include 'projects' and 'profiles' keys.")
+    for key in _CONFIG_SECTIONS:
+        items = raw.get(key, [])
+        if not isinstance(items, list):
+            raise BackupConfigError(f"Config key '{key}' must be a list.")
+        for item in items:
+            handlers[key](item)
+
+
+def _enum_value(value: object, enum_cls, default):
+    # Direct value-map lookup avoids Enum.__call__ dispatch and exception cost on misses.
+    if isinstance(value, enum_cls):
+        return value
+    if isinstance(value, str):
+        return enum_cls._value2member_map_.get(value, default)
+    return default
+
+
 def _parse_output_config(raw: object) -> OutputConfig:
     if not isinstance(raw, dict):
         return OutputConfig()
 
-    def _enum_value(value: object, enum_cls, default):
-        try:
-            return enum_cls(value)
-        except Exception:  # noqa: BLE001
-            return default
-
     fmt = _enum_value(raw.get("format", OutputFormat.TXT), OutputFormat, OutputFormat.TXT)
     sep = _enum_value(raw.get("separator_style", SeparatorStyle.EQUALS), SeparatorStyle, SeparatorStyle.EQUALS)
+    archive = _enum_value(
+        raw.get("archive_format", ArchiveFormat.ZIP_DEFLATE), ArchiveFormat, ArchiveFormat.ZIP_DEFLATE
+    )
 
     return OutputConfig(
         format=fmt,
@@ -249,138 +526,170 @@ def _parse_output_config(raw: object) -> OutputConfig:
         include_file_stats=bool(raw.get("include_file_stats", True)),
         wrap_in_code_block=bool(raw.get("wrap_in_code_block", False)),
         dynamic_names=bool(raw.get("dynamic_names", True)),
-        name_template=str(raw.get("name_template", "{project}_{base}_{stamp}")),
+        name_template=str(raw.get("name_template", DEFAULT_NAME_TEMPLATE)),
+        archive_format=archive,
     )
 
 
-def _validate_step_list(values: List[str], config_path: Path) -> List[BackupStepName]:
+def _validate_step_list(values: List[str], config_path: Path) -> StepFlag:
     invalid = [v for v in values if v not in ALLOWED_STEPS]
     if invalid:
         raise BackupConfigError(
             f"Unknown include_steps in {config_path}: {', '.join(invalid)}"
         )
-    return list(values)  # type: ignore[return-value]
+    return step_flags(values)
+
+
+def _parse_compression_level(raw: object, prof_id: str) -> CompressionLevel:
+    if raw is None:
+        return DEFAULT_COMPRESSION_LEVEL
+    if raw == ADAPTIVE_COMPRESSION:
+        return ADAPTIVE_COMPRESSION
+    try:
+        level = int(raw)
+    except Exception as exc:  # noqa: BLE001
+        raise BackupConfigError(f"Invalid compression_level for profile '{prof_id}'") from exc
+    if not 0 <= level <= 9:
+        raise BackupConfigError(
+            f"compression_level must be between 0 and 9 or 'adaptive' for profile '{prof_id}'"
+        )
+    return level
 
 
 def _expand_path(raw: object) -> Path:
-    return Path(os.path.expandvars(str(raw))).expanduser()
+    text = str(raw)
+    # Most configured paths are plain absolute paths; skip both expanders for them.
+    # "%" covers the %VAR% syntax that expandvars understands on Windows.
+    if "$" not in text and "%" not in text and not text.startswith("~"):
+        return Path(text)
+    return Path(os.path.expandvars(text)).expanduser()
 
 
-def load_app_config(config_path: Path) -> AppConfig:
-    raw = _load_json(config_path)
+def _resolve_path(raw: object, base_dir: Path) -> Path:
+    """Expand a configured path and anchor relative results at the config directory."""
+    path = _expand_path(raw)
+    return path if path.is_absolute() else base_dir / path
 
-    if "projects" not in raw or "profiles" not in raw:
-        raise BackupConfigError("Config must include 'projects' and 'profiles' keys.")
 
+_REQUIRED_PROJECT_KEYS: Tuple[str, ...] = ("id", "project_root", "backup_root")
+
+
+@lru_cache(maxsize=None)
+def _validated_zone(name: str) -> ZoneInfo:
+    # Projects usually share one timezone; validate each distinct name once.
+    # zoneinfo is imported lazily so importing config does not load tzdata.
+    from zoneinfo import ZoneInfo
+
+    return ZoneInfo(name)
+
+
+def _add_project(projects: Dict[str, ProjectConfig], proj: dict, base_dir: Path) -> None:
+    missing = [key for key in _REQUIRED_PROJECT_KEYS if key not in proj]
+    if missing:
+        raise BackupConfigError(f"Project is missing required field: '{missing[0]}'")
+    proj_id = proj["id"]
+    project_root_raw = proj["project_root"]
+    backup_root_raw = proj["backup_root"]
+
+    if proj_id in projects:
+        raise BackupConfigError(f"Duplicate project id in config: {proj_id}")
+
+    project_root = _resolve_path(project_root_raw, base_dir)
+    backup_root = _resolve_path(backup_root_raw, base_dir)
+    zip_output_dir = _resolve_path(proj.get("zip_output_dir", backup_root), base_dir)
+
+    timezone = proj.get("timezone", "Asia/Tehran")
+    try:
+        _validated_zone(timezone)
+    except Exception as exc:  # noqa: BLE001
+        raise BackupConfigError(f"Invalid timezone for project '{proj_id}': {timezone}") from exc
+
+    projects[proj_id] = ProjectConfig(
+        id=proj_id,
+        label=proj.get("label", proj_id),
+        project_root=project_root,
+        backup_root=backup_root,
+        zip_output_dir=zip_output_dir,
+        timezone=timezone,
+    )
+
+
+def _add_profile(profiles: Dict[str, BackupProfileConfig], prof: dict, config_path: Path) -> None:
+    try:
+        prof_id = prof["id"]
+    except KeyError as exc:
+        raise BackupConfigError("Profile is missing required field 'id'") from exc
+    if prof_id in profiles:
+        raise BackupConfigError(f"Duplicate profile id in config: {prof_id}")
+
+    include_steps_raw = prof.get("include_steps")
+    include_steps: StepFlag
+    if include_steps_raw is None:
+        include_steps = DEFAULT_STEP_FLAGS
+    else:
+        include_steps = _validate_step_list(list(include_steps_raw), config_path)
+
+    try:
+        max_file_kb = int(prof.get("max_file_kb", 256))
+    except Exception as exc:  # noqa: BLE001
+        raise BackupConfigError(f"Invalid max_file_kb for profile '{prof_id}'") from exc
+    if max_file_kb <= 0:
+        raise BackupConfigError(f"max_file_kb must be > 0 for profile '{prof_id}'")
+
+    compression_level = _parse_compression_level(prof.get("compression_level"), prof_id)
+
+    output_config = _parse_output_config(prof.get("output_config", {}))
+
+    profiles[prof_id] = BackupProfileConfig(
+        id=prof_id,
+        label=prof.get("label", prof_id),
+        use_network_time=prof.get("use_network_time", False),
+        skip_zip=prof.get("skip_zip", False),
+        max_file_kb=max_file_kb,
+        no_root_files=prof.get("no_root_files", False),
+        parallel_io=prof.get("parallel_io", True),
+        compression_level=compression_level,
+        include_steps=include_steps,
+        allowed_ts_extensions=_extension_set(prof.get("allowed_ts_extensions", DEFAULT_TS_EXTENSIONS)),
+        allowed_full_extensions=_extension_set(
+            prof.get("allowed_full_extensions", DEFAULT_FULL_EXTENSIONS)
+        ),
+        output_config=output_config,
+    )
+
+
+def _add_search_set(search_sets: Dict[str, SearchSetConfig], search: dict) -> None:
+    try:
+        sid = search["id"]
+        keywords = list(search["keywords"])
+    except KeyError as exc:
+        raise BackupConfigError("Search set must include 'id' and 'keywords'") from exc
+    if sid in search_sets:
+        raise BackupConfigError(f"Duplicate search_set id: {sid}")
+    extensions = search.get("extensions", [".ts", ".tsx", ".js", ".jsx", ".json"])
+    search_sets[sid] = SearchSetConfig(
+        id=sid,
+        label=search.get("label", sid),
+        keywords=keywords,
+        extensions=extensions,
+    )
+
+
+def load_app_config(config_path: Path) -> AppConfig:
     base_dir = config_path.parent
 
     projects: Dict[str, ProjectConfig] = {}
-    for proj in raw.get("projects", []):
-        try:
-            proj_id = proj["id"]
-            project_root_raw = proj["project_root"]
-            backup_root_raw = proj["backup_root"]
-        except KeyError as exc:
-            raise BackupConfigError(f"Project is missing required field: {exc}") from exc
-
-        if proj_id in projects:
-            raise BackupConfigError(f"Duplicate project id in config: {proj_id}")
-
-        project_root = _expand_path(project_root_raw)
-        if not project_root.is_absolute():
-            project_root = base_dir / project_root
-        backup_root = _expand_path(backup_root_raw)
-        if not backup_root.is_absolute():
-            backup_root = base_dir / backup_root
-        zip_output_dir = _expand_path(proj.get("zip_output_dir", str(backup_root)))
-        if not zip_output_dir.is_absolute():
-            zip_output_dir = base_dir / zip_output_dir
-
-        timezone = proj.get("timezone", "Asia/Tehran")
-        try:
-            ZoneInfo(timezone)
-        except Exception as exc:  # noqa: BLE001
-            raise BackupConfigError(f"Invalid timezone for project '{proj_id}': {timezone}") from exc
-
-        pc = ProjectConfig(
-            id=proj_id,
-            label=proj.get("label", proj_id),
-            project_root=project_root,
-            backup_root=backup_root,
-            zip_output_dir=zip_output_dir,
-            timezone=timezone,
-        )
-        projects[pc.id] = pc
-
     profiles: Dict[str, BackupProfileConfig] = {}
-    for prof in raw.get("profiles", []):
-        try:
-            prof_id = prof["id"]
-        except KeyError as exc:
-            raise BackupConfigError("Profile is missing required field 'id'") from exc
-        if prof_id in profiles:
-            raise BackupConfigError(f"Duplicate profile id in config: {prof_id}")
-
-        include_steps_raw = prof.get("include_steps")
-        include_steps: List[BackupStepName]
-        if include_steps_raw is None:
-            include_steps = list(DEFAULT_INCLUDE_STEPS)
-        else:
-            include_steps = _validate_step_list(list(include_steps_raw), config_path)
-
-        try:
-            max_file_kb = int(prof.get("max_file_kb", 256))
-        except Exception as exc:  # noqa: BLE001
-            raise BackupConfigError(f"Invalid max_file_kb for profile '{prof_id}'") from exc
-        if max_file_kb <= 0:
-            raise BackupConfigError(f"max_file_kb must be > 0 for profile '{prof_id}'")
-
-        output_config = _parse_output_config(prof.get("output_config", {}))
-
-        bpc = BackupProfileConfig(
-            id=prof_id,
-            label=prof.get("label", prof_id),
-            use_network_time=prof.get("use_network_time", False),
-            skip_zip=prof.get("skip_zip", False),
-            max_file_kb=max_file_kb,
-            no_root_files=prof.get("no_root_files", False),
-            include_steps=include_steps,
-            allowed_ts_extensions=prof.get("allowed_ts_extensions", [".ts", ".tsx"]),
-            allowed_full_extensions=prof.get(
-                "allowed_full_extensions",
-                [
-                    ".ts",
-                    ".tsx",
-                    ".js",
-                    ".jsx",
-                    ".json",
-                    ".md",
-                    ".yml",
-                    ".yaml",
-                    ".env",
-                    ".sh",
-                ],
-            ),
-            output_config=output_config,
-        )
-        profiles[bpc.id] = bpc
-
     search_sets: Dict[str, SearchSetConfig] = {}
-    for search in raw.get("search_sets", []):
-        try:
-            sid = search["id"]
-            keywords = list(search["keywords"])
-        except KeyError as exc:
-            raise BackupConfigError("Search set must include 'id' and 'keywords'") from exc
-        if sid in search_sets:
-            raise BackupConfigError(f"Duplicate search_set id: {sid}")
-        extensions = search.get("extensions", [".ts", ".tsx", ".js", ".jsx", ".json"])
-        search_sets[sid] = SearchSetConfig(
-            id=sid,
-            label=search.get("label", sid),
-            keywords=keywords,
-            extensions=extensions,
-        )
+    # Each item becomes its config object as soon as it is read.
+    _load_config_items(
+        config_path,
+        {
+            "projects": lambda proj: _add_project(projects, proj, base_dir),
+            "profiles": lambda prof: _add_profile(profiles, prof, config_path),
+            "search_sets": lambda search: _add_search_set(search_sets, search),
+        },
+    )
 
     if not projects:
         raise BackupConfigError("No projects defined in configuration.")
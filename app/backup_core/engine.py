@@ -1,25 +1,36 @@
 from __future__ import annotations
 
+import html
 import logging
+import re
+from logging.handlers import QueueListener
+from queue import SimpleQueue
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from threading import Event
 from time import perf_counter
-from typing import Callable, Dict, List, Optional, Sequence
+from types import MappingProxyType
+from typing import Callable, Dict, Final, List, Mapping, Optional, Sequence, Set, Tuple
 
 from .config import (
+    _DATACLASS_SLOTS,
     ALLOWED_STEPS,
     BackupProfileConfig,
-    BackupStepName,
+    CompressionLevel,
     OutputFormat,
     OutputConfig,
     ProjectConfig,
     SearchSetConfig,
+    StepFlag,
     extension_for_format,
+    step_flags,
 )
 from .errors import BackupCancelled, BackupConfigError, BackupError, BackupIOError
 from .jalali import format_jalali_datetime, format_jalali_stamp
+from .scanning import FileIndex
 from .steps import api_bundles, code_bundles, configs, paths, root_files, trees, zipper, search
 from .time_utils import get_current_time
 
@@ -29,6 +40,88 @@ ProgressCallback = Callable[[int, int, str], None]
 
 logger = logging.getLogger(__name__)
 
+# Steps whose file lists are filtered from one shared FileIndex instead of their own walks.
+_INDEXED_STEPS = (
+    StepFlag.CODE_TXT
+    | StepFlag.TS_TSX_MD_BUNDLES
+    | StepFlag.FULL_TS_TSX_BUNDLE
+    | StepFlag.CONFIGS
+    | StepFlag.TSCONFIG_BUNDLE
+    | StepFlag.API_GROUP_BUNDLES
+    | StepFlag.PATHS
+)
+
+# Steps are I/O-bound walks and writes; a few threads overlap them without oversubscribing the disk.
+_MAX_STEP_WORKERS = 8
+
+# Read-only and built once; iteration order is the order phases are reported in.
+STEP_LABELS: Final[Mapping[StepFlag, str]] = MappingProxyType({
+    StepFlag.TREES: "Directory trees",
+    StepFlag.CODE_TXT: "Code text bundles",
+    StepFlag.TS_TSX_MD_BUNDLES: "TS/TSX markdown bundles",
+    StepFlag.FULL_TS_TSX_BUNDLE: "Full TS/TSX bundle",
+    StepFlag.CONFIGS: "Config bundles",
+    StepFlag.TSCONFIG_BUNDLE: "TSConfig bundle",
+    StepFlag.API_GROUP_BUNDLES: "API grouped bundles",
+    StepFlag.PATHS: "Path listings",
+    StepFlag.PROJECT_ROOT_FILES: "Project root helpers",
+    StepFlag.KEYWORD_SEARCH: "Keyword search bundles",
+})
+
+# backup_note bodies per output format, filled with format_map; the HTML fields are escaped first.
+_NOTE_TEMPLATES: Final[Mapping[OutputFormat, str]] = MappingProxyType({
+    OutputFormat.TXT: (
+        "Time source: {time_source}\n"
+        "ISO datetime: {iso}\n"
+        "Jalali datetime: {jalali}\n"
+        "\n"
+        "{note}\n"
+    ),
+    OutputFormat.MD: (
+        "# Backup Note\n"
+        "\n"
+        "- **Time source:** {time_source}\n"
+        "- **ISO datetime:** {iso}\n"
+        "- **Jalali datetime:** {jalali}\n"
+        "\n"
+        "{note}"
+    ),
+    OutputFormat.HTML: (
+        "<h2>Backup Note</h2>\n"
+        "<p><strong>Time source:</strong> {time_source}<br/>"
+        "<strong>ISO datetime:</strong> {iso}<br/>"
+        "<strong>Jalali datetime:</strong> {jalali}</p>\n"
+        "<p>{note}</p>\n"
+    ),
+})
+_EMPTY_NOTE: Final[Mapping[OutputFormat, str]] = MappingProxyType({
+    OutputFormat.TXT: "",
+    OutputFormat.MD: "_No note provided._",
+    OutputFormat.HTML: "No note provided.",
+})
+
+
+# Runs of anything that is not alphanumeric (\W, plus "_" itself) collapse to one "_".
+_SLUG_SEPARATORS = re.compile(r"[\W_]+")
+
+
+@lru_cache(maxsize=1024)
+def _slugify(value: str) -> str:
+    # Cached: the same artifact base names are slugified on every run.
+    slug = _SLUG_SEPARATORS.sub("_", value).strip("_")
+    # Lower per character outside ASCII: str.lower() is context-sensitive (final sigma).
+    slug = slug.lower() if slug.isascii() else "".join(map(str.lower, slug))
+    return slug or "project"
+
+
+@dataclass(**_DATACLASS_SLOTS)
+class StepStats:
+    """Counters reported by one step; step-specific counters go in extra."""
+
+    files_written: int = 0
+    files_included: int = 0
+    extra: Dict[str, int] = field(default_factory=dict)
+
 
 @dataclass
 class BackupResult:
@@ -36,7 +129,7 @@ class BackupResult:
     created_files: List[Path] = field(default_factory=list)
     created_directories: List[Path] = field(default_factory=list)
     zip_path: Optional[Path] = None
-    stats: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    stats: Dict[str, StepStats] = field(default_factory=dict)
     time_source: Optional[str] = None
     started_at: Optional[datetime] = None
     finished_at: Optional[datetime] = None
@@ -44,6 +137,80 @@ class BackupResult:
     is_dry_run: bool = False
 
 
+@dataclass
+class _StepContext:
+    """Run-scoped inputs shared by every step runner."""
+
+    result: BackupResult
+    backup_dir: Path
+    backup_dt: datetime
+    name_builder: Callable[[str, Optional[str]], Path]
+    stamp: str
+    output_config: OutputConfig
+    note: str
+    search_sets: List[SearchSetConfig]
+    file_index: Optional[FileIndex] = None
+
+
+_StepOutput = Dict[str, StepStats]
+
+
+def _plan_one(ctx: _StepContext) -> int:
+    return 1
+
+
+@dataclass(frozen=True)
+class _StepSpec:
+    """One row of the step table: which flags select it and how to run or plan it."""
+
+    flags: StepFlag
+    stats_key: str
+    tag: str
+    dry_message: str
+    run: Callable[["BackupEngine", _StepContext], _StepOutput]
+    planned: Callable[[_StepContext], int] = _plan_one
+    # Parallel rows only read project_root and write their own files under backup_dir.
+    parallel: bool = True
+
+    def label_for(self, include_steps: StepFlag) -> str:
+        # A row may cover several flags (configs + tsconfig); label it by the first selected one.
+        selected = self.flags & include_steps or self.flags
+        for flag, label in STEP_LABELS.items():
+            if flag & selected:
+                return label
+        return self.stats_key
+
+
+class _EngineLogSink(logging.Handler):
+    """Listener-side handler: forwards queued engine records to the UI callbacks and the logger.
+
+    A record may carry a phase update in ``record.progress`` (delivered first) and no
+    log line (``msg`` is None), so progress and log lines reach the UI in one order.
+    """
+
+    def __init__(
+        self,
+        target: logging.Logger,
+        callback: Optional[LogCallback],
+        progress_callback: Optional[ProgressCallback],
+    ) -> None:
+        super().__init__()
+        self._target = target
+        self._callback = callback
+        self._progress_callback = progress_callback
+
+    def emit(self, record: logging.LogRecord) -> None:
+        progress = getattr(record, "progress", None)
+        if progress is not None and self._progress_callback:
+            self._progress_callback(*progress)
+        if record.msg is None:
+            return
+        if self._target.isEnabledFor(record.levelno):
+            self._target.handle(record)
+        if self._callback:
+            self._callback(record.getMessage())
+
+
 class BackupEngine:
     def __init__(
         self,
@@ -61,23 +228,77 @@ class BackupEngine:
         self.log_callback = log_callback
         self.progress_callback = progress_callback
         self.cancel_event: Event = Event()
+        # Set when a parallel step fails, so its running siblings stop at their next cancel_check.
+        self._abort_event: Event = Event()
 
         self._backup_dt: Optional[datetime] = None
         self._backup_dir: Optional[Path] = None
         self._name_builder: Optional[Callable[[str, Optional[str]], Path]] = None
+        # Fixed by the project config, so slugify it once up front.
+        self._project_slug: str = self._compute_project_slug()
+        # Set only while run_backup is active; log lines and progress are then enqueued
+        # instead of delivered inline.
+        self._log_queue: SimpleQueue = SimpleQueue()
+        self._log_listener: Optional[QueueListener] = None
+        # Directories this run already created or confirmed; reset at the start of every run.
+        self._ensured_dirs: Set[Path] = set()
 
     # ------------------------------------------------------------------ #
     # Logging and progress helpers
     # ------------------------------------------------------------------ #
     def _emit_progress(self, phase_index: int, phase_total: int, label: str) -> None:
-        if self.progress_callback:
-            self.progress_callback(phase_index, phase_total, label)
+        self._dispatch(logging.INFO, None, (phase_index, phase_total, label))
+
+    def _emit(
+        self,
+        phase_index: int,
+        phase_total: int,
+        label: str,
+        level: Optional[int] = None,
+        tag: Optional[str] = None,
+        message: Optional[str] = None,
+    ) -> None:
+        """Emit a phase's progress and (optionally) its log line as one event."""
+        text = None if message is None else f"[{tag or 'INFO'}] {message}"
+        self._dispatch(level if level is not None else logging.INFO, text, (phase_index, phase_total, label))
 
     def _log(self, level: int, tag: str, message: str) -> None:
-        text = f"[{tag}] {message}"
-        self.logger.log(level, text)
-        if self.log_callback:
-            self.log_callback(text)
+        self._dispatch(level, f"[{tag}] {message}")
+
+    def _dispatch(
+        self,
+        level: int,
+        text: Optional[str],
+        progress: Optional[Tuple[int, int, str]] = None,
+    ) -> None:
+        # During a run everything goes through the one queue, so the UI sees progress and
+        # log lines in the order they were produced; a phase update and its line share a record.
+        if self._log_listener is not None:
+            # stacklevel 3: the engine code that called _log/_emit, not these helpers.
+            fn, lno, func, sinfo = self.logger.findCaller(stacklevel=3)
+            record = self.logger.makeRecord(
+                self.logger.name, level, fn, lno, text, None, None, func, {"progress": progress}, sinfo
+            )
+            self._log_queue.put_nowait(record)
+            return
+        if progress is not None and self.progress_callback:
+            self.progress_callback(*progress)
+        if text is not None:
+            self.logger.log(level, text)
+            if self.log_callback:
+                self.log_callback(text)
+
+    def _start_log_listener(self) -> None:
+        self._log_listener = QueueListener(
+            self._log_queue, _EngineLogSink(self.logger, self.log_callback, self.progress_callback)
+        )
+        self._log_listener.start()
+
+    def _stop_log_listener(self) -> None:
+        # stop() drains everything already queued before joining, so no line is lost.
+        listener, self._log_listener = self._log_listener, None
+        if listener is not None:
+            listener.stop()
 
     def _warn(self, message: str) -> None:
         self._log(logging.WARNING, "WARN", message)
@@ -88,50 +309,52 @@ class BackupEngine:
     def _check_cancelled(self) -> None:
         if self.cancel_event.is_set():
             raise BackupCancelled("Backup cancelled by user")
+        if self._abort_event.is_set():
+            raise BackupCancelled("Backup aborted after another step failed")
 
     # ------------------------------------------------------------------ #
     # Naming helpers
     # ------------------------------------------------------------------ #
-    def _slugify(self, value: str) -> str:
-        cleaned = "".join(ch.lower() if ch.isalnum() else "_" for ch in value)
-        slug = "_".join(filter(None, cleaned.split("_")))
-        return slug or "project"
-
-    def _project_slug_for_names(self) -> str:
-        candidates: List[str] = []
-        if self.project.id and self.project.id.lower() != "dynamic":
-            candidates.append(self.project.id)
-        if self.project.label:
-            candidates.append(self.project.label)
-        if self.project.project_root.name:
-            candidates.append(self.project.project_root.name)
+    def _compute_project_slug(self) -> str:
+        project = self.project
+        candidates = (
+            project.id if project.id and project.id.lower() != "dynamic" else "",
+            project.label,
+            project.project_root.name,
+        )
         for candidate in candidates:
-            slug = self._slugify(candidate)
-            if slug and slug != "dynamic":
+            if not candidate:
+                continue
+            slug = _slugify(candidate)
+            if slug != "dynamic":
                 return slug
         return "project"
 
     def _file_stamp(self) -> str:
         # Keep backup directory in Jalali, but use a compact Gregorian stamp for artifact filenames.
-        return self._require_backup_dt().strftime("%Y%m%d_%H%M")
+        dt = self._require_backup_dt()
+        return f"{dt.year:04d}{dt.month:02d}{dt.day:02d}_{dt.hour:02d}{dt.minute:02d}"
 
     def _build_name_builder(self) -> Callable[[str, Optional[str]], Path]:
         cfg: OutputConfig = self.profile.output_config
-        project_slug = self._project_slug_for_names()
+        project_slug = self._project_slug
         stamp = self._file_stamp()
-        template = cfg.name_template or "{project}_{base}_{stamp}"
+        # Everything below is invariant for the run; bind it once for the closure.
+        default_ext = extension_for_format(cfg.format)
+        backup_dir = self._require_backup_dir()
+        dynamic = cfg.dynamic_names
+        format_name = cfg.format_name
 
         def builder(base: str, ext_override: Optional[str] = None) -> Path:
-            ext = ext_override or extension_for_format(cfg.format)
-            base_slug = self._slugify(base)
-            if cfg.dynamic_names:
-                try:
-                    name = template.format(base=base_slug, project=project_slug, stamp=stamp)
-                except Exception:
-                    name = f"{project_slug}_{base_slug}_{stamp}"
-            else:
-                name = base_slug
-            return self._require_backup_dir() / f"{name}{ext}"
+            ext = ext_override or default_ext
+            base_slug = _slugify(base)
+            if not dynamic:
+                return backup_dir / f"{base_slug}{ext}"
+            try:
+                name = format_name(project=project_slug, base=base_slug, stamp=stamp)
+            except Exception:
+                name = f"{project_slug}_{base_slug}_{stamp}"
+            return backup_dir / f"{name}{ext}"
 
         return builder
 
@@ -152,7 +375,8 @@ class BackupEngine:
         include_project_root_files: Optional[bool] = None,
         include_steps_override: Optional[Sequence[str]] = None,
         search_set_ids: Optional[Sequence[str]] = None,
-        compression_level: int = 6,
+        compression_level: Optional[CompressionLevel] = None,
+        zip_store_if_incompressible: bool = True,
     ) -> BackupResult:
         result = BackupResult(backup_root_path=None, is_dry_run=dry_run)
         result.started_at = datetime.now()
@@ -168,275 +392,107 @@ class BackupEngine:
             if skip_zip_override is not None
             else self.profile.skip_zip
         )
-
-        raw_steps = list(include_steps_override) if include_steps_override is not None else list(self.profile.include_steps)
-        invalid_steps = [s for s in raw_steps if s not in ALLOWED_STEPS]
-        if invalid_steps:
-            self._warn(f"Ignoring unknown include_steps: {', '.join(invalid_steps)}")
-        include_steps: List[BackupStepName] = [s for s in raw_steps if s in ALLOWED_STEPS]
+        if compression_level is None:
+            compression_level = self.profile.compression_level
+
+        if include_steps_override is not None:
+            raw_steps = list(include_steps_override)
+            invalid_steps = [s for s in raw_steps if s not in ALLOWED_STEPS]
+            if invalid_steps:
+                self._warn(f"Ignoring unknown include_steps: {', '.join(invalid_steps)}")
+            include_steps = step_flags(s for s in raw_steps if s in ALLOWED_STEPS)
+        else:
+            include_steps = self.profile.include_steps
 
         if include_project_root_files is False or self.profile.no_root_files:
-            include_steps = [s for s in include_steps if s != "project_root_files"]
-
-        phases: List[str] = ["Pre-checks"]
-        step_to_label = {
-            "trees": "Directory trees",
-            "code_txt": "Code text bundles",
-            "ts_tsx_md_bundles": "TS/TSX markdown bundles",
-            "full_ts_tsx_bundle": "Full TS/TSX bundle",
-            "configs": "Config bundles",
-            "tsconfig_bundle": "TSConfig bundle",
-            "api_group_bundles": "API grouped bundles",
-            "paths": "Path listings",
-            "project_root_files": "Project root helpers",
-            "keyword_search": "Keyword search bundles",
-        }
-        for step in include_steps:
-            if step in step_to_label:
-                phases.append(step_to_label[step])
-        if not skip_zip:
-            phases.append("ZIP archive")
-        phases.append("Summary")
-        phase_total = len(phases)
+            include_steps &= ~StepFlag.PROJECT_ROOT_FILES
+
+        if not self._has_search_sets():
+            include_steps &= ~StepFlag.KEYWORD_SEARCH
+
+        selected = [spec for spec in _STEP_TABLE if spec.flags & include_steps]
+        # Pre-checks + selected steps + optional ZIP + Summary.
+        phase_total = len(selected) + (1 if skip_zip else 2) + 1
 
         output_config = self.profile.output_config
 
+        self._ensured_dirs.clear()
+        self._abort_event.clear()
+        self._start_log_listener()
         try:
             # Phase 1: pre-checks and setup
             self._emit_progress(1, phase_total, "Pre-checks")
             self._phase_prechecks(result, dry_run, use_network_time, skip_zip, output_config, note or "")
+            backup_dir = self._require_backup_dir()
+            backup_dt = self._require_backup_dt()
+
+            ctx = _StepContext(
+                result=result,
+                backup_dir=backup_dir,
+                backup_dt=backup_dt,
+                name_builder=self._name_builder_or_raise(),
+                stamp=format_jalali_stamp(backup_dt),
+                output_config=output_config,
+                note=note or "",
+                search_sets=(
+                    self._resolve_search_sets(search_set_ids)
+                    if StepFlag.KEYWORD_SEARCH in include_steps
+                    else []
+                ),
+            )
 
             phase_index = 2
-            # Trees
-            if "trees" in include_steps:
-                self._emit_progress(phase_index, phase_total, step_to_label["trees"])
-                self._check_cancelled()
-                if dry_run:
-                    self._log(logging.INFO, "TREES", "DRY RUN: would generate directory trees.")
-                    result.stats["trees"] = {"planned": 1}
-                else:
-                    stats = trees.generate_trees(
-                        self.project.project_root,
-                        self._require_backup_dir(),
-                        output_config,
-                        self._name_builder_or_raise(),
-                        cancel_check=self._check_cancelled,
-                    )
-                    result.stats["trees"] = {"files_written": stats.files_written}
-                phase_index += 1
-
-            # Code text bundles
-            if "code_txt" in include_steps:
-                self._emit_progress(phase_index, phase_total, step_to_label["code_txt"])
-                self._check_cancelled()
-                if dry_run:
-                    self._log(logging.INFO, "CODE", "DRY RUN: would generate code text bundles.")
-                    result.stats["code_txt"] = {"planned": 1}
-                else:
-                    stats = code_bundles.generate_full_text_bundles(
-                        project_root=self.project.project_root,
-                        backup_dir=self._require_backup_dir(),
-                        profile=self.profile,
-                        stamp=format_jalali_stamp(self._require_backup_dt()),
-                        output_config=output_config,
-                        name_builder=self._name_builder_or_raise(),
-                        warn=self._warn,
-                        cancel_check=self._check_cancelled,
-                    )
-                    result.stats["code_txt"] = {
-                        "files_written": stats.files_written,
-                        "files_included": stats.files_included,
-                    }
-                phase_index += 1
-
-            # TS/TSX markdown bundles
-            if "ts_tsx_md_bundles" in include_steps:
-                self._emit_progress(phase_index, phase_total, step_to_label["ts_tsx_md_bundles"])
-                self._check_cancelled()
-                if dry_run:
-                    self._log(logging.INFO, "CODE", "DRY RUN: would generate TS/TSX markdown bundles.")
-                    result.stats["ts_tsx_md_bundles"] = {"planned": 1}
-                else:
-                    stats = code_bundles.generate_ts_bundles(
-                        project_root=self.project.project_root,
-                        backup_dir=self._require_backup_dir(),
-                        profile=self.profile,
-                        stamp=format_jalali_stamp(self._require_backup_dt()),
-                        name_builder=self._name_builder_or_raise(),
-                        warn=self._warn,
-                        cancel_check=self._check_cancelled,
-                    )
-                    result.stats["ts_tsx_md_bundles"] = {
-                        "files_written": stats.files_written,
-                        "files_included": stats.files_included,
-                    }
-                phase_index += 1
-
-            # Full TS/TSX bundle
-            if "full_ts_tsx_bundle" in include_steps:
-                self._emit_progress(phase_index, phase_total, step_to_label["full_ts_tsx_bundle"])
-                self._check_cancelled()
-                if dry_run:
-                    self._log(logging.INFO, "CODE", "DRY RUN: would generate full TS/TSX bundle.")
-                    result.stats["full_ts_tsx_bundle"] = {"planned": 1}
-                else:
-                    stats = code_bundles.generate_full_ts_bundle(
-                        project_root=self.project.project_root,
-                        backup_dir=self._require_backup_dir(),
-                        profile=self.profile,
-                        stamp=format_jalali_stamp(self._require_backup_dt()),
-                        name_builder=self._name_builder_or_raise(),
-                        warn=self._warn,
-                        cancel_check=self._check_cancelled,
-                    )
-                    result.stats["full_ts_tsx_bundle"] = {
-                        "files_written": stats.files_written,
-                        "files_included": stats.files_included,
-                    }
-                phase_index += 1
-
-            # Config bundles
-            if "configs" in include_steps or "tsconfig_bundle" in include_steps:
-                label = step_to_label["configs"] if "configs" in include_steps else step_to_label["tsconfig_bundle"]
-                self._emit_progress(phase_index, phase_total, label)
-                self._check_cancelled()
-                if dry_run:
-                    self._log(logging.INFO, "CONFIGS", "DRY RUN: would generate config bundles.")
-                    result.stats["configs"] = {"planned": 1}
-                else:
-                    stats = configs.generate_config_bundles(
-                        project_root=self.project.project_root,
-                        backup_dir=self._require_backup_dir(),
-                        profile=self.profile,
-                        output_config=output_config,
-                        name_builder=self._name_builder_or_raise(),
-                        warn=self._warn,
-                        cancel_check=self._check_cancelled,
-                    )
-                    result.stats["configs"] = {
-                        "files_written": stats.files_written,
-                        "files_included": stats.files_included,
-                        "configs_written": stats.configs_written,
-                    }
-                    result.stats["tsconfig_bundle"] = {
-                        "files_written": stats.tsconfig_written,
-                        "files_included": stats.files_included,
-                    }
-                phase_index += 1
-
-            # API bundles
-            if "api_group_bundles" in include_steps:
-                self._emit_progress(phase_index, phase_total, step_to_label["api_group_bundles"])
-                self._check_cancelled()
-                if dry_run:
-                    self._log(logging.INFO, "API_BUNDLES", "DRY RUN: would generate API group bundles.")
-                    result.stats["api_group_bundles"] = {"planned": 1}
-                else:
-                    stats = api_bundles.generate_api_bundles(
-                        project_root=self.project.project_root,
-                        backup_dir=self._require_backup_dir(),
-                        profile=self.profile,
-                        output_config=output_config,
-                        name_builder=self._name_builder_or_raise(),
-                        warn=self._warn,
-                        cancel_check=self._check_cancelled,
-                    )
-                    result.stats["api_group_bundles"] = {
-                        "files_written": stats.files_written,
-                        "files_included": stats.files_included,
-                    }
-                phase_index += 1
-
-            # Paths
-            if "paths" in include_steps:
-                self._emit_progress(phase_index, phase_total, step_to_label["paths"])
-                self._check_cancelled()
-                if dry_run:
-                    self._log(logging.INFO, "PATHS", "DRY RUN: would generate path listings.")
-                    result.stats["paths"] = {"planned": 1}
-                else:
-                    stats = paths.generate_paths_files(
-                        project_root=self.project.project_root,
-                        backup_dir=self._require_backup_dir(),
-                        output_config=output_config,
-                        name_builder=self._name_builder_or_raise(),
-                        cancel_check=self._check_cancelled,
-                    )
-                    result.stats["paths"] = {
-                        "files_written": stats.files_written,
-                        "paths_total": stats.paths_total,
-                        "ts_paths_total": stats.ts_paths_total,
-                    }
-                phase_index += 1
-
-            # Keyword search bundles
-            if "keyword_search" in include_steps and self._has_search_sets():
-                self._emit_progress(phase_index, phase_total, step_to_label["keyword_search"])
-                self._check_cancelled()
-                active_sets = list(self._resolve_search_sets(search_set_ids))
-                if dry_run:
-                    self._log(
+            if dry_run:
+                for spec in selected:
+                    self._check_cancelled()
+                    self._emit(
+                        phase_index,
+                        phase_total,
+                        spec.label_for(include_steps),
                         logging.INFO,
-                        "SEARCH",
-                        f"DRY RUN: would run keyword search for sets: {[s.id for s in active_sets]}",
-                    )
-                    result.stats["keyword_search"] = {"planned": len(active_sets)}
-                else:
-                    search_stats = search.run_search_sets(
-                        project_root=self.project.project_root,
-                        search_sets=active_sets,
-                        max_kb=self.profile.max_file_kb,
-                        output_dir=self._require_backup_dir() / "search",
-                        warn=self._warn,
-                        cancel_check=self._check_cancelled,
+                        spec.tag,
+                        spec.dry_message.format(sets=[s.id for s in ctx.search_sets]),
                     )
-                    result.stats["keyword_search"] = {
-                        sid: s.matches for sid, s in search_stats.items()
-                    }
-                phase_index += 1
-
-            # Project root helper files
-            if "project_root_files" in include_steps:
-                self._emit_progress(phase_index, phase_total, step_to_label["project_root_files"])
-                self._check_cancelled()
-                if dry_run:
-                    self._log(logging.INFO, "ROOT", "DRY RUN: would write Tree.md and AllCode_Backup.md.")
-                    result.stats["project_root_files"] = {"planned": 1}
-                else:
-                    stats = root_files.write_project_root_files(
-                        project_root=self.project.project_root,
-                        backup_dir=self._require_backup_dir(),
-                        backup_dt=self._require_backup_dt(),
-                        note=note or "",
-                        warn=self._warn,
-                        cancel_check=self._check_cancelled,
-                    )
-                    result.stats["project_root_files"] = {
-                        "files_written": stats.files_written,
-                    }
-                    result.created_files.extend(stats.files)
-                phase_index += 1
+                    result.stats[spec.stats_key] = StepStats(extra={"planned": spec.planned(ctx)})
+                    phase_index += 1
+            else:
+                if include_steps & _INDEXED_STEPS:
+                    ctx.file_index = FileIndex.build(self.project.project_root)
+                phase_index = self._run_steps(selected, include_steps, ctx, phase_index, phase_total)
 
             # ZIP
             if not skip_zip:
-                self._emit_progress(phase_index, phase_total, "ZIP archive")
                 self._check_cancelled()
                 if dry_run:
-                    self._log(logging.INFO, "ZIP", "DRY RUN: ZIP creation skipped.")
-                    result.stats["zip"] = {"planned": 1}
+                    self._emit(
+                        phase_index,
+                        phase_total,
+                        "ZIP archive",
+                        logging.INFO,
+                        "ZIP",
+                        "DRY RUN: ZIP creation skipped.",
+                    )
+                    result.stats["zip"] = StepStats(extra={"planned": 1})
                 else:
+                    self._emit(phase_index, phase_total, "ZIP archive")
                     zstats = zipper.create_zip(
-                        self._require_backup_dir(), 
+                        backup_dir,
                         self.project.zip_output_dir,
-                        compression_level=compression_level
+                        compression_level=compression_level,
+                        archive_format=output_config.archive_format,
+                        store_if_incompressible=zip_store_if_incompressible,
                     )
                     result.zip_path = zstats.zip_path
-                    result.stats["zip"] = {"created": 1 if zstats.zip_path else 0}
+                    result.stats["zip"] = StepStats(
+                        extra={"created": 1 if zstats.zip_path else 0, "stored": int(zstats.stored)},
+                    )
                 phase_index += 1
 
             # Summary
-            self._emit_progress(phase_index, phase_total, "Summary")
-            self._log(
+            self._emit(
+                phase_index,
+                phase_total,
+                "Summary",
                 logging.INFO,
                 "SUMMARY",
                 f"Backup completed. Dry run={dry_run}, zip={'created' if result.zip_path else 'skipped'}",
@@ -450,11 +506,191 @@ class BackupEngine:
         except Exception as exc:  # noqa: BLE001
             raise BackupIOError(str(exc)) from exc
         finally:
+            self._stop_log_listener()
             result.finished_at = datetime.now()
             result.duration_seconds = round(perf_counter() - start_perf, 3)
 
         return result
 
+    # ------------------------------------------------------------------ #
+    # Step runners (dispatched from _STEP_TABLE)
+    # ------------------------------------------------------------------ #
+    def _run_steps(
+        self,
+        specs: Sequence[_StepSpec],
+        include_steps: StepFlag,
+        ctx: _StepContext,
+        phase_index: int,
+        phase_total: int,
+    ) -> int:
+        """Run the parallel rows on a thread pool, then the sequential ones; return the next phase index.
+
+        The parallel rows share one label, reported before they start; the phase index
+        advances as each finishes. Their stats are merged in table order so the result
+        does not depend on thread scheduling. If one fails, the rest stop at their next
+        cancel_check.
+        """
+        concurrent = [spec for spec in specs if spec.parallel]
+        if concurrent:
+            self._check_cancelled()
+            outputs: Dict[_StepSpec, _StepOutput] = {}
+            label = f"Running {len(concurrent)} steps..."
+            self._emit(phase_index, phase_total, label)
+            pool = ThreadPoolExecutor(
+                max_workers=min(_MAX_STEP_WORKERS, len(concurrent)),
+                thread_name_prefix="backup-step",
+            )
+            try:
+                futures = {pool.submit(spec.run, self, ctx): spec for spec in concurrent}
+                remaining = len(futures)
+                for future in as_completed(futures):
+                    outputs[futures[future]] = future.result()
+                    phase_index += 1
+                    remaining -= 1
+                    if remaining:
+                        self._emit(phase_index, phase_total, label)
+            except BaseException:
+                self._abort_event.set()
+                raise
+            finally:
+                # On failure drop the queued steps; running ones stop at their next cancel_check,
+                # so no writer outlives run_backup.
+                pool.shutdown(wait=True, cancel_futures=True)
+            for spec in concurrent:
+                ctx.result.stats.update(outputs[spec])
+
+        for spec in specs:
+            if spec.parallel:
+                continue
+            self._check_cancelled()
+            self._emit(phase_index, phase_total, spec.label_for(include_steps))
+            ctx.result.stats.update(spec.run(self, ctx))
+            phase_index += 1
+        return phase_index
+
+    def _run_trees(self, ctx: _StepContext) -> _StepOutput:
+        stats = trees.generate_trees(
+            self.project.project_root,
+            ctx.backup_dir,
+            ctx.output_config,
+            ctx.name_builder,
+            cancel_check=self._check_cancelled,
+        )
+        return {"trees": StepStats(files_written=stats.files_written)}
+
+    def _run_code_txt(self, ctx: _StepContext) -> _StepOutput:
+        stats = code_bundles.generate_full_text_bundles(
+            project_root=self.project.project_root,
+            backup_dir=ctx.backup_dir,
+            profile=self.profile,
+            stamp=ctx.stamp,
+            output_config=ctx.output_config,
+            name_builder=ctx.name_builder,
+            warn=self._warn,
+            cancel_check=self._check_cancelled,
+            index=ctx.file_index,
+        )
+        return {"code_txt": StepStats(stats.files_written, stats.files_included)}
+
+    def _run_ts_tsx_md_bundles(self, ctx: _StepContext) -> _StepOutput:
+        stats = code_bundles.generate_ts_bundles(
+            project_root=self.project.project_root,
+            backup_dir=ctx.backup_dir,
+            profile=self.profile,
+            stamp=ctx.stamp,
+            name_builder=ctx.name_builder,
+            warn=self._warn,
+            cancel_check=self._check_cancelled,
+            index=ctx.file_index,
+        )
+        return {"ts_tsx_md_bundles": StepStats(stats.files_written, stats.files_included)}
+
+    def _run_full_ts_tsx_bundle(self, ctx: _StepContext) -> _StepOutput:
+        stats = code_bundles.generate_full_ts_bundle(
+            project_root=self.project.project_root,
+            backup_dir=ctx.backup_dir,
+            profile=self.profile,
+            stamp=ctx.stamp,
+            name_builder=ctx.name_builder,
+            warn=self._warn,
+            cancel_check=self._check_cancelled,
+            index=ctx.file_index,
+        )
+        return {"full_ts_tsx_bundle": StepStats(stats.files_written, stats.files_included)}
+
+    def _run_configs(self, ctx: _StepContext) -> _StepOutput:
+        stats = configs.generate_config_bundles(
+            project_root=self.project.project_root,
+            backup_dir=ctx.backup_dir,
+            profile=self.profile,
+            output_config=ctx.output_config,
+            name_builder=ctx.name_builder,
+            warn=self._warn,
+            cancel_check=self._check_cancelled,
+            index=ctx.file_index,
+        )
+        return {
+            "configs": StepStats(
+                stats.files_written,
+                stats.files_included,
+                extra={"configs_written": stats.configs_written},
+            ),
+            "tsconfig_bundle": StepStats(stats.tsconfig_written, stats.files_included),
+        }
+
+    def _run_api_group_bundles(self, ctx: _StepContext) -> _StepOutput:
+        stats = api_bundles.generate_api_bundles(
+            project_root=self.project.project_root,
+            backup_dir=ctx.backup_dir,
+            profile=self.profile,
+            output_config=ctx.output_config,
+            name_builder=ctx.name_builder,
+            warn=self._warn,
+            cancel_check=self._check_cancelled,
+            index=ctx.file_index,
+        )
+        return {"api_group_bundles": StepStats(stats.files_written, stats.files_included)}
+
+    def _run_paths(self, ctx: _StepContext) -> _StepOutput:
+        stats = paths.generate_paths_files(
+            project_root=self.project.project_root,
+            backup_dir=ctx.backup_dir,
+            output_config=ctx.output_config,
+            name_builder=ctx.name_builder,
+            cancel_check=self._check_cancelled,
+            index=ctx.file_index,
+        )
+        return {
+            "paths": StepStats(
+                files_written=stats.files_written,
+                extra={"paths_total": stats.paths_total, "ts_paths_total": stats.ts_paths_total},
+            )
+        }
+
+    def _run_keyword_search(self, ctx: _StepContext) -> _StepOutput:
+        search_stats = search.run_search_sets(
+            project_root=self.project.project_root,
+            search_sets=ctx.search_sets,
+            max_kb=self.profile.max_file_kb,
+            output_dir=ctx.backup_dir / "search",
+            warn=self._warn,
+            cancel_check=self._check_cancelled,
+            parallel=self.profile.parallel_io,
+        )
+        return {"keyword_search": StepStats(extra={sid: s.matches for sid, s in search_stats.items()})}
+
+    def _run_project_root_files(self, ctx: _StepContext) -> _StepOutput:
+        stats = root_files.write_project_root_files(
+            project_root=self.project.project_root,
+            backup_dir=ctx.backup_dir,
+            backup_dt=ctx.backup_dt,
+            note=ctx.note,
+            warn=self._warn,
+            cancel_check=self._check_cancelled,
+        )
+        ctx.result.created_files.extend(stats.files)
+        return {"project_root_files": StepStats(files_written=stats.files_written)}
+
     # ------------------------------------------------------------------ #
     # Helper phases
     # ------------------------------------------------------------------ #
@@ -478,17 +714,18 @@ class BackupEngine:
             if dry_run:
                 self._log(logging.INFO, "PRECHECK", f"DRY RUN: would create backup root: {backup_root}")
             else:
-                backup_root.mkdir(parents=True, exist_ok=True)
+                self._ensure_dir(backup_root)
         elif not backup_root.is_dir():
             raise BackupConfigError(f"Backup root is not a directory: {backup_root}")
 
         if not skip_zip:
+            zipper.check_archive_format(output_config.archive_format)
             zip_dir = self.project.zip_output_dir.expanduser()
             if not zip_dir.exists():
                 if dry_run:
                     self._log(logging.INFO, "PRECHECK", f"DRY RUN: would create ZIP output dir: {zip_dir}")
                 else:
-                    zip_dir.mkdir(parents=True, exist_ok=True)
+                    self._ensure_dir(zip_dir)
             elif not zip_dir.is_dir():
                 raise BackupConfigError(f"ZIP output directory is invalid: {zip_dir}")
 
@@ -503,7 +740,7 @@ class BackupEngine:
         if dry_run:
             self._log(logging.INFO, "PRECHECK", f"DRY RUN: backup directory planned at {self._backup_dir}")
         else:
-            self._backup_dir.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(self._backup_dir)
             result.created_directories.append(self._backup_dir)
             self._log(logging.INFO, "PRECHECK", f"Backup directory: {self._backup_dir}")
 
@@ -534,42 +771,27 @@ class BackupEngine:
         if dry_run:
             return None
         backup_note = self._name_builder_or_raise()("backup_note", ext_override=extension_for_format(output_config.format))
-        backup_note.parent.mkdir(parents=True, exist_ok=True)
-
-        lines = [
-            f"Time source: {time_source}",
-            f"ISO datetime: {dt.isoformat()}",
-            f"Jalali datetime: {format_jalali_datetime(dt)}",
-            "",
-            note or "",
-        ]
-
-        if output_config.format == OutputFormat.MD:
-            content = "\n".join(
-                [
-                    "# Backup Note",
-                    "",
-                    f"- **Time source:** {time_source}",
-                    f"- **ISO datetime:** {dt.isoformat()}",
-                    f"- **Jalali datetime:** {format_jalali_datetime(dt)}",
-                    "",
-                    note or "_No note provided._",
-                ]
-            )
-        elif output_config.format == OutputFormat.HTML:
-            content = (
-                "<h2>Backup Note</h2>\n"
-                f"<p><strong>Time source:</strong> {time_source}<br/>"
-                f"<strong>ISO datetime:</strong> {dt.isoformat()}<br/>"
-                f"<strong>Jalali datetime:</strong> {format_jalali_datetime(dt)}</p>\n"
-                f"<p>{note or 'No note provided.'}</p>\n"
-            )
-        else:
-            content = "\n".join(lines) + "\n"
-
-        backup_note.write_text(content, encoding="utf-8")
+        self._ensure_dir(backup_note.parent)
+
+        fmt = output_config.format
+        fields = {
+            "time_source": time_source,
+            "iso": dt.isoformat(),
+            "jalali": format_jalali_datetime(dt),
+            "note": note or _EMPTY_NOTE[fmt],
+        }
+        if fmt == OutputFormat.HTML:
+            fields = {key: html.escape(value) for key, value in fields.items()}
+        backup_note.write_bytes(_NOTE_TEMPLATES[fmt].format_map(fields).encode("utf-8"))
         return backup_note
 
+    def _ensure_dir(self, path: Path) -> None:
+        if path in self._ensured_dirs:
+            return
+        path.mkdir(parents=True, exist_ok=True)
+        self._ensured_dirs.add(path)
+        self._ensured_dirs.update(path.parents)
+
     def _require_backup_dir(self) -> Path:
         if self._backup_dir is None:
             raise BackupError("Backup directory was not prepared")
@@ -595,3 +817,55 @@ class BackupEngine:
 
     def _has_search_sets(self) -> bool:
         return bool(self._app_config and self._app_config.search_sets)
+
+
+# Steps in execution order. Each row is skipped unless one of its flags is selected.
+_STEP_TABLE: Tuple[_StepSpec, ...] = (
+    _StepSpec(StepFlag.TREES, "trees", "TREES", "DRY RUN: would generate directory trees.", BackupEngine._run_trees),
+    _StepSpec(StepFlag.CODE_TXT, "code_txt", "CODE", "DRY RUN: would generate code text bundles.", BackupEngine._run_code_txt),
+    _StepSpec(
+        StepFlag.TS_TSX_MD_BUNDLES,
+        "ts_tsx_md_bundles",
+        "CODE",
+        "DRY RUN: would generate TS/TSX markdown bundles.",
+        BackupEngine._run_ts_tsx_md_bundles,
+    ),
+    _StepSpec(
+        StepFlag.FULL_TS_TSX_BUNDLE,
+        "full_ts_tsx_bundle",
+        "CODE",
+        "DRY RUN: would generate full TS/TSX bundle.",
+        BackupEngine._run_full_ts_tsx_bundle,
+    ),
+    _StepSpec(
+        StepFlag.CONFIGS | StepFlag.TSCONFIG_BUNDLE,
+        "configs",
+        "CONFIGS",
+        "DRY RUN: would generate config bundles.",
+        BackupEngine._run_configs,
+    ),
+    _StepSpec(
+        StepFlag.API_GROUP_BUNDLES,
+        "api_group_bundles",
+        "API_BUNDLES",
+        "DRY RUN: would generate API group bundles.",
+        BackupEngine._run_api_group_bundles,
+    ),
+    _StepSpec(StepFlag.PATHS, "paths", "PATHS", "DRY RUN: would generate path listings.", BackupEngine._run_paths),
+    _StepSpec(
+        StepFlag.KEYWORD_SEARCH,
+        "keyword_search",
+        "SEARCH",
+        "DRY RUN: would run keyword search for sets: {sets}",
+        BackupEngine._run_keyword_search,
+        planned=lambda ctx: len(ctx.search_sets),
+    ),
+    _StepSpec(
+        StepFlag.PROJECT_ROOT_FILES,
+        "project_root_files",
+        "ROOT",
+        "DRY RUN: would write Tree.md and AllCode_Backup.md.",
+        BackupEngine._run_project_root_files,
+        parallel=False,
+    ),
+)
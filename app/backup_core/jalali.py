@@ -1,7 +1,14 @@
 from __future__ import annotations
 
+from bisect import bisect_right
+from calendar import isleap
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+
+# Days before each month (index = month - 1) in a common Gregorian / any Jalali year.
+_G_CUMDAYS = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+_J_CUMDAYS = (0, 31, 62, 93, 124, 155, 186, 216, 246, 276, 306, 336)
 
 
 @dataclass(frozen=True)
@@ -19,22 +26,21 @@ def gregorian_to_jalali(dt: datetime) -> JalaliDate:
     arithmetic conversions (e.g., Roozbeh Pournader / Mohammad Toosi),
     which operate on day counts relative to the Persian epoch.
     """
-    gy = dt.year - 1600
-    gm = dt.month - 1
-    gd = dt.day - 1
+    # Keyed on the calendar date only: aware datetimes hash by UTC instant,
+    # so caching on dt itself could mix up the same instant in two timezones.
+    return _jalali_from_ymd(dt.year, dt.month, dt.day)
+
+
+@lru_cache(maxsize=64)
+def _jalali_from_ymd(year: int, month: int, day: int) -> JalaliDate:
+    gy = year - 1600
+    gm = month - 1
+    gd = day - 1
 
     g_day_no = 365 * gy + (gy + 3) // 4 - (gy + 99) // 100 + (gy + 399) // 400
 
-    g_days_in_month = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-    for i in range(gm):
-        g_day_no += g_days_in_month[i]
-    # leap adjustment
-    if gm > 1 and (
-        (gy % 4 == 0 and gy % 100 != 0)
-        or (gy % 400 == 0)
-    ):
-        g_day_no += 1
-    g_day_no += gd
+    # Leap day counts only once February is over.
+    g_day_no += _G_CUMDAYS[gm] + (gm > 1 and isleap(year)) + gd
 
     j_day_no = g_day_no - 79
     j_np = j_day_no // 12053  # 12053 = 365*33 + 8 leap
@@ -47,15 +53,8 @@ def gregorian_to_jalali(dt: datetime) -> JalaliDate:
         jy += (j_day_no - 1) // 365
         j_day_no = (j_day_no - 1) % 365
 
-    jm = 0
-    jd = 0
-    jalali_months = [31, 31, 31, 31, 31, 31, 30, 30, 30, 30, 30, 29]
-    for i, days_in_month in enumerate(jalali_months):
-        if j_day_no < days_in_month:
-            jm = i + 1
-            jd = j_day_no + 1
-            break
-        j_day_no -= days_in_month
+    jm = bisect_right(_J_CUMDAYS, j_day_no)
+    jd = j_day_no - _J_CUMDAYS[jm - 1] + 1
 
     return JalaliDate(jy, jm, jd)
 
@@ -67,7 +66,7 @@ def format_jalali_stamp(dt: datetime) -> str:
     Example: 1403-01-15_23-45
     """
     j = gregorian_to_jalali(dt)
-    return f"{j.year:04d}-{j.month:02d}-{j.day:02d}_{dt:%H-%M}"
+    return f"{j.year:04d}-{j.month:02d}-{j.day:02d}_{dt.hour:02d}-{dt.minute:02d}"
 
 
 def format_jalali_datetime(dt: datetime) -> str:
@@ -77,4 +76,4 @@ def format_jalali_datetime(dt: datetime) -> str:
     Example: 1403-01-15 23:45:10
     """
     j = gregorian_to_jalali(dt)
-    return f"{j.year:04d}-{j.month:02d}-{j.day:02d} {dt:%H:%M:%S}"
+    return f"{j.year:04d}-{j.month:02d}-{j.day:02d} {dt.hour:02d}:{dt.minute:02d}:{dt.second:02d}"
@@ -6,11 +6,14 @@ Automatically detects project type based on files and folder structure.
 from __future__ import annotations
 
 from dataclasses import dataclass, field
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
 import json
+import os
 
 from .config import ProjectType
+from .scanning import ScanConfig, iter_files
 
 
 @dataclass
@@ -54,17 +57,38 @@ PYTHON_INDICATORS = {
     "tensorflow": ["tensorflow"],
 }
 
+# Lower-cased indicator sets, built once so detection is a set intersection per framework.
+FRONTEND_INDICATOR_SETS = {k: frozenset(i.lower() for i in v) for k, v in FRONTEND_INDICATORS.items()}
+BACKEND_INDICATOR_SETS = {k: frozenset(i.lower() for i in v) for k, v in BACKEND_INDICATORS.items() if v}
+PYTHON_INDICATOR_SETS = {k: frozenset(i.lower() for i in v) for k, v in PYTHON_INDICATORS.items()}
+
+
+def _dir_mtime_ns(path: Path) -> Optional[int]:
+    # A directory's mtime changes when entries are added or removed, so it
+    # invalidates the cached root listing below.
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
 
 def _read_package_json(path: Path) -> Optional[Dict]:
     """Read and parse package.json if exists."""
-    pj = path / "package.json"
-    if pj.exists():
-        try:
-            with pj.open("r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            pass
-    return None
+    try:
+        st = os.stat(path / "package.json")
+    except OSError:
+        return None
+    return _parse_package_json(str(path / "package.json"), st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=256)
+def _parse_package_json(pj: str, mtime_ns: int, size: int) -> Optional[Dict]:
+    # Keyed by mtime and size so an edited package.json is re-read.
+    try:
+        with open(pj, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return None
 
 
 def _read_requirements(path: Path) -> List[str]:
@@ -113,22 +137,57 @@ def _get_all_deps(pkg_json: Optional[Dict]) -> Set[str]:
     return deps
 
 
+def _has_file_with_suffix(root: Path, suffix: str) -> bool:
+    """True on the first file ending in suffix; skips node_modules, .git and other heavy dirs."""
+    scan = ScanConfig(root=root, allowed_extensions=frozenset({suffix}), skip_if_contains=())
+    return next(iter_files(scan), None) is not None
+
+
+# Lockfile / manifest -> package manager, in detection priority order.
+PACKAGE_MANAGER_FILES = (
+    ("pnpm-lock.yaml", "pnpm"),
+    ("yarn.lock", "yarn"),
+    ("package-lock.json", "npm"),
+    ("bun.lockb", "bun"),
+    ("requirements.txt", "pip"),
+    ("pyproject.toml", "pip"),
+    ("Pipfile", "pipenv"),
+    ("poetry.lock", "poetry"),
+)
+
+MONOREPO_FILES = frozenset({"pnpm-workspace.yaml", "lerna.json", "nx.json", "turbo.json"})
+MONOREPO_DIRS = frozenset({"apps", "packages"})
+
+
+@lru_cache(maxsize=256)
+def _list_root(root: str, mtime_ns: Optional[int]) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    """(entry names, directory names) of root from one scandir, shared by the probes below."""
+    names: Set[str] = set()
+    dirs: Set[str] = set()
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                names.add(entry.name)
+                try:
+                    if entry.is_dir():
+                        dirs.add(entry.name)
+                except OSError:
+                    pass
+    except OSError:
+        pass
+    return frozenset(names), frozenset(dirs)
+
+
+def _root_listing(path: Path) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+    return _list_root(str(path), _dir_mtime_ns(path))
+
+
 def _detect_package_manager(path: Path) -> Optional[str]:
     """Detect which package manager is being used."""
-    if (path / "pnpm-lock.yaml").exists():
-        return "pnpm"
-    if (path / "yarn.lock").exists():
-        return "yarn"
-    if (path / "package-lock.json").exists():
-        return "npm"
-    if (path / "bun.lockb").exists():
-        return "bun"
-    if (path / "requirements.txt").exists() or (path / "pyproject.toml").exists():
-        return "pip"
-    if (path / "Pipfile").exists():
-        return "pipenv"
-    if (path / "poetry.lock").exists():
-        return "poetry"
+    names, _ = _root_listing(path)
+    for filename, manager in PACKAGE_MANAGER_FILES:
+        if filename in names:
+            return manager
     return None
 
 
@@ -138,18 +197,16 @@ def _detect_monorepo(path: Path, pkg_json: Optional[Dict]) -> bool:
     if pkg_json:
         if "workspaces" in pkg_json:
             return True
-    
-    # Check for monorepo tools
-    monorepo_files = ["pnpm-workspace.yaml", "lerna.json", "nx.json", "turbo.json"]
-    for f in monorepo_files:
-        if (path / f).exists():
-            return True
-    
-    # Check for apps/packages structure
-    if (path / "apps").is_dir() or (path / "packages").is_dir():
-        return True
-    
-    return False
+
+    # Monorepo tool configs, or an apps/packages structure
+    names, dirs = _root_listing(path)
+    return not MONOREPO_FILES.isdisjoint(names) or not MONOREPO_DIRS.isdisjoint(dirs)
+
+
+def clear_detector_caches() -> None:
+    """Drop memoized package.json parses and root directory listings."""
+    _parse_package_json.cache_clear()
+    _list_root.cache_clear()
 
 
 def analyze_project(project_root: Path) -> ProjectAnalysis:
@@ -167,25 +224,27 @@ def analyze_project(project_root: Path) -> ProjectAnalysis:
     pkg_json = _read_package_json(project_root)
     py_deps = _read_requirements(project_root)
     all_deps = _get_all_deps(pkg_json)
+    all_deps_lc = {d.lower() for d in all_deps}
+    py_deps_set = set(py_deps)
     
     result.package_manager = _detect_package_manager(project_root)
     result.is_monorepo = _detect_monorepo(project_root, pkg_json)
     
     # Detect frontend frameworks
-    for framework, indicators in FRONTEND_INDICATORS.items():
-        if any(ind in all_deps for ind in indicators):
+    for framework, indicators in FRONTEND_INDICATOR_SETS.items():
+        if indicators & all_deps_lc:
             result.has_frontend = True
             result.frameworks.append(framework)
             if "javascript" not in result.languages:
                 result.languages.append("javascript")
             if "typescript" not in result.languages and (
-                "typescript" in all_deps or list(project_root.glob("**/*.ts"))
+                "typescript" in all_deps_lc or _has_file_with_suffix(project_root, ".ts")
             ):
                 result.languages.append("typescript")
     
     # Detect backend frameworks (Node.js)
-    for framework, indicators in BACKEND_INDICATORS.items():
-        if indicators and any(ind in all_deps for ind in indicators):
+    for framework, indicators in BACKEND_INDICATOR_SETS.items():
+        if indicators & all_deps_lc:
             result.has_backend = True
             if framework not in result.frameworks:
                 result.frameworks.append(framework)
@@ -193,13 +252,13 @@ def analyze_project(project_root: Path) -> ProjectAnalysis:
     # Detect Python projects
     if py_deps:
         result.languages.append("python")
-        for framework, indicators in PYTHON_INDICATORS.items():
-            if any(ind in py_deps for ind in [i.lower() for i in indicators]):
+        for framework, indicators in PYTHON_INDICATOR_SETS.items():
+            if indicators & py_deps_set:
                 result.frameworks.append(framework)
                 result.has_backend = True
     
     # Check for Python files if no requirements.txt
-    if not py_deps and list(project_root.glob("*.py")):
+    if not py_deps and next(project_root.glob("*.py"), None) is not None:
         if "python" not in result.languages:
             result.languages.append("python")
     
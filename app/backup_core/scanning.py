@@ -1,13 +1,14 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, Iterator, List, Optional, Sequence, Set
+from typing import AbstractSet, Callable, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 import os
+import re
 
 
-DEFAULT_SKIP_DIRS: Set[str] = {
+DEFAULT_SKIP_DIRS: FrozenSet[str] = frozenset({
     "node_modules",
     ".next",
     ".turbo",
@@ -27,9 +28,9 @@ DEFAULT_SKIP_DIRS: Set[str] = {
     ".idea",
     "vendor",
     "Pods",
-}
+})
 
-DEFAULT_SKIP_FILES: Set[str] = {
+DEFAULT_SKIP_FILES: FrozenSet[str] = frozenset({
     "package-lock.json",
     "pnpm-lock.yaml",
     "yarn.lock",
@@ -37,7 +38,7 @@ DEFAULT_SKIP_FILES: Set[str] = {
     "CHANGELOG",
     ".DS_Store",
     "README.md",
-}
+})
 
 DEFAULT_TEST_PATTERNS: Sequence[str] = (".spec.", ".test.", ".e2e-spec.")
 
@@ -45,10 +46,27 @@ DEFAULT_TEST_PATTERNS: Sequence[str] = (".spec.", ".test.", ".e2e-spec.")
 @dataclass(frozen=True)
 class ScanConfig:
     root: Path
-    allowed_extensions: Optional[Set[str]] = None
-    skip_dirs: Set[str] = frozenset(DEFAULT_SKIP_DIRS)
-    skip_files: Set[str] = frozenset(DEFAULT_SKIP_FILES)
+    # Any iterable of suffixes; stored as a frozenset.
+    allowed_extensions: Optional[AbstractSet[str]] = None
+    skip_dirs: FrozenSet[str] = DEFAULT_SKIP_DIRS
+    skip_files: FrozenSet[str] = DEFAULT_SKIP_FILES
     skip_if_contains: Sequence[str] = DEFAULT_TEST_PATTERNS
+    _skip_re: Optional[re.Pattern] = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        exts = self.allowed_extensions
+        if exts is not None and not isinstance(exts, frozenset):
+            object.__setattr__(self, "allowed_extensions", frozenset(exts))
+        if self.skip_if_contains:
+            # One alternation search per file name instead of a Python-level `in` per pattern.
+            pattern = re.compile("|".join(map(re.escape, self.skip_if_contains)))
+            object.__setattr__(self, "_skip_re", pattern)
+
+
+def path_suffix(name: str) -> str:
+    """Same rule as PurePath.suffix, without building a Path per entry."""
+    i = name.rfind(".")
+    return name[i:] if 0 < i < len(name) - 1 else ""
 
 
 def iter_files(config: ScanConfig) -> Iterator[Path]:
@@ -56,29 +74,219 @@ def iter_files(config: ScanConfig) -> Iterator[Path]:
     Walk the project tree under config.root, yielding files
     while skipping heavy or irrelevant directories and files.
     """
-    root = config.root
+    for entry in _walk(config):
+        yield Path(entry.path)
+
+
+def iter_file_strs(config: ScanConfig) -> Iterator[str]:
+    """iter_files without the per-file Path construction."""
+    for entry in _walk(config):
+        yield entry.path
+
+
+def root_prefix_len(root: Path) -> int:
+    """Slice path strings yielded under root with this to get their root-relative form."""
+    return len(os.path.join(os.fspath(root), ""))
+
+
+def _walk(config: ScanConfig) -> Iterator[os.DirEntry]:
+    # Uses os.scandir directly so the d_type from readdir answers is_dir()
+    # without a stat per entry. Order, symlink handling and silent skipping
+    # of unreadable directories match os.walk(topdown=True).
     allowed_exts = config.allowed_extensions
+    skip_dirs = config.skip_dirs
+    skip_files = config.skip_files
+    skip_search = config._skip_re.search if config._skip_re is not None else None
 
-    for dirpath, dirnames, filenames in os.walk(root):
-        # Strip skipped directories in-place so os.walk does not enter them.
-        dirnames[:] = [
-            d for d in dirnames if d not in config.skip_dirs
-        ]
+    stack: List[str] = [os.fspath(config.root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
 
-        current_dir = Path(dirpath)
-        for filename in filenames:
-            if filename in config.skip_files:
+        subdirs: List[str] = []
+        for entry in entries:
+            name = entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if is_dir:
+                # Like os.walk(followlinks=False): symlinked dirs are neither yielded nor entered.
+                if name not in skip_dirs and not entry.is_symlink():
+                    subdirs.append(entry.path)
+                continue
+            if name in skip_files:
+                continue
+            if skip_search is not None and skip_search(name):
+                continue
+            if allowed_exts is not None and path_suffix(name) not in allowed_exts:
                 continue
-            if any(pattern in filename for pattern in config.skip_if_contains):
+            yield entry
+
+        # Reversed so the first subdirectory is popped (and walked) first.
+        stack.extend(reversed(subdirs))
+
+
+def iter_tree_entries(root: Path, keep_dir: Optional[Callable[[str], bool]] = None) -> Iterator[os.DirEntry]:
+    """
+    Every non-directory entry under root, in os.walk(topdown=True) order,
+    entering only subdirectories whose name keep_dir accepts.
+    """
+    stack: List[str] = [os.fspath(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+
+        subdirs: List[str] = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            if not is_dir:
+                yield entry
+            elif not entry.is_symlink() and (keep_dir is None or keep_dir(entry.name)):
+                subdirs.append(entry.path)
+
+        stack.extend(reversed(subdirs))
+
+
+def _sorted_listing(path: str) -> Iterator[os.DirEntry]:
+    try:
+        with os.scandir(path) as it:
+            entries = list(it)
+    except OSError:
+        return iter(())
+    entries.sort(key=lambda e: os.path.normcase(e.name))
+    return iter(entries)
+
+
+def _walk_sorted(config: ScanConfig) -> Iterator[os.DirEntry]:
+    # Same selection as _walk, but each directory listing is sorted and
+    # subdirectories are walked in place among the files, so files come out
+    # in the order sorting their Paths would give, one small sort per directory.
+    allowed_exts = config.allowed_extensions
+    skip_dirs = config.skip_dirs
+    skip_files = config.skip_files
+    skip_search = config._skip_re.search if config._skip_re is not None else None
+
+    stack: List[Iterator[os.DirEntry]] = [_sorted_listing(os.fspath(config.root))]
+    while stack:
+        entry = next(stack[-1], None)
+        if entry is None:
+            stack.pop()
+            continue
+        name = entry.name
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        if is_dir:
+            if name not in skip_dirs and not entry.is_symlink():
+                stack.append(_sorted_listing(entry.path))
+            continue
+        if name in skip_files:
+            continue
+        if skip_search is not None and skip_search(name):
+            continue
+        if allowed_exts is not None and path_suffix(name) not in allowed_exts:
+            continue
+        yield entry
+
+
+def iter_file_strs_sorted(config: ScanConfig) -> Iterator[str]:
+    """iter_file_strs in sorted Path order, streamed rather than sorted as a whole."""
+    for entry in _walk_sorted(config):
+        yield entry.path
+
+
+def walk_includes(base: Path, root: Path) -> bool:
+    """
+    True if a default walk of base yields, under root, exactly the files a
+    default walk of root itself would.
+    """
+    try:
+        rel = root.relative_to(base)
+    except ValueError:
+        return False
+    current = base
+    for part in rel.parts:
+        # The walk of base never enters skipped or symlinked directories; a direct walk would.
+        current = current / part
+        if part in DEFAULT_SKIP_DIRS or current.is_symlink():
+            return False
+    return True
+
+
+@dataclass(frozen=True)
+class FileIndex:
+    """
+    Snapshot of every file a default ScanConfig yields under root, taken once
+    per backup so steps filter a list instead of re-walking the tree.
+    """
+
+    root: Path
+    # (path, name, suffix) in sorted Path order, so filtered views are sorted too.
+    entries: Tuple[Tuple[str, str, str], ...]
+
+    @classmethod
+    def build(cls, root: Path) -> "FileIndex":
+        entries = tuple((e.path, e.name, path_suffix(e.name)) for e in _walk_sorted(ScanConfig(root=root)))
+        return cls(root=root, entries=entries)
+
+    def covers(self, root: Path) -> bool:
+        """True if iter_files(ScanConfig(root)) would yield exactly this index's files under root."""
+        return walk_includes(self.root, root)
+
+    def filter(
+        self,
+        root: Optional[Path] = None,
+        exts: Optional[AbstractSet[str]] = None,
+    ) -> Iterator[Path]:
+        return map(Path, self.filter_strs(root, exts))
+
+    def filter_strs(
+        self,
+        root: Optional[Path] = None,
+        exts: Optional[AbstractSet[str]] = None,
+    ) -> Iterator[str]:
+        prefix = None if root is None or root == self.root else os.path.join(os.fspath(root), "")
+        for path, _, suffix in self.entries:
+            if prefix is not None and not path.startswith(prefix):
                 continue
-            path = current_dir / filename
-            if allowed_exts is not None and path.suffix not in allowed_exts:
+            if exts is not None and suffix not in exts:
                 continue
             yield path
 
 
+def scan_files(
+    root: Path,
+    allowed_extensions: Optional[AbstractSet[str]] = None,
+    index: Optional[FileIndex] = None,
+) -> Iterator[Path]:
+    """iter_files with default skips, in sorted Path order, served from index when it covers root."""
+    return map(Path, scan_file_strs(root, allowed_extensions, index))
+
+
+def scan_file_strs(
+    root: Path,
+    allowed_extensions: Optional[AbstractSet[str]] = None,
+    index: Optional[FileIndex] = None,
+) -> Iterator[str]:
+    """scan_files yielding path strings; callers build Paths only where they need them."""
+    if index is not None and index.covers(root):
+        return index.filter_strs(root, allowed_extensions)
+    return iter_file_strs_sorted(ScanConfig(root=root, allowed_extensions=allowed_extensions))
+
+
 def iter_files_for_extensions(root: Path, exts: Iterable[str]) -> Iterator[Path]:
-    return iter_files(ScanConfig(root=root, allowed_extensions=set(exts)))
+    return iter_files(ScanConfig(root=root, allowed_extensions=exts))
 
 
 def iter_project_areas(project_root: Path) -> List[Path]:
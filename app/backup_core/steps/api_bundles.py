@@ -1,21 +1,20 @@
 from __future__ import annotations
 
-import html
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, List, Optional
+from typing import Callable, Dict, List, Optional
 
-from .code_bundles import read_text_with_limit
+from .code_bundles import BundleFile, escape_html, read_text_with_limit
 from ..config import (
     BackupProfileConfig,
     OutputConfig,
     OutputFormat,
     SeparatorStyle,
-    get_separator_format,
+    separator_renderer,
     extension_for_format,
 )
 from ..errors import BackupCancelled
-from ..scanning import ScanConfig, iter_files
+from ..scanning import FileIndex, root_prefix_len, scan_file_strs
 
 
 @dataclass
@@ -32,27 +31,34 @@ PATTERNS = {
 }
 
 
-def _collect_group_files(api_root: Path, suffix: str) -> List[Path]:
-    scan = ScanConfig(root=api_root, allowed_extensions={".ts"})
-    result: List[Path] = []
-    for path in iter_files(scan):
-        if path.name.endswith(suffix):
-            result.append(path)
-    return sorted(result)
+_SUFFIX_ITEMS = tuple(PATTERNS.items())
+_TS_ONLY = frozenset({".ts"})
 
 
-def _format_header(rel: Path, output_config: OutputConfig) -> str:
+def _collect_groups(api_root: Path, index: Optional[FileIndex] = None) -> Dict[str, List[str]]:
+    """Bucket every .ts file under api_root by group in a single walk; buckets keep the walk's sorted order."""
+    buckets: Dict[str, List[str]] = {group: [] for group in PATTERNS}
+    for path in scan_file_strs(api_root, _TS_ONLY, index):
+        # The suffixes contain no separator, so testing the full path equals testing the name.
+        for group, suffix in _SUFFIX_ITEMS:
+            if path.endswith(suffix):
+                buckets[group].append(path)
+    return buckets
+
+
+def _header_renderer(output_config: OutputConfig) -> Callable[[object], str]:
+    # Resolved once per bundle; the returned callable runs per file.
     style = output_config.separator_style
     if output_config.format == OutputFormat.MD and style == SeparatorStyle.EQUALS:
         style = SeparatorStyle.MARKDOWN
-    return get_separator_format(style, output_config.custom_separator).format(path=rel)
+    return separator_renderer(style, output_config.custom_separator)
 
 
-def _wrap_body(content: str, rel: Path, output_config: OutputConfig) -> str:
+def _wrap_body(content: str, rel: str, output_config: OutputConfig) -> str:
     if output_config.format == OutputFormat.MD:
         return f"```ts\n{content}\n```\n"
     if output_config.format == OutputFormat.HTML:
-        return f"<pre>{html.escape(content)}</pre>\n"
+        return f"<pre>{escape_html(content)}</pre>\n"
     return content
 
 
@@ -64,6 +70,7 @@ def generate_api_bundles(
     name_builder: Callable[[str, Optional[str]], Path],
     warn: Optional[Callable[[str], None]] = None,
     cancel_check: Optional[Callable[[], bool]] = None,
+    index: Optional[FileIndex] = None,
 ) -> ApiBundleStats:
     stats = ApiBundleStats()
     _ = backup_dir
@@ -72,31 +79,30 @@ def generate_api_bundles(
         return stats
 
     ext = extension_for_format(output_config.format)
+    html_mode = output_config.format == OutputFormat.HTML
+    render_header = _header_renderer(output_config)
+    cut = root_prefix_len(api_root)
 
-    for group, suffix in PATTERNS.items():
-        files = _collect_group_files(api_root, suffix)
+    for group, files in _collect_groups(api_root, index).items():
         if not files:
             continue
         out_file = name_builder(f"api_{group}", ext_override=ext)
         out_file.parent.mkdir(parents=True, exist_ok=True)
-        with out_file.open("w", encoding="utf-8") as f:
+        with BundleFile(out_file) as f:
             for path in files:
                 if cancel_check and cancel_check():
                     raise BackupCancelled()
                 stats.files_included += 1
-                rel = path.relative_to(api_root)
-                header = _format_header(rel, output_config)
+                rel = path[cut:]
                 body = _wrap_body(
                     read_text_with_limit(path, profile.max_file_kb, warn=warn, cancel_check=cancel_check),
                     rel,
                     output_config,
                 )
-                if output_config.format == OutputFormat.HTML:
+                if html_mode:
                     f.write(f"<section><h3>{rel}</h3>{body}</section>\n")
                 else:
-                    f.write(header)
-                    f.write(body)
-                    f.write("\n")
+                    f.write(f"{render_header(rel)}{body}\n")
         stats.files_written += 1
 
     return stats
@@ -1,9 +1,15 @@
 from __future__ import annotations
 
 import html
+import os
+import re
+import threading
+from collections import deque
+from contextlib import ExitStack
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Iterable, List, Optional, Tuple
+from typing import AbstractSet, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, TypeVar, Union
 
 from ..errors import BackupCancelled
 from ..config import (
@@ -11,10 +17,73 @@ from ..config import (
     OutputConfig,
     OutputFormat,
     SeparatorStyle,
-    get_separator_format,
+    separator_renderer,
     extension_for_format,
 )
-from ..scanning import ScanConfig, iter_files
+from ..scanning import FileIndex, path_suffix, root_prefix_len, scan_file_strs, walk_includes
+
+
+_T = TypeVar("_T")
+
+
+# Bundle outputs are written once per included file; a large buffer lets the
+# OS see few big writes instead of one per file.
+BUNDLE_WRITE_BUFFER = 1 << 20
+
+
+class BundleFile:
+    """
+    Bundle output opened in binary mode: each chunk is encoded to UTF-8 once and
+    handed to the buffered writer, skipping the TextIOWrapper layer.
+    """
+
+    # Text mode wrote os.linesep for "\n"; keep that so outputs are unchanged on Windows.
+    _NEWLINE = os.linesep
+
+    def __init__(self, path: Path) -> None:
+        self._raw = path.open("wb", buffering=BUNDLE_WRITE_BUFFER)
+
+    def write(self, text: str) -> None:
+        if self._NEWLINE != "\n":
+            text = text.replace("\n", self._NEWLINE)
+        self._raw.write(text.encode("utf-8"))
+
+    def close(self) -> None:
+        self._raw.close()
+
+    def __enter__(self) -> "BundleFile":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# Reads are latency-bound, so oversubscribe the CPUs; the pool is shared by all
+# bundle writers (which may themselves run in parallel) to keep the thread count bounded.
+_READ_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+_read_pool: Optional[ThreadPoolExecutor] = None
+_read_pool_lock = threading.Lock()
+
+
+def _get_read_pool() -> ThreadPoolExecutor:
+    global _read_pool
+    with _read_pool_lock:
+        if _read_pool is None:
+            _read_pool = ThreadPoolExecutor(max_workers=_READ_WORKERS, thread_name_prefix="bundle-read")
+        return _read_pool
+
+
+# Characters html.escape(quote=True) rewrites.
+_HTML_SPECIAL = re.compile(r"[&<>\"']")
+
+
+def escape_html(text: str) -> str:
+    """html.escape, skipped when a single regex scan finds nothing to escape."""
+    return html.escape(text) if _HTML_SPECIAL.search(text) else text
+
+
+# Appended to text cut off at max_kb.
+TRUNCATION_NOTE = "\n\n# [TRUNCATED DUE TO SIZE]\n"
 
 
 @dataclass
@@ -24,7 +93,7 @@ class CodeBundleStats:
 
 
 def read_text_with_limit(
-    path: Path,
+    path: Union[str, Path],
     max_kb: int,
     warn: Optional[Callable[[str], None]] = None,
     cancel_check: Optional[Callable[[], bool]] = None,
@@ -36,16 +105,18 @@ def read_text_with_limit(
     """
     if cancel_check and cancel_check():
         raise BackupCancelled()
-    max_bytes = max_kb * 1024
+    max_bytes = max(max_kb, 0) * 1024
     try:
-        data = path.read_bytes()
-        truncated = False
-        if len(data) > max_bytes:
+        # Read at most one byte past the limit: enough to detect truncation
+        # without loading the rest of a large file.
+        with open(path, "rb") as fh:
+            data = fh.read(max_bytes + 1)
+        truncated = len(data) > max_bytes
+        if truncated:
             data = data[:max_bytes]
-            truncated = True
         text = data.decode("utf-8", errors="replace")
         if truncated:
-            text += "\n\n# [TRUNCATED DUE TO SIZE]\n"
+            text += TRUNCATION_NOTE
         return text
     except BackupCancelled:
         raise
@@ -57,87 +128,177 @@ def read_text_with_limit(
 
 def _add_line_numbers(text: str) -> str:
     lines = text.split("\n")
-    width = len(str(len(lines) or 1))
-    return "\n".join(f"{i:>{width}} | {line}" for i, line in enumerate(lines, 1))
+    # Build the padded format once instead of re-parsing a nested f-string spec per line.
+    fmt = "%%%dd | %%s" % len(str(len(lines) or 1))
+    return "\n".join([fmt % numbered for numbered in enumerate(lines, 1)])
 
 
-def _collect_files(root: Path, exts: Iterable[str]) -> List[Path]:
-    scan_config = ScanConfig(root=root, allowed_extensions=set(exts))
-    return sorted(iter_files(scan_config))
+def _collect_files(root: Path, exts: AbstractSet[str], index: Optional[FileIndex] = None) -> List[str]:
+    # exts is the profile's frozenset, shared by every area rather than rebuilt per call.
+    # Path strings, already in Path order; the writers slice relative names off them.
+    return list(scan_file_strs(root, exts, index))
 
 
-def _format_header(rel: Path, output_config: OutputConfig) -> str:
+def _header_renderer(output_config: OutputConfig) -> Callable[[object], str]:
+    # Resolved once per bundle; the returned callable runs per file.
     style = output_config.separator_style
     if output_config.format == OutputFormat.MD and style == SeparatorStyle.EQUALS:
         style = SeparatorStyle.MARKDOWN
-    fmt = get_separator_format(style, output_config.custom_separator)
-    return fmt.format(path=rel)
+    return separator_renderer(style, output_config.custom_separator)
 
 
-def _wrap_body(content: str, rel: Path, output_config: OutputConfig) -> str:
+def _wrap_body(content: str, rel: str, output_config: OutputConfig) -> str:
     if output_config.include_line_numbers:
         content = _add_line_numbers(content)
 
     if output_config.format == OutputFormat.MD or output_config.wrap_in_code_block:
-        lang = rel.suffix.lower().lstrip(".")
+        lang = path_suffix(os.path.basename(rel)).lower().lstrip(".")
         return f"```{lang}\n{content}\n```\n"
     if output_config.format == OutputFormat.HTML:
-        return f"<pre>{html.escape(content)}</pre>\n"
+        return f"<pre>{escape_html(content)}</pre>\n"
     return content
 
 
+def read_files_in_order(
+    files: Iterable[str],
+    max_kb: int,
+    warn: Optional[Callable[[str], None]],
+    cancel_check: Optional[Callable[[], bool]],
+    parallel: bool,
+    reader: Callable[..., _T] = read_text_with_limit,
+) -> Iterator[Tuple[str, _T]]:
+    """
+    Yield (path, reader(path, max_kb, warn, cancel_check)) in input order;
+    with parallel, read ahead on the shared pool.
+    """
+    if not parallel:
+        for path in files:
+            if cancel_check and cancel_check():
+                raise BackupCancelled()
+            yield path, reader(path, max_kb, warn, cancel_check)
+        return
+
+    pool = _get_read_pool()
+    # A bounded read-ahead window keeps memory at ~window * max_kb, not the whole bundle.
+    window = _READ_WORKERS * 2
+    pending: Deque[Tuple[str, Future]] = deque()
+    try:
+        for path in files:
+            if cancel_check and cancel_check():
+                raise BackupCancelled()
+            pending.append((path, pool.submit(reader, path, max_kb, warn, cancel_check)))
+            if len(pending) >= window:
+                done_path, future = pending.popleft()
+                yield done_path, future.result()
+        while pending:
+            done_path, future = pending.popleft()
+            yield done_path, future.result()
+    finally:
+        for _, future in pending:
+            future.cancel()
+
+
 def _write_markdown_bundle(
-    files: Iterable[Path],
+    files: Iterable[str],
     root: Path,
     output_file: Path,
     max_kb: int,
     warn: Optional[Callable[[str], None]] = None,
     cancel_check: Optional[Callable[[], bool]] = None,
+    parallel: bool = False,
 ) -> Tuple[int, int]:
     output_file.parent.mkdir(parents=True, exist_ok=True)
     included = 0
-    with output_file.open("w", encoding="utf-8") as f:
-        for path in files:
-            if cancel_check and cancel_check():
-                raise BackupCancelled()
+    cut = root_prefix_len(root)
+    with BundleFile(output_file) as f:
+        for path, content in read_files_in_order(files, max_kb, warn, cancel_check, parallel):
             included += 1
-            rel = path.relative_to(root)
-            f.write(f"## {rel}\n\n```ts\n")
-            f.write(read_text_with_limit(path, max_kb, warn=warn, cancel_check=cancel_check))
-            f.write("\n```\n\n")
+            rel = path[cut:]
+            f.write(f"## {rel}\n\n```ts\n{content}\n```\n\n")
     return 1, included
 
 
 def _write_text_bundle(
-    files: Iterable[Path],
+    files: Iterable[str],
     root: Path,
     output_file: Path,
     max_kb: int,
     output_config: OutputConfig,
     warn: Optional[Callable[[str], None]] = None,
     cancel_check: Optional[Callable[[], bool]] = None,
+    parallel: bool = False,
 ) -> Tuple[int, int]:
     output_file.parent.mkdir(parents=True, exist_ok=True)
     included = 0
-    with output_file.open("w", encoding="utf-8") as f:
-        for path in files:
-            if cancel_check and cancel_check():
-                raise BackupCancelled()
+    html_mode = output_config.format == OutputFormat.HTML
+    render_header = _header_renderer(output_config)
+    cut = root_prefix_len(root)
+    with BundleFile(output_file) as f:
+        for path, content in read_files_in_order(files, max_kb, warn, cancel_check, parallel):
             included += 1
-            rel = path.relative_to(root)
-            header = _format_header(rel, output_config)
-            content = read_text_with_limit(path, max_kb, warn=warn, cancel_check=cancel_check)
+            rel = path[cut:]
             body = _wrap_body(content, rel, output_config)
 
-            if output_config.format == OutputFormat.HTML:
+            if html_mode:
                 f.write(f"<section><h3>{rel}</h3>{body}</section>\n")
             else:
-                f.write(header)
-                f.write(body)
-                f.write("\n")
+                f.write(f"{render_header(rel)}{body}\n")
     return 1, included
 
 
+def _write_text_bundle_with_areas(
+    files: Iterable[str],
+    root: Path,
+    output_file: Path,
+    areas: Sequence[Tuple[Path, Path]],
+    max_kb: int,
+    output_config: OutputConfig,
+    warn: Optional[Callable[[str], None]] = None,
+    cancel_check: Optional[Callable[[], bool]] = None,
+    parallel: bool = False,
+) -> Tuple[int, int]:
+    """
+    Write the bundle for root and, in the same pass, one bundle per
+    (area root, output file) holding the files under that area. Each file is
+    read and wrapped once; only the header differs between the outputs.
+    An area's output is created only if it receives a file.
+    """
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    html_mode = output_config.format == OutputFormat.HTML
+    render_header = _header_renderer(output_config)
+    cut = root_prefix_len(root)
+    prefixes = [(os.path.join(os.fspath(area_root), ""), area_file) for area_root, area_file in areas]
+    area_outputs: Dict[Path, BundleFile] = {}
+    written = included = 0
+
+    def emit(f: BundleFile, rel: str, body: str) -> None:
+        if html_mode:
+            f.write(f"<section><h3>{rel}</h3>{body}</section>\n")
+        else:
+            f.write(f"{render_header(rel)}{body}\n")
+
+    with ExitStack() as stack:
+        f = stack.enter_context(BundleFile(output_file))
+        written += 1
+        for path, content in read_files_in_order(files, max_kb, warn, cancel_check, parallel):
+            rel = path[cut:]
+            # _wrap_body only looks at the suffix, which every rel of this file shares.
+            body = _wrap_body(content, rel, output_config)
+            emit(f, rel, body)
+            included += 1
+            for prefix, area_file in prefixes:
+                if path.startswith(prefix):
+                    area_out = area_outputs.get(area_file)
+                    if area_out is None:
+                        area_file.parent.mkdir(parents=True, exist_ok=True)
+                        area_out = area_outputs[area_file] = stack.enter_context(BundleFile(area_file))
+                        written += 1
+                    emit(area_out, path[len(prefix):], body)
+                    included += 1
+                    break
+    return written, included
+
+
 def generate_ts_bundles(
     project_root: Path,
     backup_dir: Path,
@@ -146,6 +307,7 @@ def generate_ts_bundles(
     name_builder: Callable[[str, Optional[str]], Path],
     warn: Optional[Callable[[str], None]] = None,
     cancel_check: Optional[Callable[[], bool]] = None,
+    index: Optional[FileIndex] = None,
 ) -> CodeBundleStats:
     stats = CodeBundleStats()
     _ = backup_dir
@@ -163,7 +325,7 @@ def generate_ts_bundles(
         root = project_root / rel
         if not root.is_dir():
             continue
-        files = _collect_files(root, ts_exts)
+        files = _collect_files(root, ts_exts, index)
         if not files:
             continue
         fw, inc = _write_markdown_bundle(
@@ -173,6 +335,7 @@ def generate_ts_bundles(
             max_kb=profile.max_file_kb,
             warn=warn,
             cancel_check=cancel_check,
+            parallel=profile.parallel_io,
         )
         stats.files_written += fw
         stats.files_included += inc
@@ -188,10 +351,11 @@ def generate_full_ts_bundle(
     name_builder: Callable[[str, Optional[str]], Path],
     warn: Optional[Callable[[str], None]] = None,
     cancel_check: Optional[Callable[[], bool]] = None,
+    index: Optional[FileIndex] = None,
 ) -> CodeBundleStats:
     stats = CodeBundleStats()
     _ = backup_dir
-    files = _collect_files(project_root, profile.allowed_ts_extensions)
+    files = _collect_files(project_root, profile.allowed_ts_extensions, index)
     if files:
         ext_md = extension_for_format(OutputFormat.MD)
         fw, inc = _write_markdown_bundle(
@@ -201,6 +365,7 @@ def generate_full_ts_bundle(
             max_kb=profile.max_file_kb,
             warn=warn,
             cancel_check=cancel_check,
+            parallel=profile.parallel_io,
         )
         stats.files_written += fw
         stats.files_included += inc
@@ -216,6 +381,7 @@ def generate_full_text_bundles(
     name_builder: Callable[[str, Optional[str]], Path],
     warn: Optional[Callable[[str], None]] = None,
     cancel_check: Optional[Callable[[], bool]] = None,
+    index: Optional[FileIndex] = None,
 ) -> CodeBundleStats:
     stats = CodeBundleStats()
     _ = backup_dir
@@ -229,11 +395,17 @@ def generate_full_text_bundles(
         "libs": "libs_code",
     }
 
+    # Areas whose files are exactly the project walk's files under them are
+    # written alongside the full bundle, so each file is read once.
+    shared_areas: List[Tuple[Path, Path]] = []
     for rel, filename in area_to_name.items():
         root = project_root / rel
         if not root.is_dir():
             continue
-        files = _collect_files(root, full_exts)
+        if walk_includes(project_root, root):
+            shared_areas.append((root, name_builder(filename, ext_override=ext)))
+            continue
+        files = _collect_files(root, full_exts, index)
         if not files:
             continue
         fw, inc = _write_text_bundle(
@@ -244,21 +416,24 @@ def generate_full_text_bundles(
             output_config=output_config,
             warn=warn,
             cancel_check=cancel_check,
+            parallel=profile.parallel_io,
         )
         stats.files_written += fw
         stats.files_included += inc
 
-    # Full project text bundle
-    files = _collect_files(project_root, full_exts)
+    # Full project text bundle, plus the shared area bundles
+    files = _collect_files(project_root, full_exts, index)
     if files:
-        fw, inc = _write_text_bundle(
+        fw, inc = _write_text_bundle_with_areas(
             files,
             root=project_root,
             output_file=name_builder("all_code", ext_override=ext),
+            areas=shared_areas,
             max_kb=profile.max_file_kb,
             output_config=output_config,
             warn=warn,
             cancel_check=cancel_check,
+            parallel=profile.parallel_io,
         )
         stats.files_written += fw
         stats.files_included += inc
@@ -1,21 +1,21 @@
 from __future__ import annotations
 
-import html
+import os
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, List, Optional
+from typing import Callable, List, Optional, Set, Tuple
 
-from ..scanning import ScanConfig, iter_files
+from ..scanning import FileIndex, path_suffix, root_prefix_len, scan_file_strs
 from ..config import (
     BackupProfileConfig,
     OutputConfig,
     OutputFormat,
     SeparatorStyle,
-    get_separator_format,
+    separator_renderer,
     extension_for_format,
 )
 from ..errors import BackupCancelled
-from .code_bundles import read_text_with_limit
+from .code_bundles import BundleFile, escape_html, read_text_with_limit
 
 
 CONFIG_FILENAMES = {
@@ -55,28 +55,44 @@ class ConfigBundleStats:
     tsconfig_written: int = 0
 
 
-def _collect_configs(project_root: Path) -> List[Path]:
-    scan = ScanConfig(root=project_root, allowed_extensions=None)
-    result: List[Path] = []
-    for path in iter_files(scan):
-        if path.name in CONFIG_FILENAMES and not path.name.startswith("tsconfig"):
+def _collect_configs(project_root: Path, index: Optional[FileIndex] = None) -> Tuple[List[str], List[str]]:
+    """
+    Config files anywhere under project_root, plus the TS_CONFIG_FILES that
+    exist, found in the same pass instead of a stat per candidate.
+    """
+    candidates = {os.fspath(project_root / rel): rel for rel in TS_CONFIG_FILES}
+    result: List[str] = []
+    seen: Set[str] = set()
+    for path in scan_file_strs(project_root, None, index):
+        if path in candidates:
+            seen.add(path)
+            continue
+        name = os.path.basename(path)
+        if name in CONFIG_FILENAMES and not name.startswith("tsconfig"):
             result.append(path)
-    return sorted(result)
+    ts_configs: List[str] = []
+    for path, rel in candidates.items():
+        # A top-level candidate the walk did not yield is not a file; nested ones
+        # may sit under a symlinked directory the walk skips, so stat those.
+        if path in seen or ("/" in rel and os.path.isfile(path)):
+            ts_configs.append(rel)
+    return result, ts_configs
 
 
-def _format_header(rel: Path, output_config: OutputConfig) -> str:
+def _header_renderer(output_config: OutputConfig) -> Callable[[object], str]:
+    # Resolved once per bundle; the returned callable runs per file.
     style = output_config.separator_style
     if output_config.format == OutputFormat.MD and style == SeparatorStyle.EQUALS:
         style = SeparatorStyle.MARKDOWN
-    return get_separator_format(style, output_config.custom_separator).format(path=rel)
+    return separator_renderer(style, output_config.custom_separator)
 
 
-def _wrap_body(content: str, rel: Path, output_config: OutputConfig) -> str:
+def _wrap_body(content: str, rel: str, output_config: OutputConfig) -> str:
     if output_config.format == OutputFormat.MD:
-        lang = rel.suffix.lower().lstrip(".")
+        lang = path_suffix(os.path.basename(rel)).lower().lstrip(".")
         return f"```{lang}\n{content}\n```\n"
     if output_config.format == OutputFormat.HTML:
-        return f"<pre>{html.escape(content)}</pre>\n"
+        return f"<pre>{escape_html(content)}</pre>\n"
     return content
 
 
@@ -88,58 +104,54 @@ def generate_config_bundles(
     name_builder: Callable[[str, Optional[str]], Path],
     warn: Optional[Callable[[str], None]] = None,
     cancel_check: Optional[Callable[[], bool]] = None,
+    index: Optional[FileIndex] = None,
 ) -> ConfigBundleStats:
     stats = ConfigBundleStats()
     _ = backup_dir
 
     ext = extension_for_format(output_config.format)
+    html_mode = output_config.format == OutputFormat.HTML
+    render_header = _header_renderer(output_config)
+    cut = root_prefix_len(project_root)
 
-    configs = _collect_configs(project_root)
+    configs, ts_configs = _collect_configs(project_root, index)
     out_file = name_builder("configs", ext_override=ext)
     out_file.parent.mkdir(parents=True, exist_ok=True)
-    with out_file.open("w", encoding="utf-8") as f:
+    with BundleFile(out_file) as f:
         for path in configs:
             if cancel_check and cancel_check():
                 raise BackupCancelled()
             stats.files_included += 1
-            rel = path.relative_to(project_root)
-            header = _format_header(rel, output_config)
+            rel = path[cut:]
             body = _wrap_body(
                 read_text_with_limit(path, profile.max_file_kb, warn=warn, cancel_check=cancel_check),
                 rel,
                 output_config,
             )
-            if output_config.format == OutputFormat.HTML:
+            if html_mode:
                 f.write(f"<section><h3>{rel}</h3>{body}</section>\n")
             else:
-                f.write(header)
-                f.write(body)
-                f.write("\n")
+                f.write(f"{render_header(rel)}{body}\n")
     stats.files_written += 1
     stats.configs_written += 1
 
     ts_out = name_builder("tsconfigs", ext_override=ext)
     ts_out.parent.mkdir(parents=True, exist_ok=True)
-    with ts_out.open("w", encoding="utf-8") as f:
-        for rel in TS_CONFIG_FILES:
+    with BundleFile(ts_out) as f:
+        for rel in ts_configs:
             path = project_root / rel
-            if not path.is_file():
-                continue
             if cancel_check and cancel_check():
                 raise BackupCancelled()
             stats.files_included += 1
-            header = _format_header(Path(rel), output_config)
             body = _wrap_body(
                 read_text_with_limit(path, profile.max_file_kb, warn=warn, cancel_check=cancel_check),
-                Path(rel),
+                rel,
                 output_config,
             )
-            if output_config.format == OutputFormat.HTML:
+            if html_mode:
                 f.write(f"<section><h3>{rel}</h3>{body}</section>\n")
             else:
-                f.write(header)
-                f.write(body)
-                f.write("\n")
+                f.write(f"{render_header(Path(rel))}{body}\n")
     stats.files_written += 1
     stats.tsconfig_written += 1
 
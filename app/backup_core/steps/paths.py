@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 import html
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, List, Optional
 
-from ..scanning import ScanConfig, iter_files
+from ..scanning import FileIndex, scan_file_strs
 from ..config import OutputConfig, OutputFormat, extension_for_format
 from ..errors import BackupCancelled
 
 
+TS_EXTS = frozenset({".ts", ".tsx"})
+
+
 @dataclass
 class PathsStats:
     files_written: int = 0
@@ -45,34 +49,34 @@ def generate_paths_files(
     output_config: OutputConfig,
     name_builder: Callable[[str, Optional[str]], Path],
     cancel_check: Optional[Callable[[], bool]] = None,
+    index: Optional[FileIndex] = None,
 ) -> PathsStats:
     stats = PathsStats()
     _ = backup_dir
 
     ext = extension_for_format(output_config.format)
 
-    scan_all = ScanConfig(root=project_root, allowed_extensions=None)
-    all_paths: List[Path] = list(iter_files(scan_all))
-    all_paths.sort()
+    # The scan yields path strings in Path order; no Path objects are needed for the listings.
+    path_strs: List[str] = list(scan_file_strs(project_root, None, index))
+    # The TS subset of a sorted list is already sorted.
+    ts_strs = [p for p in path_strs if os.path.splitext(p)[1] in TS_EXTS]
 
     # paths: one path per line
     if cancel_check and cancel_check():
         raise BackupCancelled()
-    path_lines = "\n".join(str(p) for p in all_paths)
+    path_lines = "\n".join(path_strs)
     test_path_file = name_builder("paths", ext_override=ext)
     _write_content(test_path_file, path_lines, output_config, heading="All paths")
     stats.files_written += 1
-    stats.paths_total = len(all_paths)
+    stats.paths_total = len(path_strs)
 
     # paths_ts: TS/TSX, single line, separated by /|\
-    ts_paths = [p for p in all_paths if p.suffix in {".ts", ".tsx"}]
-    ts_paths.sort()
     if cancel_check and cancel_check():
         raise BackupCancelled()
-    joined = "/|\\".join(str(p) for p in ts_paths)
+    joined = "/|\\".join(ts_strs)
     ts_path_file = name_builder("paths_ts", ext_override=ext)
     _write_content(ts_path_file, joined, output_config, heading="TypeScript-only paths")
     stats.files_written += 1
-    stats.ts_paths_total = len(ts_paths)
+    stats.ts_paths_total = len(ts_strs)
 
     return stats
@@ -1,13 +1,22 @@
 from __future__ import annotations
 
+import mmap
+import os
+import re
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Callable, Dict, Iterable, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Pattern, Tuple
 
 from ..config import SearchSetConfig
-from ..errors import BackupCancelled
 from ..scanning import ScanConfig, iter_files
-from .code_bundles import read_text_with_limit
+from ..errors import BackupCancelled
+from .code_bundles import TRUNCATION_NOTE, read_files_in_order, read_text_with_limit
+
+try:  # pyahocorasick is optional; without it keywords are matched with one regex alternation.
+    import ahocorasick
+except ImportError:  # pragma: no cover - depends on environment
+    ahocorasick = None
 
 
 @dataclass
@@ -16,6 +25,77 @@ class SearchStats:
     matches: int = 0
 
 
+@lru_cache(maxsize=64)
+def _keyword_matcher(keywords_lower: Tuple[str, ...]) -> Callable[[str], bool]:
+    """
+    Build once per keyword set a case-insensitive test for "text contains any
+    keyword" that scans the text a single time instead of once per keyword.
+    """
+    if not keywords_lower:
+        return lambda text: False
+    if "" in keywords_lower:
+        return lambda text: True
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for keyword in keywords_lower:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return lambda text: next(automaton.iter(text.lower()), None) is not None
+    # IGNORECASE on the original text avoids a lowercased copy of every file.
+    pattern = re.compile("|".join(map(re.escape, keywords_lower)), re.IGNORECASE)
+    return lambda text: pattern.search(text) is not None
+
+
+@lru_cache(maxsize=64)
+def _bytes_pattern(keywords_lower: Tuple[str, ...]) -> Optional[Pattern[bytes]]:
+    """
+    Case-insensitive bytes pattern for matching raw UTF-8 file contents, or
+    None when the keywords need the decoded text (non-ASCII or empty ones).
+    """
+    if not keywords_lower or not all(k and k.isascii() for k in keywords_lower):
+        return None
+    # Not fully equivalent to the str matcher: on str, re.IGNORECASE also folds
+    # a few non-ASCII letters onto ASCII ones (KELVIN SIGN U+212A matches "k",
+    # LONG S U+017F matches "s", U+0130/U+0131 match "i"), while the ASCII bytes
+    # pattern only folds A-Z/a-z. Files that spell a keyword with those letters
+    # are not reported on this path; every ASCII spelling still is.
+    return re.compile(b"|".join(re.escape(k.encode("ascii")) for k in keywords_lower), re.IGNORECASE)
+
+
+def _mapped_reader(pattern: Pattern[bytes], note_hits: bool) -> Callable[..., Optional[str]]:
+    """
+    Reader for read_files_in_order that searches the first max_kb of a file
+    through mmap and only decodes files that match; others yield None.
+    """
+
+    def read(
+        path: str,
+        max_kb: int,
+        warn: Optional[Callable[[str], None]],
+        cancel_check: Optional[Callable[[], bool]],
+    ) -> Optional[str]:
+        if cancel_check and cancel_check():
+            raise BackupCancelled()
+        max_bytes = max(max_kb, 0) * 1024
+        try:
+            with open(path, "rb") as fh:
+                size = os.fstat(fh.fileno()).st_size
+                hit = False
+                if size and max_bytes:
+                    with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        hit = pattern.search(mm, 0, max_bytes) is not None
+        except (OSError, ValueError):
+            # Unreadable or unmappable: the text reader reports it and its placeholder is searched.
+            hit = True
+            size = 0
+        # The text reader appends TRUNCATION_NOTE, which the text search could match.
+        if hit or (note_hits and size > max_bytes):
+            return read_text_with_limit(path, max_kb, warn=warn, cancel_check=cancel_check)
+        return None
+
+    return read
+
+
 def _search_files(
     root: Path,
     search_set: SearchSetConfig,
@@ -23,20 +103,24 @@ def _search_files(
     output_dir: Path,
     warn: Optional[Callable[[str], None]] = None,
     cancel_check: Optional[Callable[[], bool]] = None,
+    parallel: bool = False,
 ) -> SearchStats:
     stats = SearchStats()
-    scan = ScanConfig(root=root, allowed_extensions=set(search_set.extensions))
-    keywords_lower = [k.lower() for k in search_set.keywords]
+    scan = ScanConfig(root=root, allowed_extensions=search_set.extensions)
+    keywords_lower = tuple(k.lower() for k in search_set.keywords)
+    has_keyword = _keyword_matcher(keywords_lower)
+    pattern = _bytes_pattern(keywords_lower)
+    # With a bytes pattern, non-matching files are never decoded; the text check
+    # below then only confirms the (few) decoded ones.
+    reader = read_text_with_limit if pattern is None else _mapped_reader(pattern, has_keyword(TRUNCATION_NOTE))
     matches: List[str] = []
     output_dir.mkdir(parents=True, exist_ok=True)
     out_file = output_dir / f"Search_{search_set.id}.md"
     with out_file.open("w", encoding="utf-8") as f:
-        for path in iter_files(scan):
-            if cancel_check and cancel_check():
-                raise BackupCancelled()
-            text = read_text_with_limit(path, max_kb, warn=warn, cancel_check=cancel_check)
-            lower = text.lower()
-            if any(k in lower for k in keywords_lower):
+        # Reads run ahead on the shared bundle read pool; matches are tested and
+        # written here, in walk order.
+        for path, text in read_files_in_order(iter_files(scan), max_kb, warn, cancel_check, parallel, reader):
+            if text is not None and has_keyword(text):
                 rel = path.relative_to(root)
                 f.write(f"## {rel}\n\n")
                 f.write("```text\n")
@@ -55,6 +139,7 @@ def run_search_sets(
     output_dir: Path,
     warn: Optional[Callable[[str], None]] = None,
     cancel_check: Optional[Callable[[], bool]] = None,
+    parallel: bool = False,
 ) -> Dict[str, SearchStats]:
     results: Dict[str, SearchStats] = {}
     for sset in search_sets:
@@ -65,6 +150,7 @@ def run_search_sets(
             output_dir=output_dir,
             warn=warn,
             cancel_check=cancel_check,
+            parallel=parallel,
         )
         results[sset.id] = stats
     return results
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import html
+import os
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Callable, List, Optional
@@ -8,7 +9,10 @@ from typing import Callable, List, Optional
 from ..errors import BackupCancelled
 from ..config import OutputConfig, OutputFormat, extension_for_format
 
-from ..scanning import ScanConfig, iter_files
+from ..scanning import ScanConfig, iter_file_strs, root_prefix_len
+
+
+TS_EXTS = frozenset({".ts", ".tsx"})
 
 
 @dataclass
@@ -19,15 +23,21 @@ class TreeStats:
 def _write_tree_content(path: Path, lines: List[str], output_config: OutputConfig) -> None:
     body = "\n".join(lines)
     fmt = output_config.format
-    if fmt == OutputFormat.MD:
-        body = f"```text\n{body}\n```\n"
-    elif fmt == OutputFormat.HTML:
-        body = f"<pre>{html.escape(body)}</pre>\n"
-    else:
-        body += "\n"
-
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(body, encoding="utf-8")
+    # The wrapper is written around the joined body rather than concatenated
+    # onto it, so the (possibly large) tree text is not copied again.
+    with path.open("w", encoding="utf-8") as f:
+        if fmt == OutputFormat.MD:
+            f.write("```text\n")
+            f.write(body)
+            f.write("\n```\n")
+        elif fmt == OutputFormat.HTML:
+            f.write("<pre>")
+            f.write(html.escape(body))
+            f.write("</pre>\n")
+        else:
+            f.write(body)
+            f.write("\n")
 
 
 def _write_tree(
@@ -40,28 +50,35 @@ def _write_tree(
 ) -> int:
     scan_config = ScanConfig(
         root=root,
-        allowed_extensions={".ts", ".tsx"} if ts_only else None,
+        allowed_extensions=TS_EXTS if ts_only else None,
     )
+    cut = root_prefix_len(root)
     rel_paths: List[str] = []
-    for path in iter_files(scan_config):
+    for path in iter_file_strs(scan_config):
         if cancel_check and cancel_check():
             raise BackupCancelled()
-        rel_paths.append(str(path.relative_to(root)))
+        rel_paths.append(path[cut:])
+
+    if os.sep != "/":
+        # The tree is split on "/", so native separators are normalized first.
+        rel_paths = [rel.replace(os.sep, "/") for rel in rel_paths]
 
     rel_paths.sort()
 
     lines: List[str] = []
+    indents: List[str] = [""]
     last_parts: List[str] = []
 
     for rel in rel_paths:
         parts = rel.split("/")
         # Find common prefix with previous path to reduce repetition
-        common = 0
-        while common < len(parts) and common < len(last_parts) and parts[common] == last_parts[common]:
-            common += 1
-        for depth in range(common, len(parts)):
-            indent = "  " * depth
-            lines.append(f"{indent}{parts[depth]}")
+        common = next(
+            (i for i, (a, b) in enumerate(zip(parts, last_parts)) if a != b),
+            min(len(parts), len(last_parts)),
+        )
+        while len(indents) < len(parts):
+            indents.append(indents[-1] + "  ")
+        lines.extend(map(str.__add__, indents[common:len(parts)], parts[common:]))
         last_parts = parts
 
     ext = extension_for_format(output_config.format)
@@ -2,35 +2,233 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from time import perf_counter
+from typing import List, Optional, Tuple
+import queue
+import tarfile
+import threading
 import zipfile
 import os
 
-import shutil
+from ..config import ADAPTIVE_COMPRESSION, DEFAULT_COMPRESSION_LEVEL, ArchiveFormat, CompressionLevel
+from ..errors import BackupConfigError
+from ..scanning import iter_tree_entries, path_suffix, root_prefix_len
+
+try:  # zstandard is optional; only needed for ArchiveFormat.TAR_ZSTD.
+    import zstandard
+except ImportError:  # pragma: no cover - depends on environment
+    zstandard = None
+
+
+# Deflate levels (0-9) mapped onto zstd's scale: 1-5 is the real-time tier,
+# the upper deflate levels map to zstd's slower archival levels.
+_ZSTD_LEVELS = (1, 1, 2, 3, 3, 4, 5, 9, 12, 19)
+
+
+# zstd level used when "adaptive" is requested for tar_zstd: a zstd frame keeps
+# one level for the whole stream, so it cannot be retuned mid-archive.
+_ZSTD_ADAPTIVE_LEVEL = 3
+
+
+# Formats that are already compressed; deflating them again costs CPU for ~0% gain.
+_INCOMPRESSIBLE_EXTENSIONS = frozenset({
+    ".7z", ".avif", ".br", ".bz2", ".docx", ".gif", ".gz", ".heic", ".jar", ".jpeg", ".jpg",
+    ".m4a", ".mkv", ".mov", ".mp3", ".mp4", ".ogg", ".pdf", ".png", ".pptx", ".rar", ".tgz",
+    ".webm", ".webp", ".whl", ".woff", ".woff2", ".xlsx", ".xz", ".zip", ".zst",
+})
+
+# Share of payload bytes in incompressible files above which the ZIP is written with ZIP_STORED.
+_STORE_RATIO = 0.8
+
+# (source path, archive name, size in bytes), as strings for zipfile.
+_Entry = Tuple[str, str, int]
 
 
 @dataclass
 class ZipStats:
     zip_path: Optional[Path] = None
+    stored: bool = False
 
 
-def create_zip(backup_dir: Path, output_dir: Path, compression_level: int = 6) -> ZipStats:
-    output_dir.mkdir(parents=True, exist_ok=True)
-    archive_name = f"{backup_dir.name}.zip"
-    archive_path = output_dir / archive_name
-    
+class _ThreadedSink:
+    """
+    Write-only file object that hands chunks to a background writer thread.
+
+    It records how long the producer blocked on a full queue (output is the
+    bottleneck) and how long the writer sat idle (compression is the
+    bottleneck); the adaptive level controller reads both.
+    """
+
+    def __init__(self, raw, max_chunks: int = 16) -> None:
+        self._raw = raw
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(max_chunks)
+        self._blocked = 0.0
+        self._idle = 0.0
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="zip-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, data) -> int:
+        if self._error is not None:
+            raise self._error
+        start = perf_counter()
+        self._queue.put(bytes(data))
+        self._blocked += perf_counter() - start
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def take_counters(self) -> Tuple[float, float]:
+        blocked, idle = self._blocked, self._idle
+        self._blocked = self._idle = 0.0
+        return blocked, idle
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+
+    def _run(self) -> None:
+        while True:
+            start = perf_counter()
+            chunk = self._queue.get()
+            self._idle += perf_counter() - start
+            if chunk is None:
+                return
+            if self._error is None:
+                try:
+                    self._raw.write(chunk)
+                except BaseException as exc:  # noqa: BLE001 - re-raised on the producer side
+                    self._error = exc  # keep draining so the producer never blocks forever
+
+
+class _AdaptiveLevel:
+    """Deflate level controller driven by an EWMA of writer back-pressure."""
+
+    def __init__(
+        self,
+        min_level: int = 1,
+        max_level: int = 9,
+        alpha: float = 0.3,
+        threshold: float = 0.15,
+    ) -> None:
+        self.level = min_level
+        self._min = min_level
+        self._max = max_level
+        self._alpha = alpha
+        self._threshold = threshold
+        self._pressure = 0.0
+
+    def update(self, blocked: float, idle: float, elapsed: float) -> int:
+        if elapsed > 0:
+            # > 0: producer waited on I/O, spare CPU can buy ratio; < 0: writer starved.
+            sample = (blocked - idle) / elapsed
+            self._pressure = self._alpha * sample + (1 - self._alpha) * self._pressure
+        if self._pressure > self._threshold and self.level < self._max:
+            self.level += 1
+        elif self._pressure < -self._threshold and self.level > self._min:
+            self.level -= 1
+        return self.level
+
+
+def check_archive_format(archive_format: ArchiveFormat) -> None:
+    """Raise BackupConfigError if archive_format cannot be produced here."""
+    if archive_format is ArchiveFormat.TAR_ZSTD and zstandard is None:
+        raise BackupConfigError("archive_format 'tar_zstd' requires the 'zstandard' package")
+
+
+def _collect_entries(backup_dir: Path) -> List[_Entry]:
+    # Archive names are relative to backup_dir's parent, i.e. start with its name.
+    prefix = os.path.join(backup_dir.name, "")
+    cut = root_prefix_len(backup_dir)
+    return [(e.path, prefix + e.path[cut:], e.stat().st_size) for e in iter_tree_entries(backup_dir)]
+
+
+def _mostly_incompressible(entries: List[_Entry]) -> bool:
+    total = incompressible = 0
+    for file_path, _, size in entries:
+        total += size
+        if path_suffix(os.path.basename(file_path)).lower() in _INCOMPRESSIBLE_EXTENSIONS:
+            incompressible += size
+    return total > 0 and incompressible > _STORE_RATIO * total
+
+
+def _write_zip(
+    entries: List[_Entry],
+    archive_path: Path,
+    compression: int,
+    compression_level: Optional[int],
+) -> None:
     # Use zipfile directly to support compression levels
     with zipfile.ZipFile(
-        archive_path, 
-        'w', 
-        compression=zipfile.ZIP_DEFLATED, 
+        archive_path,
+        'w',
+        compression=compression,
         compresslevel=compression_level
     ) as zf:
-        # Walk the directory and add files
-        for root, _, files in os.walk(backup_dir):
-            for file in files:
-                file_path = Path(root) / file
-                arcname = file_path.relative_to(backup_dir.parent)
-                zf.write(file_path, arcname)
-                
+        for file_path, arcname, _ in entries:
+            zf.write(file_path, arcname)
+
+
+def _write_zip_adaptive(entries: List[_Entry], archive_path: Path) -> None:
+    controller = _AdaptiveLevel()
+    with archive_path.open("wb") as raw:
+        sink = _ThreadedSink(raw)
+        try:
+            # The sink is not seekable, so zipfile streams entries with data descriptors.
+            with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+                for file_path, arcname, _ in entries:
+                    start = perf_counter()
+                    zf.write(file_path, arcname, compresslevel=controller.level)
+                    controller.update(*sink.take_counters(), perf_counter() - start)
+        finally:
+            sink.close()
+
+
+def _write_tar_zstd(backup_dir: Path, archive_path: Path, compression_level: CompressionLevel) -> None:
+    if compression_level == ADAPTIVE_COMPRESSION:
+        level = _ZSTD_ADAPTIVE_LEVEL
+    else:
+        level = _ZSTD_LEVELS[max(0, min(compression_level, len(_ZSTD_LEVELS) - 1))]
+    cctx = zstandard.ZstdCompressor(level=level, threads=-1)
+    with archive_path.open("wb") as raw, cctx.stream_writer(raw, closefd=False) as compressed:
+        # Streaming tar mode ("w|") never seeks, so it can sit on the compressor.
+        with tarfile.open(fileobj=compressed, mode="w|") as tar:
+            tar.add(backup_dir, arcname=backup_dir.name)
+
+
+def create_zip(
+    backup_dir: Path,
+    output_dir: Path,
+    compression_level: CompressionLevel = DEFAULT_COMPRESSION_LEVEL,
+    archive_format: ArchiveFormat = ArchiveFormat.ZIP_DEFLATE,
+    store_if_incompressible: bool = True,
+) -> ZipStats:
+    """
+    Archive backup_dir into output_dir.
+
+    compression_level is a deflate level (0-9) or "adaptive", which starts
+    at level 1 and moves the level per file based on writer back-pressure.
+    With store_if_incompressible, a ZIP whose payload is mostly already
+    compressed (images, archives, PDFs...) is written with ZIP_STORED.
+    """
+    check_archive_format(archive_format)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    if archive_format is ArchiveFormat.TAR_ZSTD:
+        archive_path = output_dir / f"{backup_dir.name}.tar.zst"
+        _write_tar_zstd(backup_dir, archive_path, compression_level)
+        return ZipStats(zip_path=archive_path)
+
+    archive_path = output_dir / f"{backup_dir.name}.zip"
+    entries = _collect_entries(backup_dir)
+    if store_if_incompressible and _mostly_incompressible(entries):
+        _write_zip(entries, archive_path, zipfile.ZIP_STORED, None)
+        return ZipStats(zip_path=archive_path, stored=True)
+    if compression_level == ADAPTIVE_COMPRESSION:
+        _write_zip_adaptive(entries, archive_path)
+    else:
+        _write_zip(entries, archive_path, zipfile.ZIP_DEFLATED, compression_level)
     return ZipStats(zip_path=archive_path)
@@ -1,23 +1,94 @@
 from __future__ import annotations
 
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from time import monotonic
+from typing import Dict, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 import logging
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 
 
 logger = logging.getLogger(__name__)
 
 
+# Network sources are probed concurrently on long-lived threads, each with its
+# own Session (Sessions are not thread-safe) so TCP/TLS connections are reused
+# across backups.
+# Only failed connects are retried (a read may already have reached the server),
+# so a probe's worst case is every connect attempt plus one read.
+_CONNECT_TIMEOUT = 1.5
+_READ_TIMEOUT = 3.0
+_NETWORK_TIMEOUT = (_CONNECT_TIMEOUT, _READ_TIMEOUT)
+_CONNECT_RETRIES = 1
+_RETRY_BACKOFF = 0.1
+_RETRY = Retry(total=_CONNECT_RETRIES, connect=_CONNECT_RETRIES, read=0, backoff_factor=_RETRY_BACKOFF)
+# Longest get_current_time waits for any probe before using the system clock.
+_PROBE_DEADLINE = (_CONNECT_RETRIES + 1) * _CONNECT_TIMEOUT + _RETRY_BACKOFF + _READ_TIMEOUT
+_probe_pool: Optional[ThreadPoolExecutor] = None
+_probe_pool_lock = threading.Lock()
+_local = threading.local()
+
+
+def _get_probe_pool() -> ThreadPoolExecutor:
+    # Created on first network lookup, so importing (or using system time) starts no threads.
+    global _probe_pool
+    with _probe_pool_lock:
+        if _probe_pool is None:
+            _probe_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="time-probe")
+        return _probe_pool
+
+
+# A network answer is reused for this long, advanced by the monotonic clock.
+_RESULT_TTL = 30.0
+_results: Dict[str, Tuple[float, TimeResult]] = {}
+_results_lock = threading.Lock()
+
+
+def _session() -> requests.Session:
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=_RETRY)
+        session.mount("https://", adapter)
+    return session
+
+
+def _cached_result(timezone_name: str) -> Optional[TimeResult]:
+    with _results_lock:
+        entry = _results.get(timezone_name)
+    if entry is None:
+        return None
+    taken, result = entry
+    elapsed = monotonic() - taken
+    if elapsed > _RESULT_TTL:
+        return None
+    return TimeResult(dt=result.dt + timedelta(seconds=elapsed), source=result.source)
+
+
+def _store_result(timezone_name: str, result: TimeResult) -> None:
+    with _results_lock:
+        _results[timezone_name] = (monotonic(), result)
+
+
 @dataclass(frozen=True)
 class TimeResult:
     dt: datetime
     source: str
 
 
+@lru_cache(maxsize=64)
+def _zone(name: str) -> ZoneInfo:
+    # ZoneInfo's own cache only strongly holds a handful of zones; keep ours resolved.
+    return ZoneInfo(name)
+
+
 def _parse_iso_datetime(value: str, tz: ZoneInfo) -> datetime:
     dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
     if dt.tzinfo is None:
@@ -28,10 +99,10 @@ def _parse_iso_datetime(value: str, tz: ZoneInfo) -> datetime:
 def _get_time_worldtimeapi(timezone_name: str) -> Optional[TimeResult]:
     url = f"https://worldtimeapi.org/api/timezone/{timezone_name}"
     try:
-        resp = requests.get(url, timeout=5)
+        resp = _session().get(url, timeout=_NETWORK_TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
-        dt = _parse_iso_datetime(data["utc_datetime"], ZoneInfo(timezone_name))
+        dt = _parse_iso_datetime(data["utc_datetime"], _zone(timezone_name))
         return TimeResult(dt=dt, source="worldtimeapi.org")
     except Exception as exc:  # noqa: BLE001
         logger.debug("worldtimeapi.org failed: %s", exc)
@@ -41,7 +112,7 @@ def _get_time_worldtimeapi(timezone_name: str) -> Optional[TimeResult]:
 def _get_time_timeapi_io(timezone_name: str) -> Optional[TimeResult]:
     url = f"https://timeapi.io/api/Time/current/zone?timeZone={timezone_name}"
     try:
-        resp = requests.get(url, timeout=5)
+        resp = _session().get(url, timeout=_NETWORK_TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
         # timeapi.io returns a structured date/time; we build a datetime
@@ -52,7 +123,7 @@ def _get_time_timeapi_io(timezone_name: str) -> Optional[TimeResult]:
             hour=int(data["hour"]),
             minute=int(data["minute"]),
             second=int(data["seconds"]),
-            tzinfo=ZoneInfo(timezone_name),
+            tzinfo=_zone(timezone_name),
         )
         return TimeResult(dt=dt, source="timeapi.io")
     except Exception as exc:  # noqa: BLE001
@@ -63,13 +134,13 @@ def _get_time_timeapi_io(timezone_name: str) -> Optional[TimeResult]:
 def _get_time_google_header(timezone_name: str) -> Optional[TimeResult]:
     url = "https://www.google.com"
     try:
-        resp = requests.get(url, timeout=5)
+        resp = _session().get(url, timeout=_NETWORK_TIMEOUT)
         resp.raise_for_status()
         date_header = resp.headers.get("Date")
         if not date_header:
             return None
         dt = datetime.strptime(date_header, "%a, %d %b %Y %H:%M:%S %Z")
-        dt = dt.replace(tzinfo=timezone.utc).astimezone(ZoneInfo(timezone_name))
+        dt = dt.replace(tzinfo=timezone.utc).astimezone(_zone(timezone_name))
         return TimeResult(dt=dt, source="google-header")
     except Exception as exc:  # noqa: BLE001
         logger.debug("Google date header failed: %s", exc)
@@ -80,19 +151,40 @@ def get_current_time(timezone_name: str, use_network_time: bool) -> TimeResult:
     """
     Get the current time in the given timezone.
 
-    When use_network_time is True, it will attempt multiple sources in order:
+    When use_network_time is True, it queries these sources concurrently:
     1) worldtimeapi.org
     2) timeapi.io
     3) Google Date header
-    and fall back to local system time if all fail.
+    and returns the first that answers, falling back to local system time if all fail.
     """
-    tz = ZoneInfo(timezone_name)
+    tz = _zone(timezone_name)
 
     if use_network_time:
-        for getter in (_get_time_worldtimeapi, _get_time_timeapi_io, _get_time_google_header):
-            result = getter(timezone_name)
-            if result is not None:
-                return result
+        cached = _cached_result(timezone_name)
+        if cached is not None:
+            return cached
+        pool = _get_probe_pool()
+        pending = {
+            pool.submit(getter, timezone_name)
+            for getter in (_get_time_worldtimeapi, _get_time_timeapi_io, _get_time_google_header)
+        }
+        # Each getter times out on its own; one overall deadline bounds the wait
+        # if they hang past that, however many of them fail first.
+        deadline = monotonic() + _PROBE_DEADLINE
+        while pending:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                break
+            done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                result = future.result()
+                if result is not None:
+                    for other in pending:
+                        other.cancel()
+                    _store_result(timezone_name, result)
+                    return result
 
     # Fallback: system time
     local_dt = datetime.now(tz)
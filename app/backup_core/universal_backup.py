@@ -13,8 +13,8 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set
-import os
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
 import re
 
 from .config import (
@@ -22,11 +22,34 @@ from .config import (
     OutputConfig,
     OutputFormat,
     SeparatorStyle,
-    get_separator_format,
+    format_separator,
     FILE_EXTENSION_PRESETS,
     COMMON_EXCLUDE_FOLDERS,
 )
 from .errors import BackupCancelled, BackupIOError
+from .scanning import iter_tree_entries, path_suffix, root_prefix_len
+from .steps.code_bundles import BundleFile, escape_html, read_files_in_order
+
+
+def _compile_exclude_patterns(patterns: Iterable[str]) -> Tuple[re.Pattern, ...]:
+    """
+    Compile the exclude regexes, combined into one alternation where that
+    keeps their meaning. Invalid patterns are dropped, as before.
+    """
+    compiled = []
+    for pattern in patterns:
+        try:
+            compiled.append(re.compile(pattern))
+        except re.error:
+            pass
+    # Wrapping would renumber groups (breaking backreferences), and inline
+    # global flags are only valid at the start; those patterns stay separate.
+    if len(compiled) > 1 and not any(p.groups for p in compiled):
+        try:
+            return (re.compile("|".join(f"(?:{p.pattern})" for p in compiled)),)
+        except re.error:
+            pass
+    return tuple(compiled)
 
 
 @dataclass
@@ -56,6 +79,7 @@ class UniversalBackupConfig:
     include_file_stats: bool = True
     wrap_in_code_block: bool = False
     max_file_kb: int = 256
+    parallel_io: bool = True  # Read ahead on the shared bundle read pool
     
     # Split options
     split_by_folder: bool = False  # Create separate files per top-level folder
@@ -98,45 +122,55 @@ def _count_lines(content: str) -> int:
 def _add_line_numbers(content: str) -> str:
     """Add line numbers to content."""
     lines = content.split('\n')
-    width = len(str(len(lines)))
-    numbered = []
-    for i, line in enumerate(lines, 1):
-        numbered.append(f"{i:>{width}} | {line}")
-    return '\n'.join(numbered)
+    # One %-format built up front, applied per line in a single comprehension
+    fmt = "%%%dd | %%s" % len(str(len(lines)))
+    return '\n'.join([fmt % numbered for numbered in enumerate(lines, 1)])
+
+
+# Code block language per (lowercased) file suffix.
+_LANGUAGE_HINTS: Mapping[str, str] = MappingProxyType({
+    ".ts": "typescript",
+    ".tsx": "tsx",
+    ".js": "javascript",
+    ".jsx": "jsx",
+    ".py": "python",
+    ".json": "json",
+    ".yaml": "yaml",
+    ".yml": "yaml",
+    ".md": "markdown",
+    ".html": "html",
+    ".css": "css",
+    ".scss": "scss",
+    ".sql": "sql",
+    ".sh": "bash",
+    ".go": "go",
+    ".rs": "rust",
+    ".java": "java",
+    ".kt": "kotlin",
+    ".vue": "vue",
+    ".svelte": "svelte",
+})
 
 
 def _get_language_hint(path: Path) -> str:
     """Get language hint for code blocks based on file extension."""
-    mapping = {
-        ".ts": "typescript",
-        ".tsx": "tsx",
-        ".js": "javascript",
-        ".jsx": "jsx",
-        ".py": "python",
-        ".json": "json",
-        ".yaml": "yaml",
-        ".yml": "yaml",
-        ".md": "markdown",
-        ".html": "html",
-        ".css": "css",
-        ".scss": "scss",
-        ".sql": "sql",
-        ".sh": "bash",
-        ".go": "go",
-        ".rs": "rust",
-        ".java": "java",
-        ".kt": "kotlin",
-        ".vue": "vue",
-        ".svelte": "svelte",
-    }
-    return mapping.get(path.suffix.lower(), "")
+    return _LANGUAGE_HINTS.get(path_suffix(path.name).lower(), "")
 
 
 def _should_exclude(
     path: Path,
     config: UniversalBackupConfig,
+    parent_checked: bool = False,
+    patterns: Optional[Tuple[re.Pattern, ...]] = None,
 ) -> bool:
-    """Check if a path should be excluded."""
+    """
+    Check if a path should be excluded.
+    
+    parent_checked: the caller already knows no parent folder is excluded,
+    so only the name itself is tested against exclude_folders.
+    patterns: config.exclude_patterns as compiled by the caller for its walk;
+    compiled here when not given.
+    """
     name = path.name
     
     # Check hidden files/folders
@@ -148,18 +182,20 @@ def _should_exclude(
         return True
     
     # Check excluded folders
-    for part in path.parts:
-        if part in config.exclude_folders:
+    if parent_checked:
+        if name in config.exclude_folders:
             return True
+    elif not config.exclude_folders.isdisjoint(path.parts):
+        return True
     
-    # Check exclude patterns (regex)
-    str_path = str(path)
-    for pattern in config.exclude_patterns:
-        try:
-            if re.search(pattern, str_path):
+    # Check exclude patterns (precompiled regex)
+    if patterns is None:
+        patterns = _compile_exclude_patterns(config.exclude_patterns)
+    if patterns:
+        str_path = str(path)
+        for pattern in patterns:
+            if pattern.search(str_path):
                 return True
-        except re.error:
-            pass
     
     return False
 
@@ -175,41 +211,51 @@ def iter_backup_files(
     """
     root = config.source_root
     allowed_exts = config.get_all_extensions()
-    
-    for dirpath, dirnames, filenames in os.walk(root):
-        # Filter out excluded directories in-place
-        dirnames[:] = [
-            d for d in dirnames
-            if d not in config.exclude_folders
-            and not (config.exclude_hidden and d.startswith('.'))
-        ]
-        
-        current_dir = Path(dirpath)
+    # Snapshotted per walk, so later edits to the config's sets apply to the next walk
+    exclude_folders = frozenset(config.exclude_folders)
+    exclude_hidden = config.exclude_hidden
+    # Compiled per walk, so patterns added to the config since the last walk apply
+    patterns = _compile_exclude_patterns(config.exclude_patterns)
+    cut = root_prefix_len(root)
+    # Excluded folders below root are pruned, so only root's own parts can
+    # match; test them once here rather than every file's parts.
+    if not exclude_folders.isdisjoint(Path(root).parts):
+        return
+    ext_allowed: Dict[str, bool] = {}
+
+    def keep_dir(name: str) -> bool:
+        # Excluded directories are pruned, never entered
+        return name not in exclude_folders and not (exclude_hidden and name.startswith('.'))
+
+    for entry in iter_tree_entries(root, keep_dir):
+        if cancel_check:
+            cancel_check()
         
-        for filename in filenames:
-            if cancel_check:
-                cancel_check()
-            
-            file_path = current_dir / filename
-            
-            # Check extension
-            if allowed_exts and file_path.suffix.lower() not in allowed_exts:
-                continue
-            
-            # Check exclusions
-            if _should_exclude(file_path, config):
-                continue
-            
-            # Get file info
-            try:
-                stat = file_path.stat()
-                yield BackupFileInfo(
-                    path=file_path,
-                    relative_path=file_path.relative_to(root),
-                    size_bytes=stat.st_size,
-                )
-            except (OSError, IOError):
+        # Check extension; answers are memoized per raw suffix, so each distinct
+        # spelling is lowercased once per walk
+        if allowed_exts:
+            suffix = path_suffix(entry.name)
+            allowed = ext_allowed.get(suffix)
+            if allowed is None:
+                allowed = ext_allowed[suffix] = suffix.lower() in allowed_exts
+            if not allowed:
                 continue
+        
+        file_path = Path(entry.path)
+        
+        # Check exclusions
+        if _should_exclude(file_path, config, parent_checked=True, patterns=patterns):
+            continue
+        
+        # Get file info; DirEntry caches the stat
+        try:
+            yield BackupFileInfo(
+                path=file_path,
+                relative_path=Path(entry.path[cut:]),
+                size_bytes=entry.stat().st_size,
+            )
+        except (OSError, IOError):
+            continue
 
 
 def read_file_content(
@@ -248,8 +294,7 @@ def format_file_header(
     line_count: int = 0,
 ) -> str:
     """Format the header for a file in the backup."""
-    sep_format = get_separator_format(config.separator_style, config.custom_separator)
-    header = sep_format.format(path=str(file_info.relative_path))
+    header = format_separator(config.separator_style, file_info.relative_path, config.custom_separator)
     
     if config.include_file_stats:
         size_kb = file_info.size_bytes / 1024
@@ -344,18 +389,28 @@ def run_universal_backup(
     # Ensure output directory exists
     config.output_dir.mkdir(parents=True, exist_ok=True)
     
-    # Collect all files first for progress tracking
+    # Collect all files first for progress tracking; with split_by_folder they
+    # are grouped by top-level folder in the same pass.
     log("Scanning files...")
     files_to_backup: List[BackupFileInfo] = []
+    folder_groups: Dict[str, List[BackupFileInfo]] = {}
     
     for file_info in iter_backup_files(config, cancel_check):
-        files_to_backup.append(file_info)
         stats.total_files += 1
         stats.total_size_bytes += file_info.size_bytes
+        if config.split_by_folder:
+            parts = file_info.relative_path.parts
+            top_folder = parts[0] if len(parts) > 1 else "_root"
+            group = folder_groups.get(top_folder)
+            if group is None:
+                group = folder_groups[top_folder] = []
+            group.append(file_info)
+        else:
+            files_to_backup.append(file_info)
     
     log(f"Found {stats.total_files} files to backup")
     
-    if not files_to_backup:
+    if not stats.total_files:
         log("No files found matching criteria")
         return stats
     
@@ -368,16 +423,7 @@ def run_universal_backup(
     ext = ext_map.get(config.output_format, ".txt")
     
     if config.split_by_folder:
-        # Group files by top-level folder
-        folder_groups: Dict[str, List[BackupFileInfo]] = {}
-        for file_info in files_to_backup:
-            parts = file_info.relative_path.parts
-            top_folder = parts[0] if len(parts) > 1 else "_root"
-            if top_folder not in folder_groups:
-                folder_groups[top_folder] = []
-            folder_groups[top_folder].append(file_info)
-        
-        total_files = len(files_to_backup)
+        total_files = stats.total_files
         processed = 0
         
         for folder_name, files in folder_groups.items():
@@ -412,25 +458,30 @@ def _write_backup_file(
     total = len(files)
     html_blocks = []
     
+    def reader(path: Path, max_kb: int, *_: object) -> tuple[str, bool, int]:
+        return read_file_content(path, max_kb=max_kb, add_line_numbers=config.include_line_numbers)
+    
     try:
-        with output_path.open("w", encoding="utf-8") as f:
-            if config.output_format == OutputFormat.HTML:
-                # We'll collect content and wrap in HTML at the end
-                pass
+        with BundleFile(output_path) as f:
+            # HTML blocks are collected and written once, wrapped, at the end
             
-            for i, file_info in enumerate(files, 1):
+            # Reads run ahead in order; headers and writes stay on this thread.
+            contents = read_files_in_order(
+                [file_info.path for file_info in files],
+                config.max_file_kb,
+                None,
+                None,
+                config.parallel_io,
+                reader,
+            )
+            for i, (file_info, (_, read)) in enumerate(zip(files, contents), 1):
                 if cancel_check:
                     cancel_check()
                 
                 if progress_callback:
                     progress_callback(i, total, str(file_info.relative_path))
                 
-                # Read content
-                content, truncated, line_count = read_file_content(
-                    file_info.path,
-                    max_kb=config.max_file_kb,
-                    add_line_numbers=config.include_line_numbers,
-                )
+                content, truncated, line_count = read
                 
                 if truncated:
                     stats.files_truncated += 1
@@ -447,7 +498,7 @@ def _write_backup_file(
                         <div class="file-header">{file_info.relative_path}
                             <span class="file-stats">[{file_info.size_bytes / 1024:.1f}KB | {line_count} lines]</span>
                         </div>
-                        <pre><code>{_escape_html(content)}</code></pre>
+                        <pre><code>{escape_html(content)}</code></pre>
                     </div>
                     """
                     html_blocks.append(html_block)
@@ -464,8 +515,6 @@ def _write_backup_file(
                     f"Backup: {config.source_root.name}",
                     "\n".join(html_blocks),
                 )
-                f.seek(0)
-                f.truncate()
                 f.write(html_content)
         
         stats.output_files_created += 1
@@ -475,18 +524,6 @@ def _write_backup_file(
         raise BackupIOError(f"Failed to write backup file: {output_path} - {exc}") from exc
 
 
-def _escape_html(text: str) -> str:
-    """Escape HTML special characters."""
-    return (
-        text
-        .replace("&", "&amp;")
-        .replace("<", "&lt;")
-        .replace(">", "&gt;")
-        .replace('"', "&quot;")
-        .replace("'", "&#39;")
-    )
-
-
 # Convenience functions for common backup patterns
 
 def quick_backup_typescript(
@@ -0,0 +1,31 @@
+"""
+Shared Animation Clock
+
+One ~60 FPS timer for every animated widget, so N animations cost one
+timer wakeup per frame instead of N.
+
+Author: Amirhosein Rezapour | techili.ir | tayberry.ir | tayberry.dev
+"""
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+FRAME_INTERVAL_MS = 16  # ~60 FPS
+
+class Animator(QObject):
+    """ Emits `tick` once per frame; widgets connect to it instead of owning a QTimer. """
+    tick = pyqtSignal()
+
+    _instance = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.tick)
+        self._timer.start(FRAME_INTERVAL_MS)
+
+    @classmethod
+    def instance(cls) -> "Animator":
+        # Created on first use, once the QApplication exists.
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
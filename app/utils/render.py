@@ -11,11 +11,33 @@ Author: Amirhosein Rezapour
 Web: techili.ir | tayberry.ir | tayberry.dev
 """
 
-from PyQt6.QtGui import QImage, QColor, QPainter, QBrush, QPixmap, QLinearGradient, QRadialGradient
+from PyQt6.QtGui import QImage, QColor, QBrush, QPixmap, QLinearGradient, QRadialGradient
 from PyQt6.QtCore import Qt, QRectF, QPointF
-import random
+from functools import lru_cache
 import math
 
+import numpy as np
+
+def _box_blur(pixels: np.ndarray, radius: int) -> np.ndarray:
+    """ Three box passes per axis approximate a gaussian; running sums keep each pass O(pixels). """
+    size = 2 * radius + 1
+    for axis in (0, 1):
+        n = pixels.shape[axis]
+        pad = [(0, 0)] * pixels.ndim
+        pad[axis] = (radius + 1, radius)
+        # Basic slices along the blurred axis are views, not fancy-indexed copies
+        head = [slice(None)] * pixels.ndim
+        tail = [slice(None)] * pixels.ndim
+        head[axis] = slice(size, size + n)
+        tail[axis] = slice(0, n)
+        head, tail = tuple(head), tuple(tail)
+        for _ in range(3):
+            summed = np.cumsum(np.pad(pixels, pad, mode="edge"), axis=axis, dtype=np.uint32)
+            window = summed[head] - summed[tail]
+            window //= size
+            pixels = window.astype(np.uint8)
+    return pixels
+
 def apply_blur(pixmap: QPixmap, radius: float) -> QPixmap:
     """
     Applies a gaussian blur to a QPixmap using QImage processing.
@@ -24,19 +46,27 @@ def apply_blur(pixmap: QPixmap, radius: float) -> QPixmap:
     if radius <= 0:
         return pixmap
     
-    # Downscale for performance (and to simulate blur)
+    # Downscale for performance; the blur then runs over the smaller image
     scale = max(0.1, 1.0 - (radius / 50.0))
     w = pixmap.width()
     h = pixmap.height()
     
-    downscaled = pixmap.scaled(
-        int(w * scale), int(h * scale),
+    image = pixmap.toImage().scaled(
+        max(1, int(w * scale)), max(1, int(h * scale)),
         Qt.AspectRatioMode.IgnoreAspectRatio,
-        Qt.TransformationMode.SmoothTransformation
-    )
+        Qt.TransformationMode.FastTransformation
+    ).convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+
+    # Premultiplied pixels blur without dark fringes at transparent edges
+    sw, sh = image.width(), image.height()
+    bits = image.constBits()
+    bits.setsize(image.sizeInBytes())
+    pixels = np.frombuffer(bits, np.uint8).reshape(sh, image.bytesPerLine())[:, :sw * 4].reshape(sh, sw, 4)
+    pixels = np.ascontiguousarray(_box_blur(pixels, max(1, round(radius * scale / 3))))
+    small = QPixmap.fromImage(QImage(pixels.data, sw, sh, 4 * sw, QImage.Format.Format_ARGB32_Premultiplied))
     
-    # Upscale back to original size + extra smooth
-    blurred = downscaled.scaled(
+    # Upscale back to original size; smooth filtering hides the lower resolution
+    blurred = small.scaled(
         w, h,
         Qt.AspectRatioMode.IgnoreAspectRatio,
         Qt.TransformationMode.SmoothTransformation
@@ -46,23 +76,80 @@ def apply_blur(pixmap: QPixmap, radius: float) -> QPixmap:
 
 def generate_noise_texture(width: int, height: int, opacity: float = 0.05) -> QPixmap:
     """ Generates a subtle grain/noise texture. """
+    # Same grain as drawing int(w*h*0.1) random grey points with QPainter, but
+    # the pixels are filled in one vectorized pass straight into the image buffer.
+    # SFC64 is numpy's fastest bit generator (a small-state shift/add/xor
+    # design); the grain needs speed, not PCG64's statistical guarantees.
+    rng = np.random.Generator(np.random.SFC64())
+    count = int(width * height * 0.1)
+    alpha = int(255 * opacity)
+    val = rng.integers(200, 256, size=count, dtype=np.uint32)
+    # Format_ARGB32_Premultiplied stores 0xAARRGGBB with the colour scaled by alpha.
+    grey = (val * alpha + 127) // 255
     image = QImage(width, height, QImage.Format.Format_ARGB32_Premultiplied)
-    image.fill(Qt.GlobalColor.transparent)
-    
-    painter = QPainter(image)
-    painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
-    
-    # Create random noise pixels
-    for _ in range(int(width * height * 0.1)):
-        x = random.randint(0, width - 1)
-        y = random.randint(0, height - 1)
-        val = random.randint(200, 255)
-        color = QColor(val, val, val, int(255 * opacity))
-        painter.setPen(color)
-        painter.drawPoint(x, y)
-        
-    painter.end()
-    return QPixmap.fromImage(image)
+    image.fill(0)
+    # Write into the image's own scanlines (32-bit rows carry no padding), so no
+    # intermediate buffer is allocated and the image owns its pixels.
+    ptr = image.bits()
+    ptr.setsize(image.sizeInBytes())
+    pixels = np.frombuffer(ptr, dtype=np.uint32)
+    pixels[rng.integers(0, width * height, size=count)] = (alpha << 24) | (grey << 16) | (grey << 8) | grey
+
+    # The alpha channel is what makes the grain sparse (~90% of pixels are fully
+    # transparent), so it stays; only the scan for an all-opaque image is skipped.
+    return QPixmap.fromImage(image, Qt.ImageConversionFlag.NoOpaqueDetection)
+
+NOISE_POOL_SIZE = 30
+
+@lru_cache(maxsize=8)
+def get_noise_pool(width: int, height: int, opacity: float = 0.05, count: int = NOISE_POOL_SIZE) -> tuple:
+    """
+    Distinct noise textures, generated once and shared by every caller asking
+    for the same size and opacity; cycling through them hides the tiling.
+    """
+    return tuple(generate_noise_texture(width, height, opacity) for _ in range(count))
+
+def perlin_noise(width: int, height: int, cells: int = 16, rng=None) -> np.ndarray:
+    """
+    Tileable gradient (Perlin) noise in [0, 1] as a (height, width) float32 array.
+    Only one random gradient per grid vertex is drawn; pixels interpolate between them.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    angles = rng.uniform(0, 2 * math.pi, (cells, cells)).astype(np.float32)
+    # Wrapping the lattice (last row/column = first) makes the texture tile seamlessly.
+    angles = np.pad(angles, ((0, 1), (0, 1)), mode="wrap")
+    gx, gy = np.cos(angles), np.sin(angles)
+
+    x = np.arange(width, dtype=np.float32) * (cells / width)
+    y = np.arange(height, dtype=np.float32) * (cells / height)
+    xi, yi = x.astype(np.intp), y.astype(np.intp)[:, None]
+    xf, yf = x - xi, (y - y.astype(np.intp))[:, None]
+
+    def corner(dx: int, dy: int) -> np.ndarray:
+        return gx[yi + dy, xi + dx] * (xf - dx) + gy[yi + dy, xi + dx] * (yf - dy)
+
+    # 3t^2 - 2t^3 fade, then a bilinear blend of the four corner dot products
+    u = xf * xf * (3 - 2 * xf)
+    v = yf * yf * (3 - 2 * yf)
+    top = corner(0, 0) + u * (corner(1, 0) - corner(0, 0))
+    bottom = corner(0, 1) + u * (corner(1, 1) - corner(0, 1))
+    noise = top + v * (bottom - top)
+    # 2D gradient noise lies within +-sqrt(1/2)
+    return np.clip(noise * math.sqrt(0.5) + 0.5, 0.0, 1.0)
+
+def generate_frost_texture(width: int, height: int, opacity: float = 0.05, cells: int = 16) -> QPixmap:
+    """ Soft, tileable frost: light grey whose alpha follows Perlin noise. """
+    t = perlin_noise(width, height, cells)
+    alpha = np.rint(t * (255 * opacity)).astype(np.uint32)
+    grey = (np.rint(200 + 55 * t).astype(np.uint32) * alpha + 127) // 255
+    pixels = np.ascontiguousarray((alpha << 24) | (grey << 16) | (grey << 8) | grey)
+    image = QImage(pixels.data, width, height, 4 * width, QImage.Format.Format_ARGB32_Premultiplied)
+    return QPixmap.fromImage(image, Qt.ImageConversionFlag.NoOpaqueDetection)
+
+@lru_cache(maxsize=8)
+def get_frost_texture(width: int, height: int, opacity: float = 0.05) -> QPixmap:
+    """ Frost texture shared by every caller asking for the same size and opacity. """
+    return generate_frost_texture(width, height, opacity)
 
 def create_glass_gradient(rect: QRectF, color: QColor, angle: float = 45) -> QLinearGradient:
     """ Creates a standard glass sheen gradient. """
@@ -8,7 +8,7 @@ Author: Amirhosein Rezapour | techili.ir | tayberry.ir | tayberry.dev
 
 from PyQt6.QtWidgets import QLineEdit, QPushButton, QWidget
 from PyQt6.QtCore import Qt, QPropertyAnimation, pyqtProperty, QRectF
-from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QBrush
+from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QBrush, QPixmap, QPixmapCache
 
 class FluidInput(QLineEdit):
     def __init__(self, placeholder="Enter text...", parent=None):
@@ -41,6 +41,12 @@ class FluidGlassButton(QPushButton):
         self.hover_color = QColor(255, 255, 255, 30)
         self.border_color = QColor(255, 255, 255, 40)
         
+        # Paint resources reused by every repaint
+        self._font = QFont("Segoe UI", 10)
+        self._font.setLetterSpacing(QFont.SpacingType.AbsoluteSpacing, 1.0)
+        self._border_pen = QPen(self.border_color, 1)
+        self._shine_brush = QBrush(QColor(255, 255, 255, 10))
+        
     def enterEvent(self, event):
         self.bg_color = self.hover_color
         self.update()
@@ -50,7 +56,26 @@ class FluidGlassButton(QPushButton):
         self.update()
         
     def paintEvent(self, event):
+        # The face only changes with size, colours, text and hover, so each
+        # combination is rendered once and shared through QPixmapCache.
+        hovered = self.underMouse()
+        dpr = self.devicePixelRatioF()
+        key = (
+            f"{type(self).__name__}:{self.width()}x{self.height()}@{dpr}:"
+            f"{self.bg_color.rgba()}:{self.border_color.rgba()}:{int(hovered)}:{self.text()}"
+        )
+        face = QPixmapCache.find(key)
+        if face is None:
+            face = self._render_face(dpr, hovered)
+            QPixmapCache.insert(key, face)
         painter = QPainter(self)
+        painter.drawPixmap(0, 0, face)
+        
+    def _render_face(self, dpr, hovered):
+        face = QPixmap(round(self.width() * dpr), round(self.height() * dpr))
+        face.setDevicePixelRatio(dpr)
+        face.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(face)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
         rect = self.rect()
@@ -59,21 +84,21 @@ class FluidGlassButton(QPushButton):
         
         # Glass Body
         painter.setBrush(QBrush(self.bg_color))
-        painter.setPen(QPen(self.border_color, 1))
+        if self._border_pen.color() != self.border_color:
+            self._border_pen = QPen(self.border_color, 1)
+        painter.setPen(self._border_pen)
         painter.drawRoundedRect(path, radius, radius)
         
         # Text
         painter.setPen(Qt.GlobalColor.white)
-        font = QFont("Segoe UI", 10)
-        font.setLetterSpacing(QFont.SpacingType.AbsoluteSpacing, 1.0)
-        painter.setFont(font)
+        painter.setFont(self._font)
         painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, self.text())
         
         # Shine
-        if self.underMouse():
+        if hovered:
             shine_rect = QRectF(0, 0, rect.width(), rect.height() / 2)
-            grad = QBrush(QColor(255, 255, 255, 10))
-            painter.setBrush(grad)
+            painter.setBrush(self._shine_brush)
             painter.setPen(Qt.PenStyle.NoPen)
             painter.drawRoundedRect(shine_rect, radius, radius)
-
+        painter.end()
+        return face
@@ -10,10 +10,49 @@ Author: Amirhosein Rezapour | techili.ir | tayberry.ir | tayberry.dev
 import math
 import random
 import time
+from functools import lru_cache
+
+import numpy as np
 from PyQt6.QtWidgets import QWidget
-from PyQt6.QtCore import Qt, QTimer, QPointF
+from PyQt6.QtCore import Qt, QLine, QPointF, QRectF
 from PyQt6.QtGui import QPainter, QColor, QRadialGradient, QLinearGradient, QBrush, QPixmap, QImage, QPen
 
+from ..utils.animator import Animator
+
+try:  # numba is optional; without it the star tick runs as numpy array operations.
+    from numba import njit
+except ImportError:  # pragma: no cover - depends on environment
+    njit = None
+
+def _tick_stars(xs, ys, alphas, depths, velocities, twinkle, noise, new_x, h):
+    """ Twinkle, drift and wrap every star in a single pass over the arrays. """
+    for i in range(xs.shape[0]):
+        if twinkle[i]:
+            alphas[i] = min(1.0, max(0.4, alphas[i] + noise[i]))
+        ys[i] += velocities[i] * depths[i]
+        if ys[i] > h:
+            ys[i] = -10.0
+            xs[i] = new_x[i]
+
+_tick_stars_native = njit(cache=True)(_tick_stars) if njit is not None else None
+
+@lru_cache(maxsize=16)
+def _render_glow(rgba: int, radius: float) -> QPixmap:
+    # Shared by every background in the process; nebulae of one colour and size reuse it.
+    side = int(math.ceil(radius * 2))
+    pix = QPixmap(side, side)
+    pix.fill(Qt.GlobalColor.transparent)
+    grad = QRadialGradient(side / 2, side / 2, radius)
+    grad.setColorAt(0, QColor.fromRgba(rgba))
+    grad.setColorAt(1, Qt.GlobalColor.transparent)
+    painter = QPainter(pix)
+    painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    painter.setBrush(QBrush(grad))
+    painter.setPen(Qt.PenStyle.NoPen)
+    painter.drawEllipse(QPointF(side / 2, side / 2), radius, radius)
+    painter.end()
+    return pix
+
 class Nebula:
     def __init__(self, color, center, radius, drift):
         self.color = color
@@ -21,6 +60,15 @@ class Nebula:
         self.radius = radius
         self.drift = drift
         self.phase = random.random() * math.pi * 2
+        self._glow = None
+        self._glow_radius = None
+        
+    def glow(self) -> QPixmap:
+        """ The radial glow, rasterized once and rebuilt only if the radius changes. """
+        if self._glow is None or self._glow_radius != self.radius:
+            self._glow = _render_glow(self.color.rgba(), self.radius)
+            self._glow_radius = self.radius
+        return self._glow
         
     def update(self):
         self.phase += 0.01
@@ -28,32 +76,68 @@ class Nebula:
         self.center[1] += math.cos(self.phase) * self.drift
 
 class GalaxyBackgound(QWidget):
+    STAR_PIX_RADIUS = 8
+    _star_sprite = None
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.stars = []
+        # paintEvent fills every pixel with the gradient, so Qt can skip erasing first
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        # Stars are kept as parallel arrays (one per attribute) so the
+        # simulation updates all of them in a few vectorized operations.
+        self.rng = np.random.default_rng()
+        self.star_x = np.empty(0)
+        self.star_y = np.empty(0)
+        self.star_size = np.empty(0)
+        self.star_depth = np.empty(0)
+        self.star_alpha = np.empty(0)
+        self.star_twinkle = np.empty(0, dtype=bool)
+        self.star_velocity = np.empty(0)
         self.nebulae = []
+        self._star_pix = self._shared_star_pix()
+        # Background gradient, rendered once per size
+        self._backdrop = None
         self.mouse_pos = QPointF(0, 0)
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_simulation)
-        self.timer.start(16)  # ~60 FPS
+        # Driven by the shared frame clock (~60 FPS)
+        Animator.instance().tick.connect(self.update_simulation)
         
         self.init_universe()
         
+    @classmethod
+    def _shared_star_pix(cls) -> QPixmap:
+        # Rendered by the first instance; the star field itself is per widget (it animates).
+        if cls._star_sprite is None:
+            cls._star_sprite = cls._render_star()
+        return cls._star_sprite
+        
+    @classmethod
+    def _render_star(cls) -> QPixmap:
+        # A solid white disc; fragments scale it to each star's radius.
+        side = cls.STAR_PIX_RADIUS * 2
+        pix = QPixmap(side, side)
+        pix.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(pix)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QBrush(QColor(255, 255, 255)))
+        painter.drawEllipse(QPointF(cls.STAR_PIX_RADIUS, cls.STAR_PIX_RADIUS), cls.STAR_PIX_RADIUS, cls.STAR_PIX_RADIUS)
+        painter.end()
+        return pix
+
     def init_universe(self):
         w = self.width() if self.width() > 0 else 1200
         h = self.height() if self.height() > 0 else 800
         
         # Stars
-        for _ in range(300):
-            self.stars.append({
-                'x': random.uniform(0, w),
-                'y': random.uniform(0, h),
-                'size': random.uniform(1.0, 3.0),
-                'depth': random.uniform(0.1, 1.0), # parallax depth
-                'alpha': random.uniform(0.5, 1.0),
-                'twinkle': random.choice([True, False]),
-                'velocity': random.uniform(0.1, 0.5)
-            })
+        count = 300
+        rng = self.rng
+        self.star_x = rng.uniform(0, w, count)
+        self.star_y = rng.uniform(0, h, count)
+        self.star_size = rng.uniform(1.0, 3.0, count)
+        self.star_depth = rng.uniform(0.1, 1.0, count) # parallax depth
+        self.star_alpha = rng.uniform(0.5, 1.0, count)
+        self.star_twinkle = rng.random(count) < 0.5
+        self.star_velocity = rng.uniform(0.1, 0.5, count)
             
         # Nebulae
         self.nebulae.append(Nebula(QColor(60, 0, 100, 40), (w/2, h/2), 600, 0.5))
@@ -68,17 +152,27 @@ class GalaxyBackgound(QWidget):
             pass
             
         # Update Stars
-        for s in self.stars:
+        rng = self.rng
+        if _tick_stars_native is not None:
+            # One compiled pass; random draws are made up front, outside the kernel
+            count = self.star_x.shape[0]
+            _tick_stars_native(
+                self.star_x, self.star_y, self.star_alpha, self.star_depth, self.star_velocity,
+                self.star_twinkle, rng.uniform(-0.02, 0.02, count), rng.uniform(0, w, count), h,
+            )
+        else:
+            twinkle = self.star_twinkle
             # Twinkle
-            if s['twinkle']:
-                s['alpha'] += random.uniform(-0.02, 0.02)
-                s['alpha'] = max(0.4, min(1.0, s['alpha']))
-                
+            alpha = self.star_alpha
+            alpha[twinkle] += rng.uniform(-0.02, 0.02, np.count_nonzero(twinkle))
+            np.clip(alpha, 0.4, 1.0, out=alpha)
+            
             # Move
-            s['y'] += s['velocity'] * s['depth']
-            if s['y'] > h:
-                s['y'] = -10
-                s['x'] = random.uniform(0, w)
+            self.star_y += self.star_velocity * self.star_depth
+            wrapped = self.star_y > h
+            if wrapped.any():
+                self.star_y[wrapped] = -10
+                self.star_x[wrapped] = rng.uniform(0, w, np.count_nonzero(wrapped))
                 
         # Update Nebulae
         for n in self.nebulae:
@@ -86,14 +180,11 @@ class GalaxyBackgound(QWidget):
             
         self.update() # Trigger repaint
         
-    def mouseMoveEvent(self, event):
-        self.mouse_pos = event.position()
-        self.update() # Parallax update
-        super().mouseMoveEvent(event)
-        
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    def _render_backdrop(self) -> QPixmap:
+        dpr = self.devicePixelRatioF()
+        pix = QPixmap(round(self.width() * dpr), round(self.height() * dpr))
+        pix.setDevicePixelRatio(dpr)
+        painter = QPainter(pix)
         
         # Draw Background (Pro Gradient)
         # Create a deep, professional linear gradient
@@ -104,6 +195,26 @@ class GalaxyBackgound(QWidget):
         gradient.setColorAt(1.0, QColor(0, 0, 0))      # Black
         
         painter.fillRect(self.rect(), QBrush(gradient))
+        painter.end()
+        return pix
+        
+    def resizeEvent(self, event):
+        self._backdrop = None
+        super().resizeEvent(event)
+        
+    def mouseMoveEvent(self, event):
+        # Parallax is picked up by the next frame tick's repaint
+        self.mouse_pos = event.position()
+        super().mouseMoveEvent(event)
+        
+    def paintEvent(self, event):
+        if self._backdrop is None:
+            self._backdrop = self._render_backdrop()
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        # Static gradient: one blit; only nebulae and stars are drawn per frame
+        painter.drawPixmap(0, 0, self._backdrop)
         
         mx = self.mouse_pos.x() if hasattr(self, 'mouse_pos') else 0
         my = self.mouse_pos.y()
@@ -115,35 +226,51 @@ class GalaxyBackgound(QWidget):
             parallax_x = (mx - cx) * 0.02 * (1.0 / n.radius) * 100
             parallax_y = (my - cy) * 0.02 * (1.0 / n.radius) * 100
             
-            grad = QRadialGradient(n.center[0] + parallax_x, n.center[1] + parallax_y, n.radius)
-            grad.setColorAt(0, n.color)
-            grad.setColorAt(1, Qt.GlobalColor.transparent)
-            painter.setBrush(QBrush(grad))
-            painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawEllipse(QPointF(n.center[0] + parallax_x, n.center[1] + parallax_y), n.radius, n.radius)
+            glow = n.glow()
+            half = glow.width() / 2
+            painter.drawPixmap(QPointF(n.center[0] + parallax_x - half, n.center[1] + parallax_y - half), glow)
             
         # Draw Stars
         painter.setPen(Qt.PenStyle.NoPen)
-        for s in self.stars:
-            # Parallax Logic
-            px_off = (mx - cx) * 0.05 * s['depth']
-            py_off = (my - cy) * 0.05 * s['depth']
-            
-            x = s['x'] + px_off
-            y = s['y'] + py_off
-            
-            # Simple bounds check for wrap around (for smooth parallax feel)
-            if x < 0: x += self.width()
-            if x > self.width(): x -= self.width()
-            
-            opacity = int(s['alpha'] * 255)
-            color = QColor(255, 255, 255, opacity)
-            painter.setBrush(QBrush(color))
-            painter.drawEllipse(QPointF(x, y), s['size'], s['size'])
-            
-            # Extra glare/star shape for larger stars
-            if s['size'] > 2.5:
-                painter.setPen(QPen(QColor(255, 255, 255, int(opacity * 0.3)), 0.5))
-                painter.drawLine(int(x - 5), int(y), int(x + 5), int(y))
-                painter.drawLine(int(x), int(y - 5), int(x), int(y + 5))
-                painter.setPen(Qt.PenStyle.NoPen)
+        # Parallax Logic (all stars at once)
+        width = self.width()
+        xs = self.star_x + (mx - cx) * 0.05 * self.star_depth
+        ys = self.star_y + (my - cy) * 0.05 * self.star_depth
+        
+        # Simple bounds check for wrap around (for smooth parallax feel)
+        xs[xs < 0] += width
+        xs[xs > width] -= width
+        opacities = (self.star_alpha * 255).astype(int)
+        sizes = self.star_size
+        
+        # Cull stars that land off-widget; the margin covers the 5px glare strokes
+        margin = 5
+        visible = (xs >= -margin) & (xs <= width + margin) & (ys >= -margin) & (ys <= self.height() + margin)
+        if not visible.all():
+            xs, ys, sizes, opacities = xs[visible], ys[visible], sizes[visible], opacities[visible]
+        
+        # Every disc in one batched blit of a pre-rasterized star, scaled and faded per star
+        source = QRectF(self._star_pix.rect())
+        scales = (sizes / self.STAR_PIX_RADIUS).tolist()
+        fragments = [
+            QPainter.PixmapFragment.create(QPointF(x, y), source, scale, scale, 0, alpha)
+            for x, y, scale, alpha in zip(xs.tolist(), ys.tolist(), scales, (opacities / 255).tolist())
+        ]
+        painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+        painter.drawPixmapFragments(fragments, self._star_pix)
+        
+        # Extra glare/star shape for larger stars: both strokes of every large star,
+        # batched per pen; glare alpha is rounded to steps of 8 so a few pens cover all.
+        large = sizes > 2.5
+        gx, gy = xs[large], ys[large]
+        # astype(int) truncates toward zero, as int() did
+        x0, x, x1 = (gx - 5).astype(int), gx.astype(int), (gx + 5).astype(int)
+        y0, y, y1 = (gy - 5).astype(int), gy.astype(int), (gy + 5).astype(int)
+        glare = ((opacities[large] * 0.3).astype(int) + 4) // 8 * 8
+        for level in np.unique(glare).tolist():
+            pick = glare == level
+            lines = [QLine(*c) for c in zip(x0[pick].tolist(), y[pick].tolist(), x1[pick].tolist(), y[pick].tolist())]
+            lines += [QLine(*c) for c in zip(x[pick].tolist(), y0[pick].tolist(), x[pick].tolist(), y1[pick].tolist())]
+            painter.setPen(QPen(QColor(255, 255, 255, min(level, 255)), 0.5))
+            painter.drawLines(lines)
+        painter.setPen(Qt.PenStyle.NoPen)
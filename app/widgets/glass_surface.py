@@ -8,12 +8,15 @@ Author: Amirhosein Rezapour | techili.ir | tayberry.ir | tayberry.dev
 """
 
 from PyQt6.QtWidgets import QWidget, QGraphicsEffect, QGraphicsBlurEffect
-from PyQt6.QtCore import Qt, QRect, QRectF, QPoint, QTimer, QPropertyAnimation, pyqtProperty
+from PyQt6.QtCore import Qt, QEvent, QRect, QRectF, QPoint, QTimer, QPropertyAnimation, pyqtProperty
 from PyQt6.QtGui import QPainter, QColor, QBrush, QPen, QPalette, QPixmap, QRegion, QTransform, QPainterPath, QLinearGradient
 
-from ..utils.render import apply_blur, create_glass_gradient, generate_noise_texture
+from ..utils.render import apply_blur, create_glass_gradient, get_frost_texture, get_noise_pool
 
 class GlassSurface(QWidget):
+    # The backdrop animates underneath; re-grab it every this many repaints
+    BG_REFRESH_FRAMES = 30
+
     def __init__(self, parent=None, blur_radius=20, frost_opacity=0.1, tint_color=QColor(255, 255, 255, 10)):
         super().__init__(parent)
         self.blur_radius = blur_radius
@@ -22,12 +25,29 @@ class GlassSurface(QWidget):
         self.border_color = QColor(255, 255, 255, 50)
         self.corner_radius = 24.0
         
-        self.noise_texture = generate_noise_texture(256, 256, 0.08)
+        # Each repaint steps to the next pre-generated frame of the shared pool
+        self._noise_pool = get_noise_pool(256, 256, 0.08)
+        self._noise_idx = 0
+        self.noise_texture = self._noise_pool[0]
+        # Soft Perlin frost under the grain; static, so one shared tile
+        self.frost_texture = get_frost_texture(256, 256, 0.3)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         
         # Internal caching
         self._cached_bg = None
         self._bg_dirty = True
+        self._bg_frames = 0
+        # While False (e.g. during a drag-resize) the backdrop is neither grabbed nor drawn
+        self._live_blur = True
+        # Backdrop grabs run from the event loop, never inside paintEvent; several
+        # invalidations before it fires share one grab
+        self._bg_timer = QTimer(self)
+        self._bg_timer.setSingleShot(True)
+        self._bg_timer.setInterval(0)
+        self._bg_timer.timeout.connect(self._refresh_bg)
+        # Sheen brush and border pen depend only on the size; rebuilt in resizeEvent
+        self._sheen_brush = None
+        self._border_pen = None
         
         # Interaction state
         self.hovered = False
@@ -36,7 +56,91 @@ class GlassSurface(QWidget):
         
         self.setMouseTracking(True)
 
+    def resizeEvent(self, event):
+        self._update_chrome()
+        self._bg_dirty = True
+        super().resizeEvent(event)
+
+    def moveEvent(self, event):
+        self._bg_dirty = True
+        super().moveEvent(event)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.Type.ParentChange:
+            self._bg_dirty = True
+        super().changeEvent(event)
+
+    def set_live_blur(self, enabled: bool):
+        """ Suspend the blurred backdrop (tint and frost only) or bring it back. """
+        if enabled == self._live_blur:
+            return
+        self._live_blur = enabled
+        self._cached_bg = None
+        self._bg_dirty = True
+        self.update()
+
+    def _refresh_bg(self):
+        if not self._live_blur or self.parentWidget() is None or not self.isVisible():
+            return
+        # Render what lies behind us: each ancestor's own painting (no children,
+        # so neither this surface nor its siblings recurse in), back to front.
+        dpr = self.devicePixelRatioF()
+        backdrop = QPixmap(round(self.width() * dpr), round(self.height() * dpr))
+        backdrop.setDevicePixelRatio(dpr)
+        backdrop.fill(Qt.GlobalColor.transparent)
+        ancestors = []
+        widget = self.parentWidget()
+        while widget is not None:
+            ancestors.append(widget)
+            widget = widget.parentWidget()
+        painter = QPainter(backdrop)
+        for ancestor in reversed(ancestors):
+            origin = self.mapTo(ancestor, QPoint(0, 0))
+            ancestor.render(
+                painter,
+                QPoint(0, 0),
+                QRegion(QRect(origin, self.size())),
+                QWidget.RenderFlag.DrawWindowBackground,
+            )
+        painter.end()
+        self._cached_bg = apply_blur(backdrop, self.blur_radius)
+        self._bg_dirty = False
+        self._bg_frames = 0
+        self.update()
+
+    def _update_chrome(self):
+        rect = QRectF(self.rect())
+
+        # 3. Specular Sheen (Gradient)
+        self._sheen_brush = QBrush(create_glass_gradient(rect, QColor(255, 255, 255, 40)))
+
+        # 4. Edge Highlight (Stroke)
+        # Top-Left is brighter (light source simulation)
+        pen = QPen()
+        pen.setWidthF(1.5)
+        
+        # Dual-tone border (Gradient stroke is hard in pure QPen, simulate with clip or simple color)
+        # We use a LinearGradient for the pen brush
+        border_grad = QLinearGradient(rect.topLeft(), rect.bottomRight())
+        border_grad.setColorAt(0.0, QColor(255, 255, 255, 120))
+        border_grad.setColorAt(0.4, QColor(255, 255, 255, 30))
+        border_grad.setColorAt(1.0, QColor(255, 255, 255, 10))
+        
+        pen.setBrush(QBrush(border_grad))
+        self._border_pen = pen
+
     def paintEvent(self, event):
+        if event.region().isEmpty():
+            return
+        if self._border_pen is None:
+            self._update_chrome()
+        # 1. Blurred backdrop: paint only blits the cached grab; a stale one is
+        # re-grabbed on the next event-loop pass (see _refresh_bg)
+        self._bg_frames += 1
+        if (self._live_blur and self.parentWidget() is not None
+                and (self._bg_dirty or self._bg_frames >= self.BG_REFRESH_FRAMES)
+                and not self._bg_timer.isActive()):
+            self._bg_timer.start()
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
@@ -45,55 +149,28 @@ class GlassSurface(QWidget):
         path = QPainterPath()
         path.addRoundedRect(rect, self.corner_radius, self.corner_radius)
 
-        # 1. Grab Background (Simulated Refraction/Blur)
-        # In a real heavy app, we'd use QGraphicsBlurEffect on a sibling or cache parent render.
-        # For this demo, we can hint the parent to draw? No, cyclic dependency.
-        # Instead, we just draw a semi-transparent frost layer because real-time blur of parent is expensive on CPU.
-        # OR: We grab the parent widget, render portion into pixmap, blur it.
-        
-        if self.parent() and self.isVisible():
-            # Coordinate mapping
-            pt = self.mapTo(self.parent(), QPoint(0, 0))
-            
-            # Optimization: only re-grab every N frames or if strictly needed
-            # For "Liquid" feel, we want it live.
-            if self._bg_dirty or True: # Force update for demo
-                # Clip rect in parent coords
-                parent_rect = QRect(pt, self.size())
-                
-                # Render parent background (this is tricky in Qt without infinite recursion)
-                # A common trick is to grab the window grab, but that's slow.
-                # Alternative: The parent (GalaxyBackground) pushes updates to us? 
-                # Or we simpler transparent composition.
-                pass 
-                
         # Fill with Glass Tint
         painter.setClipPath(path)
+        if self._cached_bg is not None:
+            painter.drawPixmap(0, 0, self._cached_bg)
         painter.fillPath(path, self.tint_color)
         
         # 2. Add Blur/Frost Texture
         painter.setOpacity(self.frost_opacity)
+        painter.drawTiledPixmap(rect, self.frost_texture)
+        # Qt already clips painting to the dirty region; a partial repaint must
+        # keep the current noise frame so it matches the pixels around it
+        if event.rect().contains(self.rect()):
+            self._noise_idx = (self._noise_idx + 1) % len(self._noise_pool)
+            self.noise_texture = self._noise_pool[self._noise_idx]
         painter.drawTiledPixmap(rect, self.noise_texture)
         painter.setOpacity(1.0)
         
         # 3. Specular Sheen (Gradient)
-        gradient = create_glass_gradient(rect, QColor(255, 255, 255, 40))
-        painter.fillPath(path, QBrush(gradient))
+        painter.fillPath(path, self._sheen_brush)
         
         # 4. Edge Highlight (Stroke)
-        # Top-Left is brighter (light source simulation)
-        pen = QPen()
-        pen.setWidthF(1.5)
-        
-        # Dual-tone border (Gradient stroke is hard in pure QPen, simulate with clip or simple color)
-        # We use a LinearGradient for the pen brush
-        border_grad = QLinearGradient(rect.topLeft(), rect.bottomRight())
-        border_grad.setColorAt(0.0, QColor(255, 255, 255, 120))
-        border_grad.setColorAt(0.4, QColor(255, 255, 255, 30))
-        border_grad.setColorAt(1.0, QColor(255, 255, 255, 10))
-        
-        pen.setBrush(QBrush(border_grad))
-        painter.setPen(pen)
+        painter.setPen(self._border_pen)
         painter.drawPath(path)
         
     def enterEvent(self, event):
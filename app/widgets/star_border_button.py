@@ -8,19 +8,23 @@ Author: Amirhosein Rezapour | techili.ir | tayberry.ir | tayberry.dev
 """
 
 from PyQt6.QtWidgets import QPushButton
-from PyQt6.QtCore import Qt, QTimer, QRectF, QPointF, QPropertyAnimation, pyqtProperty
-from PyQt6.QtGui import QPainter, QColor, QConicalGradient, QBrush, QPen, QFont, QPainterPath
+from PyQt6.QtCore import Qt, QRectF, QPointF, QPropertyAnimation, pyqtProperty
+from PyQt6.QtGui import QPainter, QColor, QConicalGradient, QBrush, QPen, QFont, QPainterPath, QPixmap, QRegion
+
+from ..utils.animator import Animator
 
 class StarBorderButton(QPushButton):
+    # Rendered border frames per (width, height, pixel ratio, background), by angle
+    _border_frames: dict = {}
+
     def __init__(self, text="Click Me", parent=None):
         super().__init__(text, parent)
         self.setFixedSize(200, 50)
         self.setFont(QFont("Segoe UI", 12, QFont.Weight.Bold))
         self.setCursor(Qt.CursorShape.PointingHandCursor)
         self.angle = 0
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.rotate_border)
-        self.timer.start(16)
+        # Subscribed to the frame clock only while shown (see showEvent/hideEvent)
+        self._ticking = False
         
         # Colors
         self.bg_color = QColor(10, 10, 30)
@@ -28,16 +32,65 @@ class StarBorderButton(QPushButton):
         self.border_width = 3.0
         self.glow_color = QColor(0, 255, 255) # Cyan
 
+    def showEvent(self, event):
+        if not self._ticking:
+            Animator.instance().tick.connect(self.rotate_border)
+            self._ticking = True
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        if self._ticking:
+            Animator.instance().tick.disconnect(self.rotate_border)
+            self._ticking = False
+        super().hideEvent(event)
+
     def rotate_border(self):
+        # Fully covered buttons skip the frame; the angle resumes where it stopped
+        if self.visibleRegion().isEmpty():
+            return
         self.angle = (self.angle + 2) % 360
+        # Only the border ring changes with the angle; text and fill stay put
+        self.update(self._border_region())
+
+    def _border_region(self) -> QRegion:
+        rect = self.rect()
+        inner = rect.adjusted(3, 3, -3, -3)
+        # The inner fill's rounded corners (radius 22) expose the border, so the
+        # untouched area is its two corner-free bands, 1px in for antialiasing.
+        r = 23
+        untouched = QRegion(inner.adjusted(r, 1, -r, -1)).united(QRegion(inner.adjusted(1, r, -1, -r)))
+        return QRegion(rect).subtracted(untouched)
+
+    def enterEvent(self, event):
+        # The hover glow spans the whole button, not just the ring ticks repaint
         self.update()
+        super().enterEvent(event)
 
-    def paintEvent(self, event):
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
+    def leaveEvent(self, event):
+        self.update()
+        super().leaveEvent(event)
+
+    def _border_frame(self) -> QPixmap:
+        # The border depends only on size, pixel ratio and angle, so each of the
+        # 180 angle steps is rasterized once and blitted on every later pass.
+        dpr = self.devicePixelRatioF()
+        frames = StarBorderButton._border_frames.setdefault(
+            (self.width(), self.height(), dpr, self.bg_color.rgba()), {}
+        )
+        frame = frames.get(self.angle)
+        if frame is None:
+            frame = frames[self.angle] = self._render_border(dpr)
+        return frame
+
+    def _render_border(self, dpr: float) -> QPixmap:
         rect = self.rect()
         radius = 24.0
+
+        frame = QPixmap(round(rect.width() * dpr), round(rect.height() * dpr))
+        frame.setDevicePixelRatio(dpr)
+        frame.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(frame)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
         # 1. Clip to Rounded shape
         path = QPainterPath()
@@ -45,11 +98,6 @@ class StarBorderButton(QPushButton):
         painter.setClipPath(path)
 
         # 2. Draw animated border (Conical Gradient)
-        # Use a square larger than rect to cover rotaton
-        side = max(rect.width(), rect.height()) * 1.5
-        grad_rect = QRectF(0, 0, side, side)
-        grad_rect.moveCenter(QPointF(rect.center()))
-        
         gradient = QConicalGradient(QPointF(rect.center()), self.angle)
         gradient.setColorAt(0.0, QColor("#00FFFF")) # Cyan
         gradient.setColorAt(0.25, Qt.GlobalColor.transparent)
@@ -66,6 +114,18 @@ class StarBorderButton(QPushButton):
         inner_path.addRoundedRect(inner_rect, radius - 2, radius - 2)
         
         painter.fillPath(inner_path, self.bg_color)
+        painter.end()
+        return frame
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        rect = self.rect()
+        radius = 24.0
+        
+        # 1-3. Rounded gradient border and inner background, from the frame cache
+        painter.drawPixmap(0, 0, self._border_frame())
         
         # 4. Draw Text
         painter.setPen(self.text_color)
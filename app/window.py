@@ -11,10 +11,12 @@ from __future__ import annotations
 
 import os
 import sys
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
-from PyQt6.QtCore import Qt, QTimer, QObject
-from PyQt6.QtGui import QIcon, QPixmap, QColor, QFont
+from PyQt6.QtCore import Qt, QTimer, QObject, QSize, QSignalBlocker, QRunnable, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QIcon, QPixmap, QColor, QFont, QTextCursor
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QListWidget, QListWidgetItem, QTextEdit,
@@ -43,9 +45,65 @@ def _resources_dir() -> Path:
     return base / "resources"
 
 
+def _read_resource(path: str) -> bytes | None:
+    try:
+        return Path(path).read_bytes()
+    except OSError:
+        return None
+
+
+# Image bytes are read on a background thread from import time, overlapping the
+# disk read with QApplication start-up; the window only decodes them.
+_prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="resource-prefetch")
+_RESOURCE_PREFETCH: dict[str, Future] = {
+    path: _prefetch_pool.submit(_read_resource, path)
+    for path in (str(_resources_dir() / "logo.png"),)
+}
+_prefetch_pool.shutdown(wait=False)
+
+
+@lru_cache(maxsize=16)
+def _scaled_logo(path: str, w: int, h: int) -> QPixmap:
+    """ Loaded and smooth-scaled once per size; later windows reuse the pixmap. """
+    future = _RESOURCE_PREFETCH.pop(path, None)
+    data = future.result() if future is not None else _read_resource(path)
+    pix = QPixmap()
+    if data is None or not pix.loadFromData(data):
+        return QPixmap()
+    return pix.scaled(w, h, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+
+# --------------------------------------------------------------------------- #
+# Background config loader
+# --------------------------------------------------------------------------- #
+class _ConfigSignals(QObject):
+    loaded = pyqtSignal(object)   # AppConfig
+    failed = pyqtSignal(str)      # error message
+
+
+class _ConfigLoader(QRunnable):
+    """ Runs load_app_config on a pool thread; results arrive on the GUI thread via signals. """
+
+    def __init__(self, path: Path):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.path = path
+        self.signals = _ConfigSignals()
+
+    def run(self) -> None:
+        try:
+            config = load_app_config(self.path)
+        except Exception as exc:  # noqa: BLE001
+            self.signals.failed.emit(str(exc))
+            return
+        self.signals.loaded.emit(config)
+
+
 # --------------------------------------------------------------------------- #
 # Glass-styled List Widget
 # --------------------------------------------------------------------------- #
+_ITEM_SIZE = QSize(0, 38)
+
 _LIST_STYLE = """
 QListWidget {
     background: transparent;
@@ -66,16 +124,16 @@ QListWidget::item:selected {
 QListWidget::item:hover:!selected {
     background: rgba(255, 255, 255, 0.08);
 }
-QScrollBar:vertical {
+QListWidget QScrollBar:vertical {
     background: rgba(255,255,255,0.04);
     width: 6px;
     border-radius: 3px;
 }
-QScrollBar::handle:vertical {
+QListWidget QScrollBar::handle:vertical {
     background: rgba(255,255,255,0.25);
     border-radius: 3px;
 }
-QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical { height: 0px; }
+QListWidget QScrollBar::add-line:vertical, QListWidget QScrollBar::sub-line:vertical { height: 0px; }
 """
 
 _LOG_STYLE = """
@@ -142,6 +200,23 @@ _LABEL_STYLE      = "color: white; font-size: %spx; font-weight: %s;"
 _DIVIDER_STYLE    = "color: rgba(255,255,255,0.12); background: rgba(255,255,255,0.10);"
 _SUBTLE_LABEL     = "color: rgba(255,255,255,0.40); font-size: 11px;"
 
+# Everything above as one sheet on the overlay (the root of every styled widget),
+# parsed once. The leading `*` rule keeps the overlay's old selector-less
+# "background: transparent" for all descendants at the lowest specificity.
+_APP_QSS = "\n".join([
+    "* { background: transparent; }",
+    _LIST_STYLE,
+    _LOG_STYLE,
+    _COMBO_STYLE,
+    _PROGRESS_STYLE,
+    "QLabel#brandTitle { %s }" % (_LABEL_STYLE % ("20", "bold")),
+    "QLabel#panelTitle { %s }" % (_LABEL_STYLE % ("15", "bold")),
+    "QLabel#projectTitle { %s }" % (_LABEL_STYLE % ("18", "bold")),
+    "QLabel#logHeader { %s }" % (_LABEL_STYLE % ("13", "600")),
+    "QLabel#subtle { %s }" % _SUBTLE_LABEL,
+    "QFrame#hdiv { %s }" % _DIVIDER_STYLE,
+])
+
 
 # --------------------------------------------------------------------------- #
 # Main Window
@@ -158,6 +233,13 @@ class TayberryWindow(QMainWindow):
         self._projects: list[ProjectConfig] = []
         self._selected_project: ProjectConfig | None = None
         self._worker: BackupWorker | None = None
+        self._fit_pending = False
+        self._glass_surfaces: tuple[GlassSurface, ...] = ()
+        # Blur comes back once resize events have stopped for this long
+        self._resize_timer = QTimer(self)
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(120)
+        self._resize_timer.timeout.connect(self._end_resize)
 
         # ── Background ─────────────────────────────────────────────────── #
         self.bg = GalaxyBackgound(self)
@@ -165,7 +247,7 @@ class TayberryWindow(QMainWindow):
 
         # ── Root overlay (transparent, fills bg) ───────────────────────── #
         self.overlay = QWidget(self.bg)
-        self.overlay.setStyleSheet("background: transparent;")
+        self.overlay.setStyleSheet(_APP_QSS)
         self.overlay.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, False)
 
         root_vbox = QVBoxLayout(self.overlay)
@@ -180,19 +262,18 @@ class TayberryWindow(QMainWindow):
         top_layout.setSpacing(14)
 
         res = _resources_dir()
-        logo_pix = QPixmap(str(res / "logo.png"))
+        logo_pix = _scaled_logo(str(res / "logo.png"), 52, 52)
         logo_lbl = QLabel()
         if not logo_pix.isNull():
-            logo_lbl.setPixmap(logo_pix.scaled(52, 52, Qt.AspectRatioMode.KeepAspectRatio,
-                                                Qt.TransformationMode.SmoothTransformation))
+            logo_lbl.setPixmap(logo_pix)
         top_layout.addWidget(logo_lbl)
 
         brand_col = QVBoxLayout()
         brand_col.setSpacing(0)
         brand_title = QLabel("Tayberry Backup Studio")
-        brand_title.setStyleSheet(_LABEL_STYLE % ("20", "bold"))
+        brand_title.setObjectName("brandTitle")
         brand_sub   = QLabel("by Amirhosein Rezapour  ·  techili.ir  ·  tayberry.dev")
-        brand_sub.setStyleSheet(_SUBTLE_LABEL)
+        brand_sub.setObjectName("subtle")
         brand_col.addWidget(brand_title)
         brand_col.addWidget(brand_sub)
         top_layout.addLayout(brand_col)
@@ -200,10 +281,9 @@ class TayberryWindow(QMainWindow):
 
         # Profile selector in top bar
         profile_lbl = QLabel("Profile:")
-        profile_lbl.setStyleSheet(_SUBTLE_LABEL)
+        profile_lbl.setObjectName("subtle")
         top_layout.addWidget(profile_lbl)
         self.profile_combo = QComboBox()
-        self.profile_combo.setStyleSheet(_COMBO_STYLE)
         top_layout.addWidget(self.profile_combo)
 
         root_vbox.addWidget(self.top_bar)
@@ -220,16 +300,17 @@ class TayberryWindow(QMainWindow):
         left_vbox.setSpacing(10)
 
         proj_header = QLabel("Projects")
-        proj_header.setStyleSheet(_LABEL_STYLE % ("15", "bold"))
+        proj_header.setObjectName("panelTitle")
         left_vbox.addWidget(proj_header)
 
         self._divider(left_vbox)
 
         self.project_list = QListWidget()
-        self.project_list.setStyleSheet(_LIST_STYLE)
         self.project_list.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.project_list.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAsNeeded)
         self.project_list.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        # Every row shares _ITEM_SIZE, so the view lays out rows without asking each one
+        self.project_list.setUniformItemSizes(True)
         self.project_list.currentRowChanged.connect(self._on_project_changed)
         left_vbox.addWidget(self.project_list)
 
@@ -244,9 +325,9 @@ class TayberryWindow(QMainWindow):
 
         # Selected project header
         self.proj_title_lbl = QLabel("← Select a project")
-        self.proj_title_lbl.setStyleSheet(_LABEL_STYLE % ("18", "bold"))
+        self.proj_title_lbl.setObjectName("projectTitle")
         self.proj_path_lbl = QLabel("")
-        self.proj_path_lbl.setStyleSheet(_SUBTLE_LABEL)
+        self.proj_path_lbl.setObjectName("subtle")
         right_vbox.addWidget(self.proj_title_lbl)
         right_vbox.addWidget(self.proj_path_lbl)
 
@@ -274,12 +355,17 @@ class TayberryWindow(QMainWindow):
         progress_row = QHBoxLayout()
         progress_row.setSpacing(10)
         self.progress_bar = QProgressBar()
-        self.progress_bar.setStyleSheet(_PROGRESS_STYLE)
         self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(0)
         self.progress_bar.setFixedHeight(12)
         self.progress_label = QLabel("Idle")
-        self.progress_label.setStyleSheet(_SUBTLE_LABEL)
+        # The worker reports every file; only the latest report is shown, at ~30 Hz
+        self._last_progress: tuple[int, int, str] | None = None
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setInterval(33)
+        self._progress_timer.timeout.connect(self._flush_progress)
+        self.progress_label.setObjectName("subtle")
         self.progress_label.setFixedWidth(240)
         progress_row.addWidget(self.progress_bar)
         progress_row.addWidget(self.progress_label)
@@ -289,19 +375,26 @@ class TayberryWindow(QMainWindow):
 
         # Log output
         log_header = QLabel("Operation Log")
-        log_header.setStyleSheet(_LABEL_STYLE % ("13", "600"))
+        log_header.setObjectName("logHeader")
         right_vbox.addWidget(log_header)
 
         self.log_output = QTextEdit()
         self.log_output.setReadOnly(True)
-        self.log_output.setStyleSheet(_LOG_STYLE)
         self.log_output.setPlaceholderText("Select a project and run an operation…")
+        # Old lines are evicted once the log reaches this many
+        self.log_output.document().setMaximumBlockCount(5000)
+        # Worker lines are buffered and flushed together: one layout and repaint per batch
+        self._log_buffer: list[str] = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self._flush_log)
         right_vbox.addWidget(self.log_output)
 
         # Bottom: status strip
         self._divider(right_vbox)
         self.status_lbl = QLabel("Ready  ·  Tayberry Backup Studio")
-        self.status_lbl.setStyleSheet(_SUBTLE_LABEL)
+        self.status_lbl.setObjectName("subtle")
         right_vbox.addWidget(self.status_lbl)
 
         body_row.addWidget(self.right_panel)
@@ -313,6 +406,8 @@ class TayberryWindow(QMainWindow):
         # ── Controls Pill (absolute, top-right) — optional ─────────────── #
         # (omit in the merged app to keep UI focused)
 
+        self._glass_surfaces = (self.top_bar, self.left_panel, self.right_panel)
+
         # ── Initial resize ─────────────────────────────────────────────── #
         self._fit_overlay()
 
@@ -323,14 +418,31 @@ class TayberryWindow(QMainWindow):
         line = QFrame()
         line.setFrameShape(QFrame.Shape.HLine)
         line.setFixedHeight(1)
-        line.setStyleSheet(_DIVIDER_STYLE)
+        line.setObjectName("hdiv")
         layout.addWidget(line)
 
     def _fit_overlay(self) -> None:
+        self._fit_pending = False
         self.overlay.setGeometry(0, 0, self.width(), self.height())
 
+    def _begin_resize(self) -> None:
+        # Backdrop blurs are suspended while the size keeps changing
+        if not self._resize_timer.isActive():
+            for glass in self._glass_surfaces:
+                glass.set_live_blur(False)
+        self._resize_timer.start()
+
+    def _end_resize(self) -> None:
+        for glass in self._glass_surfaces:
+            glass.set_live_blur(True)
+
     def resizeEvent(self, event) -> None:
-        self._fit_overlay()
+        if self._glass_surfaces:
+            self._begin_resize()
+        # A drag-resize delivers a burst of these; one geometry pass once the queue drains covers them all.
+        if not self._fit_pending:
+            self._fit_pending = True
+            QTimer.singleShot(0, self._fit_overlay)
         super().resizeEvent(event)
 
     # ---------------------------------------------------------------------- #
@@ -341,29 +453,47 @@ class TayberryWindow(QMainWindow):
         if not config_path.exists():
             self._log_line("⚠️  backup_projects.json not found — place it in app/resources/")
             return
-        try:
-            self._app_config = load_app_config(config_path)
-            self._projects   = list(self._app_config.projects.values())
-            self._populate_projects()
-            self._populate_profiles()
-            self._log_line(f"✅  Loaded {len(self._projects)} projects from config.")
-        except Exception as exc:  # noqa: BLE001
-            self._log_line(f"❌  Config error: {exc}")
+        # Parsed on the global thread pool so the window paints before the config is read
+        self._config_loader = _ConfigLoader(config_path)
+        self._config_loader.signals.loaded.connect(self._on_config_loaded)
+        self._config_loader.signals.failed.connect(self._on_config_failed)
+        QThreadPool.globalInstance().start(self._config_loader)
+
+    def _on_config_loaded(self, app_config: AppConfig) -> None:
+        self._config_loader = None
+        self._app_config = app_config
+        self._projects   = list(app_config.projects.values())
+        self._populate_projects()
+        self._populate_profiles()
+        self._log_line(f"✅  Loaded {len(self._projects)} projects from config.")
+
+    def _on_config_failed(self, msg: str) -> None:
+        self._config_loader = None
+        self._log_line(f"❌  Config error: {msg}")
 
     def _populate_projects(self) -> None:
-        self.project_list.clear()
-        for proj in self._projects:
-            item = QListWidgetItem(f"  {proj.label}")
-            item.setData(Qt.ItemDataRole.UserRole, proj.id)
-            item.setSizeHint(item.sizeHint().__class__(0, 38))
-            self.project_list.addItem(item)
+        # One relayout and repaint once the list is rebuilt, not one per item;
+        # the rebuild itself selects nothing, so no row change is lost.
+        self.project_list.setUpdatesEnabled(False)
+        try:
+            with QSignalBlocker(self.project_list):
+                self.project_list.clear()
+                for proj in self._projects:
+                    item = QListWidgetItem(f"  {proj.label}")
+                    item.setData(Qt.ItemDataRole.UserRole, proj.id)
+                    item.setSizeHint(_ITEM_SIZE)
+                    self.project_list.addItem(item)
+        finally:
+            self.project_list.setUpdatesEnabled(True)
 
     def _populate_profiles(self) -> None:
         if not self._app_config:
             return
+        profiles = list(self._app_config.profiles.items())
         self.profile_combo.clear()
-        for pid, prof in self._app_config.profiles.items():
-            self.profile_combo.addItem(prof.label, userData=pid)
+        self.profile_combo.addItems([prof.label for _, prof in profiles])
+        for i, (pid, _) in enumerate(profiles):
+            self.profile_combo.setItemData(i, pid)
 
     # ---------------------------------------------------------------------- #
     # Project selection
@@ -407,6 +537,7 @@ class TayberryWindow(QMainWindow):
             self._log_line("⚠️  An operation is already running.")
             return
 
+        self._log_buffer.clear()
         self.log_output.clear()
         label = "Diff Check" if dry_run else "Write Backup"
         self._log_line(f"▶  Starting {label}  ·  {self._selected_project.label}  ·  profile: {profile.label}")
@@ -438,24 +569,55 @@ class TayberryWindow(QMainWindow):
     # Worker callbacks
     # ---------------------------------------------------------------------- #
     def _log_line(self, msg: str) -> None:
-        self.log_output.append(msg)
+        self._log_buffer.append(msg)
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+
+    def _flush_log(self) -> None:
+        if not self._log_buffer:
+            return
+        batch = "\n".join(self._log_buffer)
+        self._log_buffer.clear()
+        cur = self.log_output.textCursor()
+        cur.movePosition(QTextCursor.MoveOperation.End)
+        cur.insertText(batch if self.log_output.document().isEmpty() else "\n" + batch)
+        bar = self.log_output.verticalScrollBar()
+        bar.setValue(bar.maximum())
 
     def _on_progress(self, idx: int, total: int, label: str) -> None:
+        self._last_progress = (idx, total, label)
+        if not self._progress_timer.isActive():
+            self._progress_timer.start()
+
+    def _flush_progress(self) -> None:
+        if self._last_progress is None:
+            return
+        idx, total, label = self._last_progress
+        self._last_progress = None
         pct = int((idx / total) * 100) if total else 0
-        self.progress_bar.setValue(pct)
+        if pct != self.progress_bar.value():
+            self.progress_bar.setValue(pct)
         self.progress_label.setText(f"{label}  ({idx}/{total})")
 
+    def _drop_pending_progress(self) -> None:
+        # A late flush must not overwrite the final state
+        self._progress_timer.stop()
+        self._last_progress = None
+
     def _on_finished_ok(self, result) -> None:
+        self._drop_pending_progress()
         self._set_busy(False)
         self.progress_bar.setValue(100)
         self.progress_label.setText("Done ✓")
         files = len(result.created_files) if result.created_files else 0
         dry = " [DRY RUN]" if result.is_dry_run else ""
-        self._log_line(f"✅  Completed{dry}  ·  {files} files  ·  "
-                       f"{result.duration_seconds:.1f}s" if result.duration_seconds else "✅  Completed.")
+        # The conditional covers only the duration; dry-run mark and file count always show
+        duration = f"  ·  {result.duration_seconds:.1f}s" if result.duration_seconds else ""
+        self._log_line(f"✅  Completed{dry}  ·  {files} files{duration}")
         self.status_lbl.setText(f"Last operation finished{dry}")
 
     def _on_finished_error(self, msg: str) -> None:
+        self._drop_pending_progress()
         self._set_busy(False)
         self.progress_bar.setValue(0)
         self.progress_label.setText("Error")